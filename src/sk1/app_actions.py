@@ -140,6 +140,8 @@ def create_actions(app):
          insp.is_snap_to_objects),
         (pdids.ID_SNAP_TO_PAGE, proxy.snap_to_page, snap_chnls, insp.is_doc,
          insp.is_snap_to_page),
+        (pdids.ID_SNAP_TO_NODES, proxy.snap_to_nodes, snap_chnls,
+         insp.is_doc, insp.is_snap_to_nodes),
         (pdids.ID_ICONIZER, proxy.show_plugin, doc_chnls, insp.is_doc, None,
          ('IconizerPlugin',)),
         (wal.ID_REFRESH, proxy.force_redraw, doc_chnls, insp.is_doc),
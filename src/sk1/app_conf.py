@@ -231,6 +231,8 @@ class AppConfig(UCConfig):
 
     rotation_step = 5.0  # in degrees
     stroke_sensitive_size = 5.0  # in pixels
+    undo_memory_limit = 256  # in MB, 0 - unlimited
+    image_cache_size = 512  # in MB
 
     # ============== SNAPPING OPTIONS ================
     snap_distance = 10.0  # in pixels
@@ -242,6 +244,7 @@ class AppConfig(UCConfig):
     snap_to_guides = True
     snap_to_objects = False
     snap_to_page = False
+    snap_to_nodes = False
 
     show_snap = True
     snap_line_dash = [5, 5]
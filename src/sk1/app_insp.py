@@ -347,6 +347,12 @@ class AppInspector:
             return False
         return self.app.current_doc.snap.snap_to_page
 
+    def is_snap_to_nodes(self, doc=None):
+        doc = doc or self.app.current_doc
+        if doc is None:
+            return False
+        return self.app.current_doc.snap.snap_to_nodes
+
     def can_be_next_page(self, doc=None):
         doc = doc or self.app.current_doc
         if doc is None:
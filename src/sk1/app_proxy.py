@@ -433,6 +433,13 @@ class AppProxy:
             snap.update_page_grid()
             events.emit(events.SNAP_CHANGED)
 
+    def snap_to_nodes(self):
+        if self.insp.is_doc():
+            snap = self.app.current_doc.snap
+            snap.snap_to_nodes = not snap.snap_to_nodes
+            snap.update_objects_grid()
+            events.emit(events.SNAP_CHANGED)
+
     def draw_page_border(self):
         if self.insp.is_doc():
             methods = self.app.current_doc.methods
@@ -23,6 +23,7 @@ from base64 import b64decode
 
 import uc2.events
 import wal
+from uc2.libimg import surfcache
 from sk1 import _, config, events, modes, dialogs, appconst
 from sk1 import app_plugins, app_actions
 from sk1.app_cms import AppColorManager
@@ -37,8 +38,8 @@ from sk1.clipboard import AppClipboard
 from sk1.document.presenter import SK1Presenter
 from sk1.parts.artprovider import create_artprovider
 from sk1.parts.mw import AppMainWindow
-from sk1.pwidgets import generate_fcache
-from uc2 import uc2const, libimg, msgconst
+from sk1.pwidgets import generate_fcache, check_fcache
+from uc2 import uc2const, libimg, libpango, msgconst
 from uc2.application import UCApplication
 from uc2.formats import get_saver_by_id, get_loader
 from uc2.utils import fsutils
@@ -108,6 +109,9 @@ class SK1Application(wal.Application, UCApplication):
         self.actions = app_actions.create_actions(self)
 
         self.default_cms = AppColorManager(self)
+        surfcache.set_budget(config.image_cache_size)
+        libpango.set_fonts_catalog(
+            os.path.join(self.appdata.app_config_dir, 'fonts_catalog.json'))
         self.palettes = AppPaletteManager(self)
         self.clipboard = AppClipboard(self)
 
@@ -125,6 +129,8 @@ class SK1Application(wal.Application, UCApplication):
             events.emit(events.NO_DOCS)
         if config.make_font_cache_on_start:
             generate_fcache()
+        else:
+            check_fcache()
 
     def load_plugins(self):
         if config.active_plugins:
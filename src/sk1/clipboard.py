@@ -20,13 +20,23 @@ from sk1 import events
 
 class AppClipboard:
     contents = None
+    symbols = None
+    source = None
 
     def __init__(self, app):
         self.app = app
         self.contents = []
+        self.symbols = {}
 
-    def set(self, objs):
+    def set(self, objs, symbols=None, source=None):
+        """
+        Stores copies of objects. Copies of symbols used by objects
+        and source document model are stored to paste symbol instances
+        into other documents.
+        """
         self.contents = [obj.copy() for obj in objs]
+        self.symbols = symbols or {}
+        self.source = source
         events.emit(events.CLIPBOARD)
 
     def get(self):
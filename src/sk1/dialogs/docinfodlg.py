@@ -285,11 +285,22 @@ class DocInfoDialog(wal.CloseDialog):
             data.append(['\t%s' % space_name, color_space[space_name]])
         return data
 
+    def history_info(self, objects):
+        api = self.doc.api
+        undo_size, redo_size = api.get_history_size()
+        size_tmpl = _('%i records, %s KB')
+        data = [
+            _('Edit History'),
+            [_('Undo:'), size_tmpl % (len(api.undo), undo_size // 1024)],
+            [_('Redo:'), size_tmpl % (len(api.redo), redo_size // 1024)],
+        ]
+        return data
+
     def build(self):
         data = [[_('Property'), _('Value')]]
         sections = [
             'file_info', 'document_info', 'objects_info', 'text_info',
-            'bitmap_info', 'fill_info', 'stroke_info'
+            'bitmap_info', 'fill_info', 'stroke_info', 'history_info'
         ]
         for item in sections:
             data += getattr(self, item)(self.get_objects())
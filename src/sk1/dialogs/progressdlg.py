@@ -25,8 +25,10 @@ class ProgressDialog(wal.CustomProgressDialog):
         wal.CustomProgressDialog.__init__(self, parent, title)
 
     def run(self, callback, args):
+        events.PROGRESS.reset()
         events.connect(events.FILTER_INFO, self.listener)
         result = wal.CustomProgressDialog.run(self, callback, args)
+        events.flush_progress()
         events.disconnect(events.FILTER_INFO, self.listener)
         return result
 
@@ -15,7 +15,10 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import cairo
+import logging
 import math
+import sys
 from copy import deepcopy
 
 from uc2 import libgeom, uc2const, libimg, sk2const
@@ -23,6 +26,74 @@ from uc2.formats.sk2 import sk2_model
 
 from sk1 import events, config, modes
 
+LOG = logging.getLogger(__name__)
+
+CPATH_ITEM_SIZE = 40
+CPATH_ITEMS = 64
+
+
+def get_data_size(data, seen):
+    """
+    Estimates memory size of undo data in bytes. Every object is
+    counted once per seen set, so data shared by several records
+    (and between undo and redo parts) is not overcounted.
+    Model objects and callables are owned by document and skipped
+    as well as cpaths still used by model objects. Cpath size is
+    estimated by node number cached in the object which owns it.
+    """
+    size = 0
+    stack = [(data, None)]
+    while stack:
+        item, owner = stack.pop()
+        if id(item) in seen or callable(item):
+            continue
+        if isinstance(item, sk2_model.DocumentObject):
+            if item.is_primitive:
+                seen.add(id(item.cache_cpath))
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, (list, tuple)):
+            # snapshots start with object which owns following cpaths
+            if item and isinstance(item[0], sk2_model.DocumentObject) \
+                    and item[0].is_primitive:
+                owner = item[0]
+            stack += [(child, owner) for child in reversed(item)]
+        elif isinstance(item, dict):
+            stack += [(child, owner) for child in item.keys()]
+            stack += [(child, owner) for child in item.values()]
+        elif isinstance(item, cairo.Path):
+            items = owner.cache_nodes if owner else CPATH_ITEMS
+            size += CPATH_ITEM_SIZE * items
+    return size
+
+
+def get_changed_objs(actions, depth=2):
+    """
+    Returns model objects referenced by undo/redo actions, i.e. objects
+    changed by transaction. Lists are walked up to provided depth.
+    Childs snapshots of layers are not walked, layer is returned
+    instead of its childs.
+    """
+    objs = []
+    for action in actions:
+        _collect_objs(action[1:], objs, depth)
+    return objs
+
+
+def _collect_objs(items, objs, depth):
+    is_obj = sk2_model.DocumentObject
+    has_layer = False
+    for item in items:
+        if isinstance(item, is_obj) and item.is_layer:
+            has_layer = True
+            break
+    for item in items:
+        if isinstance(item, is_obj):
+            objs.append(item)
+        elif depth and not has_layer and isinstance(item, (list, tuple)):
+            _collect_objs(item, objs, depth - 1)
+
 
 class AbstractAPI:
     presenter = None
@@ -34,6 +105,7 @@ class AbstractAPI:
     undo = []
     redo = []
     undo_marked = False
+    undo_size = 0
     selection = None
     callback = None
     sk2_cfg = None
@@ -48,7 +120,8 @@ class AbstractAPI:
         tr = self.undo[-1]
         self.undo.remove(tr)
         self.redo.append(tr)
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        self.undo_size -= tr[3]
+        self._emit_modified(tr)
         if self.undo and self.undo[-1][2]:
             self.presenter.reflect_saving()
         if not self.undo and not self.undo_marked:
@@ -61,7 +134,8 @@ class AbstractAPI:
         tr = self.redo[-1]
         self.redo.remove(tr)
         self.undo.append(tr)
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        self.undo_size += tr[3]
+        self._emit_modified(tr)
         if not self.undo or self.undo[-1][2]:
             self.presenter.reflect_saving()
 
@@ -73,16 +147,50 @@ class AbstractAPI:
         else:
             action[0](*action[1:])
 
-    def _clear_history_stack(self, stack):
-        for obj in stack:
-            if isinstance(obj, list):
-                self._clear_history_stack(obj)
-        return []
-
     def add_undo(self, transaction):
-        self.redo = self._clear_history_stack(self.redo)
+        self.redo = []
+        transaction.append(get_data_size(transaction[:2], set()))
         self.undo.append(transaction)
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        self.undo_size += transaction[3]
+        self._check_history_limit()
+        self._emit_modified(transaction)
+
+    def _emit_modified(self, transaction):
+        """
+        Notifies about document modification. Objects changed by
+        transaction are passed if they can be found in its actions.
+        """
+        objs = get_changed_objs(transaction[0] + transaction[1])
+        if objs:
+            self.eventloop.emit(self.eventloop.DOC_MODIFIED, objs)
+        else:
+            self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+
+    def _check_history_limit(self):
+        """
+        Drops oldest undo records while history exceeds memory budget.
+        The latest record is kept in any case.
+        """
+        limit = config.undo_memory_limit * 1024 * 1024
+        if not limit:
+            return
+        while len(self.undo) > 1 and self.undo_size > limit:
+            tr = self.undo.pop(0)
+            self.undo_size -= tr[3]
+            # saved state cannot be reached by undo anymore
+            self.undo_marked = True
+        LOG.debug('Undo history: %d records, %d bytes',
+                  len(self.undo), self.undo_size)
+
+    def get_history_size(self):
+        """
+        Returns (undo, redo) memory size of history stacks in bytes.
+        Data shared between records is counted once.
+        """
+        seen = set()
+        undo_size = sum([get_data_size(tr[:2], seen) for tr in self.undo])
+        redo_size = sum([get_data_size(tr[:2], seen) for tr in self.redo])
+        return undo_size, redo_size
 
     def save_mark(self):
         for item in self.undo:
@@ -211,12 +319,11 @@ class AbstractAPI:
         obj.update()
 
     def _get_objs_styles(self, objs):
+        # styles and trafos are never changed in place,
+        # so undo records share them with objects
         result = []
         for obj in objs:
-            style = deepcopy(obj.style)
-            fill_trafo = deepcopy(obj.fill_trafo)
-            stroke_trafo = deepcopy(obj.stroke_trafo)
-            result.append([obj, style, fill_trafo, stroke_trafo])
+            result.append([obj, obj.style, obj.fill_trafo, obj.stroke_trafo])
         return result
 
     def _set_objs_styles(self, objs_styles):
@@ -227,12 +334,14 @@ class AbstractAPI:
             obj.clear_color_cache()
 
     def _fill_objs(self, objs, color):
+        color = deepcopy(color)
         for obj in objs:
-            style = deepcopy(obj.style)
+            style = [] + obj.style
             obj.clear_color_cache()
             if obj.is_pixmap:
+                style[3] = [] + style[3]
                 if color:
-                    style[3][0] = deepcopy(color)
+                    style[3][0] = color
                 else:
                     style[3][0] = []
             else:
@@ -244,7 +353,7 @@ class AbstractAPI:
                     else:
                         new_fill.append(fill[0])
                     new_fill.append(sk2const.FILL_SOLID)
-                    new_fill.append(deepcopy(color))
+                    new_fill.append(color)
                     style[0] = new_fill
                 else:
                     style[0] = []
@@ -252,12 +361,14 @@ class AbstractAPI:
             obj.fill_trafo = []
 
     def _set_objs_fill_style(self, objs, fill_style):
+        fill_style = deepcopy(fill_style)
         for obj in objs:
             if not obj.is_pixmap:
-                style = deepcopy(obj.style)
-                style[0] = deepcopy(fill_style)
+                style = [] + obj.style
+                style[0] = fill_style
                 obj.style = style
                 obj.clear_color_cache()
+                obj.update_fill()
 
     def _set_paths_and_trafo(self, obj, paths, trafo):
         obj.paths = paths
@@ -342,12 +453,14 @@ class AbstractAPI:
         self.selection.update_bbox()
 
     def _stroke_objs(self, objs, color):
+        color = deepcopy(color)
         for obj in objs:
-            style = deepcopy(obj.style)
+            style = [] + obj.style
             obj.clear_color_cache()
             if obj.is_pixmap:
+                style[3] = [] + style[3]
                 if color:
-                    style[3][1] = deepcopy(color)
+                    style[3][1] = color
                 else:
                     style[3][1] = []
             else:
@@ -356,8 +469,8 @@ class AbstractAPI:
                     if not stroke:
                         new_stroke = deepcopy(self.sk2_cfg.default_stroke)
                     else:
-                        new_stroke = deepcopy(stroke)
-                    new_stroke[2] = deepcopy(color)
+                        new_stroke = [] + stroke
+                    new_stroke[2] = color
                     style[1] = new_stroke
                 else:
                     style[1] = []
@@ -366,10 +479,11 @@ class AbstractAPI:
             obj.update_stroke()
 
     def _set_objs_stroke_style(self, objs, stroke_style):
+        stroke_style = deepcopy(stroke_style)
         for obj in objs:
             if not obj.is_pixmap:
-                style = deepcopy(obj.style)
-                style[1] = deepcopy(stroke_style)
+                style = [] + obj.style
+                style[1] = stroke_style
                 obj.style = style
                 obj.update_stroke()
 
@@ -427,18 +541,20 @@ class PresenterAPI(AbstractAPI):
         self.app = presenter.app
         self.undo = []
         self.redo = []
+        self.undo_size = 0
 
     def destroy(self):
-        self.undo = self._clear_history_stack(self.undo)
-        self.redo = self._clear_history_stack(self.redo)
+        self.undo = []
+        self.redo = []
 
         items = self.__dict__.keys()
         for item in items:
             self.__dict__[item] = None
 
     def clear_history(self):
-        self.undo = self._clear_history_stack(self.undo)
-        self.redo = self._clear_history_stack(self.redo)
+        self.undo = []
+        self.redo = []
+        self.undo_size = 0
         events.emit(events.DOC_MODIFIED, self.presenter)
         self.presenter.reflect_saving()
 
@@ -976,11 +1092,25 @@ class PresenterAPI(AbstractAPI):
 
     def copy_selected(self):
         if self.selection.objs:
-            self.app.clipboard.set(self.selection.objs)
-
-    def paste_selected(self, objs=None):
+            objs = self.selection.objs
+            self.app.clipboard.set(objs, self.methods.copy_symbols(objs),
+                                   self.presenter.model)
+
+    def paste_selected(self, objs=None, symbols=None):
+        """
+        Pastes clipboard content or provided objects of other document.
+        Instances of other document symbols are pasted as groups.
+        """
+        keep_defined = False
         if objs is None:
-            objs = self.app.clipboard.get()
+            clipboard = self.app.clipboard
+            objs = clipboard.get()
+            symbols = clipboard.symbols
+            keep_defined = clipboard.source is self.presenter.model
+        objs = self.methods.convert_instances(objs, symbols or {},
+                                              keep_defined)
+        if not objs:
+            return
         sel_before = [] + self.selection.objs
         before = self._get_layers_snapshot()
         self.methods.append_objects(objs, self.presenter.active_layer)
@@ -1305,7 +1435,8 @@ class PresenterAPI(AbstractAPI):
 
     def set_temp_style(self, obj, style):
         obj.style = style
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        obj.update_fill()
+        self.eventloop.emit(self.eventloop.DOC_MODIFIED, [obj])
         self.selection.update()
 
     def set_fill_style(self, fill_style, objs=None):
@@ -1601,7 +1732,7 @@ class PresenterAPI(AbstractAPI):
 
     def set_temp_paths(self, obj, paths):
         self._set_paths(obj, paths)
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        self.eventloop.emit(self.eventloop.DOC_MODIFIED, [obj])
         self.selection.update()
 
     def set_new_paths(self, obj, new_paths, old_paths):
@@ -1781,7 +1912,7 @@ class PresenterAPI(AbstractAPI):
 
     def set_rect(self, obj, rect):
         self.methods.set_rect(obj, rect)
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        self.eventloop.emit(self.eventloop.DOC_MODIFIED, [obj])
         self.selection.update()
 
     def set_rect_final(self, obj, rect, rect_before):
@@ -1800,7 +1931,7 @@ class PresenterAPI(AbstractAPI):
             sel = [] + self.selection.objs
             obj = sel[0]
         self.methods.set_rect_corners(obj, corners)
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        self.eventloop.emit(self.eventloop.DOC_MODIFIED, [obj])
         self.selection.update()
 
     def set_rect_corners_final(self, corners, corners_before=None, obj=None):
@@ -1843,7 +1974,7 @@ class PresenterAPI(AbstractAPI):
             obj = sel[0]
         mtds = self.methods
         mtds.set_circle_properties(obj, circle_type, angle1, angle2)
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        self.eventloop.emit(self.eventloop.DOC_MODIFIED, [obj])
         self.selection.update()
 
     def set_circle_properties_final(self, circle_type, angle1, angle2,
@@ -1913,7 +2044,7 @@ class PresenterAPI(AbstractAPI):
             sel = [] + self.selection.objs
             obj = sel[0]
         self.methods.set_polygon_properties(obj, *props)
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        self.eventloop.emit(self.eventloop.DOC_MODIFIED, [obj])
         self.selection.update()
 
     def set_polygon_properties_final(self, props, props_before=None, obj=None):
@@ -2023,7 +2154,7 @@ class PresenterAPI(AbstractAPI):
 
     def set_temp_text_trafos(self, obj, trafos):
         self._set_text_trafos(obj, trafos)
-        self.eventloop.emit(self.eventloop.DOC_MODIFIED)
+        self.eventloop.emit(self.eventloop.DOC_MODIFIED, [obj])
         self.selection.update()
 
     def set_text_trafos(self, obj, trafos, trafos_before):
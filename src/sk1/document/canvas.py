@@ -26,6 +26,7 @@ from sk1.document.renderer import PDRenderer
 from sk1.pwidgets import Painter
 from uc2 import libcairo, libgeom
 from uc2.libcairo import normalize_bbox
+from uc2 import sk2const
 from uc2.sk2const import DOC_ORIGIN_LL, DOC_ORIGIN_LU
 from uc2.uc2const import mm_to_pt
 
@@ -33,6 +34,8 @@ LOG = logging.getLogger(__name__)
 
 WORKSPACE_HEIGHT = 2000 * mm_to_pt
 WORKSPACE_WIDTH = 4000 * mm_to_pt
+FLATTENING_TOLERANCE = 0.25  # in pixels
+FLAT_CACHE_SIZE = 20000
 
 
 class AppCanvas(Painter):
@@ -420,7 +423,7 @@ class AppCanvas(Painter):
             self.soft_repaint = True
         self.force_redraw()
 
-    def doc_modified(self):
+    def doc_modified(self, *args):
         self.full_repaint = True
         self.force_redraw()
 
@@ -477,11 +480,13 @@ class HitSurface:
     surface = None
     ctx = None
     canvas = None
+    flat_cache = {}
 
     def __init__(self, canvas):
         self.canvas = canvas
         self.surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 1, 1)
         self.ctx = cairo.Context(self.surface)
+        self.flat_cache = {}
 
     def destroy(self):
         items = self.__dict__.keys()
@@ -500,10 +505,96 @@ class HitSurface:
         trafo[5] -= dy
         return trafo
 
+    def get_polylines(self, obj, cpath, zoom=None):
+        """
+        Returns cached flattened cpath of the object. Cache entry is
+        invalidated on object bbox change because transformation
+        modifies cpath in place.
+        """
+        tolerance = FLATTENING_TOLERANCE / (zoom or self.canvas.zoom)
+        entry = self.flat_cache.get(cpath)
+        if entry is not None and entry[0] is obj.cache_bbox \
+                and entry[1] <= 2.0 * tolerance:
+            return entry[2]
+        if len(self.flat_cache) > FLAT_CACHE_SIZE:
+            self.flat_cache = {}
+        polylines = libgeom.get_flat_polylines(cpath, tolerance)
+        self.flat_cache[cpath] = (obj.cache_bbox, tolerance, polylines)
+        return polylines
+
     def is_point_into_object(self, win_point, obj, fill_anyway=False):
-        self.clear()
-        self._draw_object(obj, self.get_context_trafo(win_point), fill_anyway)
-        return not libcairo.check_surface_whiteness(self.surface)
+        point = self.canvas.win_to_doc(win_point)
+        return self._hit_object(win_point, point, obj, fill_anyway)
+
+    def _hit_object(self, win_point, point, obj, fill_anyway=False,
+                    trafo=None):
+        """
+        Checks object hit. For objects of symbol definitions the point
+        is in symbol coordinates and trafo is accumulated transformation
+        of enclosing instances.
+        """
+        if obj.is_instance:
+            return self._hit_instance(win_point, point, obj,
+                                      fill_anyway, trafo)
+        if obj.childs:
+            for child in obj.childs:
+                if self._hit_object(win_point, point, child, trafo=trafo):
+                    return True
+            return False
+        if not obj.is_primitive or obj.cache_cpath is None:
+            return False
+        if obj.is_text or obj.is_pixmap:
+            self.clear()
+            ctx_trafo = self.get_context_trafo(win_point)
+            if trafo:
+                ctx_trafo = libgeom.multiply_trafo(trafo, ctx_trafo)
+            self._draw_object(obj, ctx_trafo, fill_anyway)
+            return not libcairo.check_surface_whiteness(self.surface)
+
+        zoom = self.canvas.zoom
+        if trafo:
+            zoom *= libgeom.get_trafo_scale(trafo)
+        fill = obj.style[0]
+        stroke = obj.style[1]
+        if fill_anyway or (fill and not self.canvas.stroke_view):
+            evenodd = bool(fill and fill[0] & sk2const.FILL_EVENODD)
+            polylines = self.get_polylines(obj, obj.cache_cpath, zoom)
+            if libgeom.is_point_in_polylines(point, polylines, evenodd):
+                return True
+        if stroke:
+            width = obj.cache_line_width or stroke[1]
+            width = max(width, config.stroke_sensitive_size / zoom)
+            polylines = self.get_polylines(obj, obj.cache_cpath, zoom)
+            if libgeom.is_point_near_polylines(point, polylines, width / 2.0):
+                return True
+            if obj.cache_arrows:
+                distance = config.stroke_sensitive_size / (2.0 * zoom)
+                for pair in obj.cache_arrows:
+                    for item in pair:
+                        if not item:
+                            continue
+                        polylines = self.get_polylines(obj, item, zoom)
+                        if self.canvas.stroke_view:
+                            if libgeom.is_point_near_polylines(
+                                    point, polylines, distance):
+                                return True
+                        elif libgeom.is_point_in_polylines(point, polylines):
+                            return True
+        return False
+
+    def _hit_instance(self, win_point, point, obj, fill_anyway=False,
+                      trafo=None):
+        symbol = obj.get_symbol()
+        if symbol is None or not obj.cache_bbox:
+            return False
+        inv_trafo = libgeom.invert_trafo(obj.trafo)
+        point = libgeom.apply_trafo_to_point(point, inv_trafo)
+        trafo = libgeom.multiply_trafo(obj.trafo, trafo) \
+            if trafo else obj.trafo
+        for child in symbol.childs:
+            if self._hit_object(win_point, point, child, fill_anyway, trafo):
+                return True
+        return False
 
     def _draw_object(self, obj, trafo, fill_anyway=False):
         if obj.childs:
@@ -531,8 +622,9 @@ class HitSurface:
                 self.ctx.fill_preserve()
             if obj.style[1]:
                 stroke = obj.style[1]
-                width = stroke[1] * trafo[0]
-                stroke_width /= trafo[0]
+                zoom = libgeom.get_trafo_scale(trafo)
+                width = stroke[1] * zoom
+                stroke_width /= zoom
                 if width < stroke_width:
                     width = stroke_width
                 self.ctx.set_line_width(width)
@@ -226,7 +226,8 @@ class GradientEditor(AbstractController):
         vector = [self.vector[0].point, self.vector[1].point]
         self.new_style[0][2][1] = libgeom.apply_trafo_to_points(vector, itrafo)
         if temp:
-            self.api.set_temp_style(self.target, self.new_style)
+            style = deepcopy(self.new_style)
+            self.api.set_temp_style(self.target, style)
         else:
             self.api.set_fill_style(deepcopy(self.new_style[0]))
         events.emit(events.APP_STATUS, self.msg)
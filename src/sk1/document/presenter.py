@@ -26,6 +26,7 @@ from sk1.document.api import PresenterAPI
 from sk1.document.eventloop import EventLoop
 from sk1.document.selection import Selection
 from sk1.document.snapping import SnapManager
+from sk1.document.spatialindex import SpatialIndex
 from sk1.document.ruler import RulerCorner, Ruler
 from sk1.document.canvas import AppCanvas
 from uc2 import uc2const
@@ -56,6 +57,7 @@ class SK1Presenter:
     selection = None
     traced_objects = None
     snap = None
+    spatial_index = None
     text_obj_style = None
 
     def __init__(self, app, doc_file='', silent=False, template=False):
@@ -104,6 +106,7 @@ class SK1Presenter:
         # self.app.default_cms.registry_cm(self.cms)
 
         self.api = PresenterAPI(self)
+        self.spatial_index = SpatialIndex(self)
         self.corner = RulerCorner(self)
         self.hruler = Ruler(self, vertical=False)
         self.vruler = Ruler(self)
@@ -175,7 +178,7 @@ class SK1Presenter:
         self.api.destroy()
         self.doc_presenter.close()
         for item in [self.canvas, self.corner, self.vruler, self.hruler,
-                     self.selection, self.snap]:
+                     self.selection, self.snap, self.spatial_index]:
             item.destroy()
 
         items = self.__dict__.keys()
@@ -208,11 +211,14 @@ class SK1Presenter:
                     objs.append(child)
                 layer.childs = []
             if objs:
-                self.api.paste_selected(objs)
+                symbols = doc_presenter.methods.copy_symbols(objs)
+                self.api.paste_selected(objs, symbols)
             else:
                 retval = False
         else:
             pages = doc_presenter.methods.get_pages()
+            symbols = doc_presenter.methods.copy_symbols(pages)
+            pages = self.methods.convert_instances(pages, symbols)
             pages_obj = doc_presenter.methods.get_pages_obj()
             pages_obj.childs = []
             if pages:
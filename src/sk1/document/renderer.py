@@ -19,7 +19,8 @@ import cairo
 import math
 from copy import deepcopy
 
-from sk1 import config
+from sk1 import config, events
+from sk1.document.tilecache import TileCache
 from uc2 import libcairo, libgeom
 from uc2 import uc2const, sk2const
 from uc2.formats.sk2.crenderer import CairoRenderer
@@ -27,6 +28,7 @@ from uc2.formats.sk2.crenderer import CairoRenderer
 CAIRO_BLACK = [0.0, 0.0, 0.0]
 CAIRO_GRAY = [0.0, 0.0, 0.0, 0.5]
 CAIRO_WHITE = [1.0, 1.0, 1.0]
+VIEWPORT_MARGIN = 5
 
 
 class PDRenderer(CairoRenderer):
@@ -41,6 +43,7 @@ class PDRenderer(CairoRenderer):
     doc_methods = None
     for_display = True
     temp_surface = None
+    tile_cache = None
 
     frame = []
     snap = []
@@ -53,8 +56,14 @@ class PDRenderer(CairoRenderer):
         CairoRenderer.__init__(self, cms)
         self.canvas = canvas
         self.direct_matrix = cairo.Matrix(1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+        self.tile_cache = TileCache(self)
+        events.connect(events.CMS_CHANGED, self.tile_cache.clear)
+        events.connect(events.CMS_CHANGED, self.clear_pattern_cache)
 
     def destroy(self):
+        events.disconnect(events.CMS_CHANGED, self.tile_cache.clear)
+        events.disconnect(events.CMS_CHANGED, self.clear_pattern_cache)
+        self.tile_cache.destroy()
         items = self.__dict__.keys()
         for item in items:
             self.__dict__[item] = None
@@ -122,11 +131,45 @@ class PDRenderer(CairoRenderer):
         self.doc_methods = self.presenter.methods
         self.cms = self.presenter.cms
         self.start()
-        self.paint_page()
-        self.render_doc()
+        self.paint_tiles()
         self.render_grid()
         self.render_guides()
 
+    def get_tile_key(self):
+        """
+        Returns description of rendering conditions. Cached tiles
+        are valid while the description is not changed.
+        """
+        canvas = self.canvas
+        methods = self.doc_methods
+        page = self.presenter.active_page
+        layers = [(layer, deepcopy(layer.properties), deepcopy(layer.style))
+                  for layer in page.childs]
+        return (canvas.zoom, canvas.trafo[4] % 1.0, canvas.trafo[5] % 1.0,
+                canvas.stroke_view, canvas.draft_view, self.cms.proofing,
+                page, tuple(self.presenter.get_page_size()),
+                methods.get_page_fill(), methods.get_page_border(),
+                methods.get_desktop_bg(), methods.get_doc_units(),
+                methods.get_doc_origin(), layers)
+
+    def paint_tiles(self):
+        tile_cache = self.tile_cache
+        trafo = self.canvas.trafo
+        tile_cache.set_key(self.get_tile_key())
+        tile_cache.invalidate(self.presenter.spatial_index.pop_dirty(), trafo)
+        self.ctx.set_matrix(self.direct_matrix)
+        tile_cache.paint(self.ctx, self.width, self.height, trafo)
+        self.ctx = cairo.Context(self.surface)
+        self.ctx.set_matrix(self.canvas.matrix)
+
+    def render_tile(self, surface, matrix, bbox):
+        self.ctx = cairo.Context(surface)
+        self.ctx.set_source_rgb(*self.doc_methods.get_desktop_bg())
+        self.ctx.paint()
+        self.ctx.set_matrix(matrix)
+        self.paint_page()
+        self.render_doc(bbox)
+
     def start(self):
         self.set_point_data()
         width, height = self.canvas.dc.get_size()
@@ -206,7 +249,16 @@ class PDRenderer(CairoRenderer):
             self.ctx.stroke()
         self.ctx.set_antialias(cairo.ANTIALIAS_DEFAULT)
 
-    def render_doc(self):
+    def get_visible_bbox(self):
+        """
+        Returns canvas window rectangle in document coordinates
+        extended by VIEWPORT_MARGIN pixels.
+        """
+        margin = VIEWPORT_MARGIN
+        bbox = [-margin, -margin, self.width + margin, self.height + margin]
+        return self.canvas.bbox_win_to_doc(bbox)
+
+    def render_doc(self, bbox=None):
         if self.canvas.draft_view:
             self.antialias_flag = False
         else:
@@ -218,6 +270,8 @@ class PDRenderer(CairoRenderer):
             self.contour_flag = False
 
         page = self.presenter.active_page
+        index = self.presenter.spatial_index
+        bbox = bbox or self.get_visible_bbox()
         for layer in page.childs:
             if layer.properties[0]:
                 if self.canvas.stroke_view:
@@ -226,7 +280,7 @@ class PDRenderer(CairoRenderer):
                     stroke[1] = 1.0 / self.canvas.zoom
                 if not layer.properties[3] and not self.canvas.draft_view:
                     self.antialias_flag = False
-                self.render(self.ctx, layer.childs)
+                self.render(self.ctx, index.get_objects(layer, bbox))
                 if not layer.properties[3] and not self.canvas.draft_view:
                     self.antialias_flag = True
 
@@ -82,7 +82,7 @@ class RulerCorner(Painter):
         self.eventloop.connect(self.eventloop.DOC_MODIFIED, self.changes)
         self.changes()
 
-    def changes(self):
+    def changes(self, *args):
         if not self.origin == self.presenter.model.doc_origin:
             self.origin = self.presenter.model.doc_origin
             self.dc.refresh()
@@ -112,7 +112,7 @@ class Selection:
             else libgeom.is_bbox_in_rect
         for layer in layers:
             for obj in layer.childs:
-                if rule(rect, obj.cache_bbox):
+                if obj.cache_bbox and rule(rect, obj.cache_bbox):
                     result.append(obj)
         self.add(result) if add_flag else self.set(result)
 
@@ -141,12 +141,18 @@ class Selection:
         layers.reverse()
         win_point = doc.canvas.doc_to_win(point)
         hit_surface = doc.canvas.hit_surface
+        index = doc.spatial_index
+        size = max(config.stroke_sensitive_size, 4.0) / doc.canvas.zoom
+        rect = libgeom.bbox_for_point(point, 2.0 * size)
         for layer in layers:
             if result:
                 break
-            objs = [] + layer.childs
+            objs = index.get_objects(layer, rect)
             objs.reverse()
             for obj in objs:
+                # e.g. instance of missing symbol
+                if not obj.cache_bbox:
+                    continue
                 bbox = self._get_fixed_bbox(obj)
                 d = 0.0
                 if obj.style[1]:
@@ -16,12 +16,147 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import math
+from bisect import bisect_left, insort
 
 from uc2 import libgeom, uc2const, sk2const
 
 from sk1 import config
 from sk1.appconst import SNAP_TO_GRID, SNAP_TO_GUIDES, SNAP_TO_OBJECTS, \
     SNAP_TO_PAGE
+from sk1.document.spatialindex import get_object_state, is_same_state
+
+REBUILD_RATIO = 0.5
+
+
+def get_nearest(values, value, dist):
+    """
+    Returns item of sorted values list nearest to value
+    if it is closer than dist, otherwise None.
+    """
+    index = bisect_left(values, value)
+    result = None
+    for item in values[max(index - 1, 0):index + 1]:
+        delta = abs(item - value)
+        if delta < dist:
+            result, dist = item, delta
+    return result
+
+
+def get_node_points(obj, trafo=None):
+    """
+    Returns nodes of primitive paths of object and its childs.
+    Content of symbol instances is placed by instance trafo.
+    """
+    points = []
+    if obj.is_instance:
+        symbol = obj.get_symbol()
+        if symbol is not None:
+            if trafo is not None:
+                trafo = libgeom.multiply_trafo(obj.trafo, trafo)
+            for child in symbol.childs:
+                points += get_node_points(child, trafo or obj.trafo)
+    elif obj.is_primitive:
+        if not obj.is_text and (obj.is_curve or obj.cache_paths):
+            for path in libgeom.get_transformed_paths(obj):
+                points.append(path[0])
+                for point in path[1]:
+                    points.append(point[2] if len(point) > 2 else point)
+            if trafo is not None:
+                points = libgeom.apply_trafo_to_points(points, trafo)
+    else:
+        for child in obj.childs:
+            points += get_node_points(child, trafo)
+    return points
+
+
+def get_snap_points(obj, nodes=False):
+    """
+    Returns object points for snapping: middle points of bbox edges
+    and, if nodes flag is set, nodes of object paths. Coordinates
+    are snapped on each axis separately, so middle points cover
+    bbox corners as well.
+    """
+    if not obj.cache_bbox:
+        return []
+    points = libgeom.bbox_middle_points(obj.cache_bbox)
+    if nodes:
+        points += get_node_points(obj)
+    return points
+
+
+class SnapIndex:
+    """
+    Sorted lists of x and y snap coordinates of objects.
+    The index is synchronized incrementally: points of objects with
+    changed state are removed and inserted using bisection, so lookup
+    and single object update cost is logarithmic in points number
+    (plus list shifting for updates).
+    """
+    entries = {}
+    xs = []
+    ys = []
+    nodes = False
+
+    def __init__(self):
+        self.entries = {}
+        self.xs = []
+        self.ys = []
+        self.nodes = False
+
+    def _remove(self, obj):
+        xs, ys = self.entries.pop(obj)[1:]
+        for values, items in ((self.xs, xs), (self.ys, ys)):
+            for item in items:
+                del values[bisect_left(values, item)]
+
+    def _add(self, obj, state, rebuild=False):
+        points = get_snap_points(obj, self.nodes)
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        self.entries[obj] = (state, xs, ys)
+        if rebuild:
+            return
+        for item in xs:
+            insort(self.xs, item)
+        for item in ys:
+            insort(self.ys, item)
+
+    def rebuild(self, objs):
+        self.entries = {}
+        for obj in objs:
+            self._add(obj, get_object_state(obj), True)
+        self.xs = []
+        self.ys = []
+        for state, xs, ys in self.entries.values():
+            self.xs += xs
+            self.ys += ys
+        self.xs.sort()
+        self.ys.sort()
+
+    def synchronize(self, objs, nodes=False):
+        if nodes != self.nodes:
+            # all snap points are changed
+            self.nodes = nodes
+            self.rebuild(objs)
+            return
+        entries = self.entries
+        current = set(objs)
+        removed = [obj for obj in entries if obj not in current]
+        changed = []
+        for obj in objs:
+            state = get_object_state(obj)
+            entry = entries.get(obj)
+            if entry is None or not is_same_state(entry[0], state):
+                changed.append((obj, state))
+        if len(removed) + len(changed) > len(objs) * REBUILD_RATIO:
+            self.rebuild(objs)
+            return
+        for obj in removed:
+            self._remove(obj)
+        for obj, state in changed:
+            if obj in entries:
+                self._remove(obj)
+            self._add(obj, state)
 
 
 class SnapManager:
@@ -37,6 +172,7 @@ class SnapManager:
     snap_to_guides = False
     snap_to_objects = False
     snap_to_page = False
+    snap_to_nodes = False
     snap_dict = {}
     snap_point_dict = {}
 
@@ -47,6 +183,7 @@ class SnapManager:
     grid_doc = []
     page_grid = []
     objects_grid = []
+    objects_index = None
     guides_grid = []
 
     def __init__(self, presenter):
@@ -61,6 +198,8 @@ class SnapManager:
         self.snap_to_guides = config.snap_to_guides
         self.snap_to_objects = config.snap_to_objects
         self.snap_to_page = config.snap_to_page
+        self.snap_to_nodes = config.snap_to_nodes
+        self.objects_index = SnapIndex()
         self.snap_point_dict = {SNAP_TO_GRID: self.snap_point_to_grid,
                                 SNAP_TO_GUIDES: self.snap_point_to_guides,
                                 SNAP_TO_OBJECTS: self.snap_point_to_objects,
@@ -99,16 +238,15 @@ class SnapManager:
                     self.guides_grid[1].append(child.position)
                 else:
                     self.guides_grid[0].append(child.position)
+        self.guides_grid[0].sort()
+        self.guides_grid[1].sort()
 
     def update_objects_grid(self):
-        self.objects_grid = [[], []]
-        layers = self.presenter.get_visible_layers()
-        for layer in layers:
-            for obj in layer.childs:
-                points = libgeom.bbox_middle_points(obj.cache_bbox)
-                for point in points:
-                    self.objects_grid[0].append(point[0])
-                    self.objects_grid[1].append(point[1])
+        objs = []
+        for layer in self.presenter.get_visible_layers():
+            objs += layer.childs
+        self.objects_index.synchronize(objs, self.snap_to_nodes)
+        self.objects_grid = [self.objects_index.xs, self.objects_index.ys]
 
     def update_page_grid(self):
         self._calc_page_grid()
@@ -167,22 +305,20 @@ class SnapManager:
         snap_dist = config.snap_distance / self.canvas.zoom
 
         if self.snap_x:
-            for item in snap_dict[0]:
-                if abs(item - doc_point[0]) < snap_dist:
-                    ret = True
-                    x = self.canvas.point_doc_to_win([item, doc_point[1]])[0]
-                    x_doc = item
-                    self.active_snap[0] = x_doc
-                    break
+            item = get_nearest(snap_dict[0], doc_point[0], snap_dist)
+            if item is not None:
+                ret = True
+                x = self.canvas.point_doc_to_win([item, doc_point[1]])[0]
+                x_doc = item
+                self.active_snap[0] = x_doc
 
         if self.snap_y:
-            for item in snap_dict[1]:
-                if abs(item - doc_point[1]) < snap_dist:
-                    ret = True
-                    y = self.canvas.point_doc_to_win([doc_point[0], item])[1]
-                    y_doc = item
-                    self.active_snap[1] = y_doc
-                    break
+            item = get_nearest(snap_dict[1], doc_point[1], snap_dist)
+            if item is not None:
+                ret = True
+                y = self.canvas.point_doc_to_win([doc_point[0], item])[1]
+                y_doc = item
+                self.active_snap[1] = y_doc
 
         return ret, [x, y], [x_doc, y_doc]
 
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+
+MIN_CELL_SIZE = 1.0
+MAX_OBJ_CELLS = 64
+REBUILD_RATIO = 0.5
+ARROW_FACTOR = 10.0
+INFINITE_BBOX = (-float('inf'), -float('inf'), float('inf'), float('inf'))
+
+
+def get_render_bbox(obj):
+    """
+    Returns object bbox extended by stroke, miter joins and arrows,
+    i.e. the area which can be affected by object rendering.
+    Objects without bbox are considered as infinite ones.
+    """
+    if not obj.cache_bbox:
+        return INFINITE_BBOX
+    if obj.is_primitive:
+        x0, y0, x1, y1 = obj.cache_bbox
+        stroke = obj.style[1]
+        if stroke:
+            width = obj.cache_line_width or stroke[1]
+            pad = width * max(stroke[6], 1.0) / 2.0
+            if obj.cache_arrows:
+                pad = max(pad, width * ARROW_FACTOR)
+            return x0 - pad, y0 - pad, x1 + pad, y1 + pad
+        return x0, y0, x1, y1
+    if obj.childs:
+        bboxes = [get_render_bbox(child) for child in obj.childs]
+        if INFINITE_BBOX in bboxes:
+            return INFINITE_BBOX
+        return (min([item[0] for item in bboxes]),
+                min([item[1] for item in bboxes]),
+                max([item[2] for item in bboxes]),
+                max([item[3] for item in bboxes]))
+    x0, y0, x1, y1 = obj.cache_bbox
+    return x0, y0, x1, y1
+
+
+def get_object_state(obj):
+    """
+    Returns list of object fields (and fields of object childs) which
+    are replaced by new values on any object modification. Comparing
+    items by identity allows detecting changed objects cheaply.
+    """
+    state = [obj.cache_bbox, obj.style]
+    if obj.is_primitive:
+        state += [obj.fill_trafo, obj.stroke_trafo]
+        if obj.is_pixmap:
+            state.append(obj.handler)
+    for child in obj.childs or []:
+        state += get_object_state(child)
+    return state
+
+
+def is_same_state(state1, state2):
+    if len(state1) != len(state2):
+        return False
+    for item1, item2 in zip(state1, state2):
+        if item1 is not item2:
+            return False
+    return True
+
+
+class LayerIndex:
+    """
+    Uniform grid index over bboxes of layer top level objects.
+    Objects which cover too many cells are kept in separate list.
+    The index is synchronized with layer content incrementally:
+    only objects with changed state are reindexed. Render bboxes
+    of changed objects (before and after change) are collected
+    in dirty list; None value means that whole layer is changed.
+    """
+    layer = None
+    cell_size = MIN_CELL_SIZE
+    entries = {}
+    cells = {}
+    large = set()
+    order = {}
+    childs = None
+    childs_snapshot = []
+    dirty = []
+
+    def __init__(self, layer):
+        self.layer = layer
+        self.entries = {}
+        self.cells = {}
+        self.large = set()
+        self.order = {}
+        self.childs = None
+        self.childs_snapshot = []
+        self.dirty = []
+
+    def destroy(self):
+        items = self.__dict__.keys()
+        for item in items:
+            self.__dict__[item] = None
+
+    def _get_cell_range(self, bbox):
+        size = self.cell_size
+        x0, y0, x1, y1 = bbox
+        return (int(math.floor(x0 / size)), int(math.floor(y0 / size)),
+                int(math.floor(x1 / size)), int(math.floor(y1 / size)))
+
+    def _add(self, obj, bbox):
+        state = get_object_state(obj)
+        if bbox is INFINITE_BBOX:
+            self.large.add(obj)
+            self.entries[obj] = (state, bbox, None)
+            return
+        i0, j0, i1, j1 = self._get_cell_range(bbox)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > MAX_OBJ_CELLS:
+            self.large.add(obj)
+            self.entries[obj] = (state, bbox, None)
+            return
+        keys = []
+        cells = self.cells
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                key = (i, j)
+                if key not in cells:
+                    cells[key] = set()
+                cells[key].add(obj)
+                keys.append(key)
+        self.entries[obj] = (state, bbox, keys)
+
+    def _remove(self, obj):
+        keys = self.entries.pop(obj)[2]
+        if keys is None:
+            self.large.discard(obj)
+            return
+        cells = self.cells
+        for key in keys:
+            cell = cells[key]
+            cell.discard(obj)
+            if not cell:
+                del cells[key]
+
+    def rebuild(self):
+        self.entries = {}
+        self.cells = {}
+        self.large = set()
+        childs = self.layer.childs
+        bboxes = [get_render_bbox(obj) for obj in childs]
+        sizes = [max(item[2] - item[0], item[3] - item[1])
+                 for item in bboxes if item is not INFINITE_BBOX]
+        if sizes:
+            # cell is twice as large as median object
+            sizes.sort()
+            self.cell_size = max(2.0 * sizes[len(sizes) // 2], MIN_CELL_SIZE)
+        for obj, bbox in zip(childs, bboxes):
+            self._add(obj, bbox)
+        self._update_order()
+
+    def _update_order(self):
+        self.childs = self.layer.childs
+        self.childs_snapshot = [] + self.childs
+        self.order = dict([(obj, index)
+                           for index, obj in enumerate(self.childs)])
+
+    def synchronize(self, objs=None):
+        """
+        Reindexes inserted, deleted and transformed objects.
+        If changed top level objects are provided, only they
+        are checked for state changes, otherwise all objects are.
+        """
+        childs = self.layer.childs
+        if self.childs is None:
+            self.rebuild()
+            self.dirty = None
+            return
+        changes = 0
+        entries = self.entries
+        dirty = self.dirty
+        candidates = childs if objs is None else set(objs)
+        if childs is not self.childs or childs != self.childs_snapshot:
+            current = set(childs)
+            for obj in set(entries).difference(current):
+                if dirty is not None:
+                    dirty.append(entries[obj][1])
+                self._remove(obj)
+                changes += 1
+            if dirty is not None:
+                # objects which are moved in z-order
+                old_seq = [obj for obj in self.childs_snapshot
+                           if obj in current]
+                new_seq = [obj for obj in childs if obj in entries]
+                for obj1, obj2 in zip(old_seq, new_seq):
+                    if obj1 is not obj2:
+                        dirty.append(entries[obj1][1])
+            if objs is not None:
+                candidates.update(current.difference(entries))
+            self._update_order()
+        limit = max(len(childs) * REBUILD_RATIO, MAX_OBJ_CELLS)
+        order = self.order
+        for obj in candidates:
+            if obj not in order:
+                continue
+            entry = entries.get(obj)
+            if entry is not None and \
+                    is_same_state(entry[0], get_object_state(obj)):
+                continue
+            if entry is not None:
+                if dirty is not None:
+                    dirty.append(entry[1])
+                self._remove(obj)
+            bbox = get_render_bbox(obj)
+            self._add(obj, bbox)
+            if dirty is not None:
+                dirty.append(bbox)
+            changes += 1
+            if changes > limit:
+                self.rebuild()
+                self.dirty = None
+                return
+
+    def pop_dirty(self):
+        """
+        Returns collected dirty bboxes (or None if whole layer
+        is changed) and resets the list.
+        """
+        dirty = self.dirty
+        self.dirty = []
+        return dirty
+
+    def get_objects(self, bbox):
+        """
+        Returns layer objects which render area intersects provided bbox.
+        Objects are returned in z-order.
+        """
+        x0, y0, x1, y1 = bbox
+        i0, j0, i1, j1 = self._get_cell_range(bbox)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self.cells):
+            candidates = self.entries.keys()
+        else:
+            candidates = set(self.large)
+            cells = self.cells
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    cell = cells.get((i, j))
+                    if cell:
+                        candidates.update(cell)
+        entries = self.entries
+        result = []
+        for obj in candidates:
+            bx0, by0, bx1, by1 = entries[obj][1]
+            if bx0 <= x1 and bx1 >= x0 and by0 <= y1 and by1 >= y0:
+                result.append(obj)
+        result.sort(key=self.order.__getitem__)
+        return result
+
+
+class SpatialIndex:
+    """
+    Document level manager of layer indexes.
+    Indexes are marked as outdated on document modification
+    and synchronized lazily on first query. If modification
+    notifications provide changed objects, only layers and top
+    level objects containing them are synchronized.
+    """
+    presenter = None
+    indexes = {}
+    outdated = True
+    changed = None
+    dirty = []
+
+    def __init__(self, presenter):
+        self.presenter = presenter
+        self.indexes = {}
+        self.outdated = True
+        self.changed = None
+        self.dirty = []
+        el = self.presenter.eventloop
+        el.connect(el.DOC_MODIFIED, self.invalidate)
+        el.connect(el.PAGE_CHANGED, self.invalidate)
+
+    def destroy(self):
+        for index in self.indexes.values():
+            index.destroy()
+        items = self.__dict__.keys()
+        for item in items:
+            self.__dict__[item] = None
+
+    def invalidate(self, objs=None):
+        """
+        Marks indexes as outdated. Changed objects are collected
+        while possible, None value means unknown changes.
+        """
+        if objs is None:
+            self.changed = None
+        elif not self.outdated:
+            self.changed = set(objs)
+        elif self.changed is not None:
+            self.changed.update(objs)
+        self.outdated = True
+
+    def _get_changed_layers(self):
+        """
+        Returns dict of indexed layers and sets of their changed top
+        level objects, or None if changes cannot be localized.
+        """
+        layers = {}
+        for obj in self.changed:
+            child = None
+            while obj is not None and not obj.is_layer:
+                child, obj = obj, obj.parent
+            if obj is None:
+                if child is not None and child.is_selectable:
+                    # detached object, it is not in any layer
+                    continue
+                return None
+            if obj in self.indexes:
+                objs = layers.setdefault(obj, set())
+                if child is not None:
+                    objs.add(child)
+        return layers
+
+    def get_layer_index(self, layer):
+        index = self.indexes.get(layer)
+        if index is None:
+            index = self.indexes[layer] = LayerIndex(layer)
+            index.rebuild()
+        return index
+
+    def synchronize(self):
+        if not self.outdated:
+            return
+        layers = None
+        if self.changed is not None:
+            layers = self._get_changed_layers()
+        for layer, index in self.indexes.items():
+            if layer.childs is None:
+                index.destroy()
+                del self.indexes[layer]
+                self.dirty = None
+            elif layers is None or layer in layers:
+                index.synchronize(None if layers is None else layers[layer])
+                dirty = index.pop_dirty()
+                if dirty is None:
+                    self.dirty = None
+                elif self.dirty is not None:
+                    self.dirty += dirty
+        self.outdated = False
+        self.changed = None
+
+    def pop_dirty(self):
+        """
+        Returns render bboxes of objects changed since previous call
+        or None if changes cannot be localized.
+        """
+        self.synchronize()
+        dirty = self.dirty
+        self.dirty = []
+        return dirty
+
+    def get_objects(self, layer, bbox):
+        """
+        Returns top level objects of layer intersecting bbox in z-order.
+        """
+        self.synchronize()
+        return self.get_layer_index(layer).get_objects(bbox)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import cairo
+import math
+from collections import OrderedDict
+
+TILE_SIZE = 256
+TILE_CACHE_SIZE = 160
+TILE_MARGIN = 2.0
+
+
+class TileCache:
+    """
+    Cache of rendered document tiles (desktop, page and layer objects).
+    Tiles are placed in window pixel grid shifted by integer part of
+    canvas offset, so panning reuses already rendered tiles. Cache is
+    dropped on zoom and other scene changes (tile key) and partially
+    invalidated by dirty bboxes of modified objects.
+    """
+    renderer = None
+    tiles = None
+    key = None
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.tiles = OrderedDict()
+        self.key = None
+
+    def destroy(self):
+        self.clear()
+        items = self.__dict__.keys()
+        for item in items:
+            self.__dict__[item] = None
+
+    def clear(self, *args):
+        self.tiles.clear()
+
+    def set_key(self, key):
+        if key != self.key:
+            self.clear()
+            self.key = key
+
+    def _get_offsets(self, trafo):
+        ox = math.floor(trafo[4])
+        oy = math.floor(trafo[5])
+        return int(ox), int(oy), trafo[4] - ox, trafo[5] - oy
+
+    def invalidate(self, bboxes, trafo):
+        """
+        Removes tiles intersecting provided document bboxes.
+        None value means whole document.
+        """
+        if bboxes is None:
+            self.clear()
+            return
+        if not bboxes or not self.tiles:
+            return
+        zoom = trafo[0]
+        fx, fy = self._get_offsets(trafo)[2:]
+        rects = []
+        for x0, y0, x1, y1 in bboxes:
+            u0 = (zoom * x0 + fx - TILE_MARGIN) / TILE_SIZE
+            u1 = (zoom * x1 + fx + TILE_MARGIN) / TILE_SIZE
+            v0 = (-zoom * y1 + fy - TILE_MARGIN) / TILE_SIZE
+            v1 = (-zoom * y0 + fy + TILE_MARGIN) / TILE_SIZE
+            if math.isinf(u0 - u1) or math.isinf(v0 - v1) or \
+                    math.isnan(u0 - u1) or math.isnan(v0 - v1):
+                self.clear()
+                return
+            rects.append((math.floor(u0), math.floor(v0), u1, v1))
+        for i, j in self.tiles.keys():
+            for u0, v0, u1, v1 in rects:
+                if u0 <= i <= u1 and v0 <= j <= v1:
+                    del self.tiles[(i, j)]
+                    break
+
+    def get_tile_bbox(self, i, j, trafo):
+        """
+        Returns document bbox covered by tile.
+        """
+        zoom = trafo[0]
+        fx, fy = self._get_offsets(trafo)[2:]
+        margin = TILE_MARGIN
+        x0 = (i * TILE_SIZE - margin - fx) / zoom
+        x1 = ((i + 1) * TILE_SIZE + margin - fx) / zoom
+        y0 = (fy - (j + 1) * TILE_SIZE - margin) / zoom
+        y1 = (fy - j * TILE_SIZE + margin) / zoom
+        return [x0, y0, x1, y1]
+
+    def _render_tile(self, i, j, trafo):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, TILE_SIZE, TILE_SIZE)
+        fx, fy = self._get_offsets(trafo)[2:]
+        matrix = cairo.Matrix(trafo[0], trafo[1], trafo[2], trafo[3],
+                              fx - i * TILE_SIZE, fy - j * TILE_SIZE)
+        bbox = self.get_tile_bbox(i, j, trafo)
+        self.renderer.render_tile(surface, matrix, bbox)
+        return surface
+
+    def paint(self, ctx, width, height, trafo):
+        """
+        Paints visible tiles on window context rendering missing ones.
+        """
+        ox, oy = self._get_offsets(trafo)[:2]
+        tiles = self.tiles
+        i0 = int(math.floor(float(-ox) / TILE_SIZE))
+        j0 = int(math.floor(float(-oy) / TILE_SIZE))
+        i1 = int(math.floor(float(width - ox) / TILE_SIZE))
+        j1 = int(math.floor(float(height - oy) / TILE_SIZE))
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                key = (i, j)
+                surface = tiles.pop(key, None)
+                if surface is None:
+                    surface = self._render_tile(i, j, trafo)
+                tiles[key] = surface
+                ctx.set_source_surface(surface, ox + i * TILE_SIZE,
+                                       oy + j * TILE_SIZE)
+                ctx.paint()
+        limit = max(TILE_CACHE_SIZE, (i1 - i0 + 1) * (j1 - j0 + 1))
+        while len(tiles) > limit:
+            tiles.popitem(last=False)
@@ -59,7 +59,8 @@ class AppMenuBar(wal.MenuBar):
                              pdids.ID_SHOW_SNAP, pdids.ID_SHOW_PAGE_BORDER)),
                None,
                (_("S&nap to"), (pdids.ID_SNAP_TO_GRID, pdids.ID_SNAP_TO_GUIDE,
-                                pdids.ID_SNAP_TO_OBJ, pdids.ID_SNAP_TO_PAGE)),
+                                pdids.ID_SNAP_TO_OBJ, pdids.ID_SNAP_TO_PAGE,
+                                None, pdids.ID_SNAP_TO_NODES)),
                None, pdids.ID_ICONIZER,
                wal.ID_REFRESH,)
         entry = (_("&View"), sub)
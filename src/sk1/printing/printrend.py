@@ -16,7 +16,8 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from uc2 import uc2const, libimg
-from uc2.formats.sk2.crenderer import CairoRenderer
+from uc2.formats.sk2.crenderer import CairoRenderer, PATTERN_NORMAL, \
+    PATTERN_PROOFING, PATTERN_CONTOUR
 
 
 class PrintRenderer(CairoRenderer):
@@ -40,7 +41,7 @@ class PrintRenderer(CairoRenderer):
             r, g, b = self.cms.get_display_color(gc)
         return r, g, b, color[2]
 
-    def get_surface(self, obj):
+    def get_surface(self, obj, scale=1.0):
         if self.colorspace == uc2const.COLOR_RGB:
             return obj.handler.get_surface(self.cms)
         elif self.colorspace == uc2const.COLOR_CMYK:
@@ -48,20 +49,9 @@ class PrintRenderer(CairoRenderer):
         else:
             return obj.handler.get_surface(self.cms, stroke_mode=True)
 
-    def get_pattern_surface(self, obj):
-        image_obj = self._create_pattern_image(obj)
+    def get_pattern_mode(self):
         if self.colorspace == uc2const.COLOR_RGB:
-            if not obj.cache_pattern_img:
-                s = image_obj.handler.get_surface(self.cms)
-                obj.cache_pattern_img = s
-            return obj.cache_pattern_img
+            return PATTERN_NORMAL
         elif self.colorspace == uc2const.COLOR_CMYK:
-            if not obj.cache_ps_pattern_img:
-                s = image_obj.handler.get_surface(self.cms, True)
-                obj.cache_ps_pattern_img = s
-            return obj.cache_ps_pattern_img
-        else:
-            if not obj.cache_gray_pattern_img:
-                s = image_obj.handler.get_surface(self.cms, stroke_mode=True)
-                obj.cache_gray_pattern_img = s
-            return obj.cache_gray_pattern_img
+            return PATTERN_PROOFING
+        return PATTERN_CONTOUR
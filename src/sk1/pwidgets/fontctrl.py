@@ -15,47 +15,112 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import hashlib
 import logging
+import os
+
 import cairo
 
 import wal
 from sk1 import _, config, events
 from sk1.resources import icons, get_icon
 from uc2 import libpango, cms
+from uc2.utils import fsutils
 
-FONTNAME_CACHE = []
-FONTSAMPLE_CACHE = []
 MAXSIZE = []
 
 LOG = logging.getLogger(__name__)
 
 
-def generate_fontname_cache(fonts):
-    maxwidth = 0
-    height = 0
-    for item in fonts:
-        try:
-            bmp, size = wal.text_to_bitmap(item)
-        except Exception as e:
-            LOG.error('Cannot process font <%s> %s', item, e)
-            continue
-        FONTNAME_CACHE.append(bmp)
-        maxwidth = max(size[0], maxwidth)
-        height = size[1]
-    MAXSIZE.append(maxwidth)
-    MAXSIZE.append(height)
-
-
-def generate_fontsample_cache(fonts):
-    w = config.font_preview_width
-    fontsize = config.font_preview_size
-    color = cms.val_255(config.font_preview_color)
-    text = config.font_preview_text.decode('utf-8')
-    for item in fonts:
-        h = libpango.get_sample_size(text, item, fontsize)[1]
-        if not h:
-            h = 10
-            LOG.warn('Incorrect font <%s>: zero font height', item)
+class FontPreviews(object):
+    """
+    Font name and sample bitmaps generated on demand, i.e. for visible
+    rows of font list only. Rendered samples are stored on disk
+    (in application config directory) as PNG masks named by hash
+    of preview settings, font family and its faces. So samples are
+    reused in next sessions and only changed families are re-rendered.
+    Sample height is measured for each family on first request.
+    """
+    cache_dir = ''
+    names = None
+    samples = None
+    sample_heights = None
+
+    def __init__(self):
+        self.names = {}
+        self.samples = {}
+        self.sample_heights = {}
+
+    def get_cache_dir(self):
+        if not self.cache_dir and config.app is not None:
+            path = os.path.join(config.app.appdata.app_config_dir,
+                                'font_previews')
+            if not fsutils.lexists(path):
+                fsutils.makedirs(path)
+            self.cache_dir = path
+        return self.cache_dir
+
+    def get_sample_height(self, family):
+        h = self.sample_heights.get(family)
+        if h is None:
+            text = config.font_preview_text.decode('utf-8')
+            fontsize = config.font_preview_size
+            h = libpango.get_sample_size(text, family, fontsize)[1] or 10
+            self.sample_heights[family] = h
+        return h
+
+    def get_sample_path(self, family):
+        faces = libpango.get_fonts()[1].get(family, [])
+        key = '%s|%d|%d|%d|%s|%s' % (config.font_preview_text,
+                                     config.font_preview_width,
+                                     config.font_preview_size,
+                                     self.get_sample_height(family),
+                                     family, ','.join(faces))
+        filename = hashlib.md5(key).hexdigest() + '.png'
+        return os.path.join(self.get_cache_dir(), filename)
+
+    def get_name_bitmap(self, family):
+        bmp = self.names.get(family)
+        if bmp is None:
+            try:
+                bmp = wal.text_to_bitmap(family)[0]
+            except Exception as e:
+                LOG.error('Cannot process font <%s> %s', family, e)
+                bmp = wal.text_to_bitmap('?')[0]
+            self.names[family] = bmp
+        return bmp
+
+    def get_sample_bitmap(self, family):
+        bmp = self.samples.get(family)
+        if bmp is None:
+            surface = self.get_sample_surface(family)
+            color = cms.val_255(config.font_preview_color)
+            bmp = wal.copy_surface_to_bitmap(surface)
+            bmp = wal.invert_text_bitmap(bmp, color)
+            self.samples[family] = bmp
+        return bmp
+
+    def get_sample_surface(self, family):
+        path = self.get_sample_path(family) if self.get_cache_dir() else ''
+        if path and fsutils.lexists(path):
+            try:
+                return cairo.ImageSurface.create_from_png(
+                    fsutils.get_sys_path(path))
+            except Exception as e:
+                LOG.warn('Cannot load font sample %s %s', path, e)
+        surface = self.render_sample(family)
+        if path:
+            try:
+                surface.write_to_png(fsutils.get_sys_path(path))
+            except Exception as e:
+                LOG.warn('Cannot save font sample %s %s', path, e)
+        return surface
+
+    def render_sample(self, family):
+        w = config.font_preview_width
+        h = self.get_sample_height(family)
+        fontsize = config.font_preview_size
+        text = config.font_preview_text.decode('utf-8')
         surface = cairo.ImageSurface(cairo.FORMAT_RGB24, w, h)
         ctx = cairo.Context(surface)
         ctx.set_source_rgb(0.0, 0.0, 0.0)
@@ -64,16 +129,80 @@ def generate_fontsample_cache(fonts):
         ctx.set_matrix(matrix)
         ctx.set_source_rgb(1.0, 1.0, 1.0)
         ctx.set_antialias(cairo.ANTIALIAS_DEFAULT)
-        libpango.render_sample(ctx, text, item, fontsize)
+        libpango.render_sample(ctx, text, family, fontsize)
         ctx.fill()
-        bmp = wal.copy_surface_to_bitmap(surface)
-        FONTSAMPLE_CACHE.append(wal.invert_text_bitmap(bmp, color))
+        return surface
+
+    def clear_samples(self):
+        self.samples = {}
+        self.sample_heights = {}
+
+    def generate(self, fonts):
+        """
+        Renders all missing samples and removes stale ones.
+        """
+        for item in fonts:
+            self.get_sample_bitmap(item)
+        self.prune(fonts)
+
+    def prune(self, fonts):
+        """
+        Removes samples of uninstalled (or changed) fonts
+        and samples of previous preview settings.
+        """
+        cache_dir = self.get_cache_dir()
+        if not cache_dir:
+            return
+        paths = set([os.path.basename(self.get_sample_path(item))
+                     for item in fonts])
+        for filename in os.listdir(fsutils.get_sys_path(cache_dir)):
+            if filename.endswith('.png') and filename not in paths:
+                try:
+                    os.remove(os.path.join(fsutils.get_sys_path(cache_dir),
+                                           filename))
+                except OSError:
+                    pass
+
+
+PREVIEWS = FontPreviews()
+
+
+class FontBitmaps(object):
+    """
+    Sequence of font bitmaps (or sample heights) generated
+    on first access.
+    """
+    fonts = None
+    getter = None
+
+    def __init__(self, fonts, getter):
+        self.fonts = fonts
+        self.getter = getter
+
+    def __len__(self):
+        return len(self.fonts)
+
+    def __getitem__(self, index):
+        return self.getter(self.fonts[index])
+
+
+def get_maxsize(fonts):
+    if not MAXSIZE:
+        MAXSIZE[:] = list(wal.get_max_text_size(fonts))
+    return MAXSIZE
 
 
 def generate_fcache():
     fonts = libpango.get_fonts()[0]
-    generate_fontname_cache(fonts)
-    generate_fontsample_cache(fonts)
+    get_maxsize(fonts)
+    PREVIEWS.generate(fonts)
+
+
+def check_fcache():
+    """
+    Checks font catalog and removes stale font samples.
+    """
+    PREVIEWS.prune(libpango.get_fonts()[0])
 
 
 class FontChoice(wal.FontBitmapChoice):
@@ -81,24 +210,25 @@ class FontChoice(wal.FontBitmapChoice):
 
     def __init__(self, parent, selected_font='Sans', onchange=None):
         self.fonts = libpango.get_fonts()[0]
-        if not FONTNAME_CACHE:
-            generate_fontname_cache(self.fonts)
-            generate_fontsample_cache(self.fonts)
         if selected_font not in self.fonts:
             selected_font = 'Sans'
         value = self.fonts.index(selected_font)
         icon = get_icon(icons.PD_FONT, size=wal.DEF_SIZE)
-        wal.FontBitmapChoice.__init__(self, parent, value, MAXSIZE,
-                                      self.fonts, FONTNAME_CACHE,
-                                      FONTSAMPLE_CACHE, icon, onchange)
+        names = FontBitmaps(self.fonts, PREVIEWS.get_name_bitmap)
+        samples = FontBitmaps(self.fonts, PREVIEWS.get_sample_bitmap)
+        heights = FontBitmaps(self.fonts, PREVIEWS.get_sample_height)
+        wal.FontBitmapChoice.__init__(self, parent, value,
+                                      get_maxsize(self.fonts), self.fonts,
+                                      names, samples, icon, onchange,
+                                      config.font_preview_width, heights)
         events.connect(events.CONFIG_MODIFIED, self.check_config)
 
     def check_config(self, *args):
         if args[0].startswith('font_preview'):
-            FONTSAMPLE_CACHE[:] = []
-            generate_fontsample_cache(self.fonts)
+            PREVIEWS.clear_samples()
+            self.sample_width = config.font_preview_width
             index = self._get_active()
-            self._set_bitmaps(self.bitmaps, FONTSAMPLE_CACHE)
+            self._set_bitmaps(self.bitmaps, self.sample_bitmaps)
             self._set_active(index)
 
     def get_font_family(self):
@@ -94,6 +94,7 @@ LABELS = {
     pdids.ID_SNAP_TO_GUIDE: (_('Snap to guide'),),
     pdids.ID_SNAP_TO_OBJ: (_('Snap to objects'),),
     pdids.ID_SNAP_TO_PAGE: (_('Snap to page'),),
+    pdids.ID_SNAP_TO_NODES: (_('Snap to object nodes'),),
     pdids.ID_ICONIZER: (_('Iconizer...'),),
     wal.ID_REFRESH: (_('Redraw document'),),
 
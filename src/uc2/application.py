@@ -21,7 +21,7 @@ import os
 import sys
 
 import uc2
-from uc2 import app_cms, uc2const
+from uc2 import app_cms, batch, uc2const
 from uc2 import events, msgconst
 from uc2.app_palettes import PaletteManager
 from uc2.formats import get_loader, get_saver, get_saver_by_id
@@ -32,10 +32,18 @@ from uc2.utils.mixutils import echo, config_logging
 LOG = logging.getLogger(__name__)
 
 
+class TranslationError(Exception):
+    pass
+
+
 def log_stub(*args):
     return args
 
 
+def log_message(*args):
+    LOG_MAP[args[0]](args[1])
+
+
 LOG_MAP = {
     msgconst.JOB: LOG.info,
     msgconst.INFO: LOG.info,
@@ -52,7 +60,10 @@ Universal vector graphics format translator
 copyright (C) 2007-%s sK1 Project Team (https://sk1project.net)
 
 Usage: uniconvertor [OPTIONS] [INPUT FILE] [OUTPUT FILE]
+       uniconvertor [OPTIONS] [INPUT DIR|FILE LIST] [OUTPUT PATTERN]
 Example: uniconvertor drawing.cdr drawing.svg
+         uniconvertor --jobs=4 --format=svg ~/drawings ~/svg
+         uniconvertor --batch --jobs=4 filelist.txt ~/svg/{name}.svg
 
  Available options:
  --help      Display this help and exit
@@ -60,6 +71,16 @@ Example: uniconvertor drawing.cdr drawing.svg
  --log=      Logging level: DEBUG, INFO, WARN, ERROR (by default, INFO)
  --format=   Type of output file format (values provided below)
 
+ Batch mode options:
+ --batch     Input file is a list of file paths (one path per line)
+ --jobs=     Number of worker processes (by default, number of CPUs)
+ --recursive Scan input directory recursively
+ --timeout=  Maximum translation time of single file in seconds
+
+ In batch mode output is a directory or a pattern with {name} (input
+ file name without extension) and {dir} (input file subdirectory)
+ placeholders. Results are printed as JSON lines.
+
 ---INPUT FILE FORMATS-------------------------------
 
  Supported input vector graphics file formats:
@@ -167,13 +188,6 @@ class UCApplication(object):
                     filename = os.path.join(cwd, filename)
                 files.append(filename)
 
-        if not files:
-            self.show_short_help('File names are not provided!')
-        elif len(files) == 1:
-            self.show_short_help('Destination file name is not provided!')
-        elif not os.path.lexists(files[0]):
-            self.show_short_help('Source file "%s" is not found!' % files[0])
-
         for item in options_list:
             result = item[2:].split('=')
             if not len(result) == 2:
@@ -189,8 +203,25 @@ class UCApplication(object):
                     value = {'yes': True, 'no': False}[value.lower()]
                 options[key] = value
 
+        if not files:
+            self.show_short_help('File names are not provided!')
+        elif len(files) == 1:
+            self.show_short_help('Destination file name is not provided!')
+        elif not os.path.lexists(files[0]):
+            self.show_short_help('Source file "%s" is not found!' % files[0])
+
+        batch_mode = batch.is_batch_mode(files[0], options)
+        if batch_mode and not batch.is_output_pattern(files[1]) \
+                and not options.get('format'):
+            self.show_short_help('Output file format is not provided!')
+
         self.do_verbose = options.get('verbose', False)
-        events.connect(events.MESSAGES, self.verbose)
+        # nobody listens progress in console
+        events.set_progress_enabled(False)
+        if batch_mode:
+            events.connect(events.MESSAGES, log_message)
+        else:
+            events.connect(events.MESSAGES, self.verbose)
         log_level = options.get('log', self.config.log_level)
         self.log_filepath = os.path.join(self.appdata.app_config_dir, 'uc2.log')
         config_logging(self.log_filepath, log_level)
@@ -198,74 +229,77 @@ class UCApplication(object):
         self.default_cms = app_cms.AppColorManager(self)
         self.palettes = PaletteManager(self)
 
+        if batch_mode:
+            translator = batch.BatchTranslator(self, files[0], files[1],
+                                               options)
+            sys.exit(translator.run())
+
         msg = 'Translation of "%s" into "%s"' % (files[0], files[1])
         events.emit(events.MESSAGES, msgconst.JOB, msg)
 
-        saver_ids = uc2const.PALETTE_SAVERS
-        saver_ids += uc2const.MODEL_SAVERS + uc2const.BITMAP_SAVERS
-        sid = options.get('format', '').lower()
+        try:
+            self.translate(files[0], files[1], options)
+        except TranslationError as e:
+            events.emit(events.MESSAGES, msgconst.ERROR, str(e))
+
+            msg = 'Translation is interrupted'
+            events.emit(events.MESSAGES, msgconst.STOP, msg)
+
+        msg = 'Translation is successful'
+        events.emit(events.MESSAGES, msgconst.OK, msg)
+        if self.do_verbose:
+            echo('')
+
+        sys.exit(0)
+
+    def translate(self, input_path, output_path, options):
+        """
+        Translates input file into output one.
+        Raises TranslationError on failure.
+        """
+        saver_ids = uc2const.PALETTE_SAVERS + uc2const.MODEL_SAVERS + \
+                    uc2const.BITMAP_SAVERS
+        sid = str(options.get('format', '')).lower()
         if sid and sid in saver_ids:
             saver_id = sid
             saver = get_saver_by_id(saver_id)
         else:
-            saver, saver_id = get_saver(files[1], return_id=True)
+            saver, saver_id = get_saver(output_path, return_id=True)
         if saver is None:
-            msg = 'Output file format of "%s" is unsupported.' % files[1]
-            events.emit(events.MESSAGES, msgconst.ERROR, msg)
+            msg = 'Output file format of "%s" is unsupported.' % output_path
+            raise TranslationError(msg)
 
-            msg = 'Translation is interrupted'
-            events.emit(events.MESSAGES, msgconst.STOP, msg)
-
-        loader, loader_id = get_loader(files[0], return_id=True)
+        loader, loader_id = get_loader(input_path, return_id=True)
         if loader is None:
-            msg = 'Input file format of "%s" is unsupported.' % files[0]
-            events.emit(events.MESSAGES, msgconst.ERROR, msg)
+            msg = 'Input file format of "%s" is unsupported.' % input_path
+            raise TranslationError(msg)
 
-            msg = 'Translation is interrupted'
-            events.emit(events.MESSAGES, msgconst.STOP, msg)
-
-        doc = None
+        palette_mode = loader_id in uc2const.PALETTE_LOADERS and \
+                       saver_id in uc2const.PALETTE_SAVERS
         try:
-            if loader_id in uc2const.PALETTE_LOADERS and \
-                    saver_id in uc2const.PALETTE_SAVERS:
-                doc = loader(self.appdata, files[0], convert=True, **options)
+            if palette_mode:
+                doc = loader(self.appdata, input_path, convert=True, **options)
             else:
-                doc = loader(self.appdata, files[0], **options)
+                doc = loader(self.appdata, input_path, **options)
         except Exception as e:
-            msg = 'Error while loading "%s"' % files[0]
+            LOG.error('Loading is interrupted %s', e)
+            msg = 'Error while loading "%s". ' % input_path
             msg += 'The file may be corrupted or contains unknown file format.'
-            events.emit(events.MESSAGES, msgconst.ERROR, msg)
-
-            msg = 'Loading is interrupted'
-            LOG.error('%s %s', msg, e)
-            events.emit(events.MESSAGES, msgconst.STOP, msg)
-
-        if doc is not None:
-            try:
-                if loader_id in uc2const.PALETTE_LOADERS and \
-                        saver_id in uc2const.PALETTE_SAVERS:
-                    saver(doc, files[1], translate=False, convert=True,
-                          **options)
-                else:
-                    saver(doc, files[1], **options)
-            except Exception as e:
-                msg = 'Error while translation and saving "%s"' % files[0]
-                events.emit(events.MESSAGES, msgconst.ERROR, msg)
-
-                msg = 'Translation is interrupted'
-                LOG.error('%s %s', msg, e, exc_info=True)
-                events.emit(events.MESSAGES, msgconst.STOP, msg)
-        else:
-            msg = 'Error creating model for "%s"' % files[0]
-            events.emit(events.MESSAGES, msgconst.ERROR, msg)
+            raise TranslationError(msg)
 
-            msg = 'Translation is interrupted'
-            events.emit(events.MESSAGES, msgconst.STOP, msg)
-
-        doc.close()
-        msg = 'Translation is successful'
-        events.emit(events.MESSAGES, msgconst.OK, msg)
-        if self.do_verbose:
-            echo('')
+        if doc is None:
+            msg = 'Error creating model for "%s"' % input_path
+            raise TranslationError(msg)
 
-        sys.exit(0)
+        try:
+            if palette_mode:
+                saver(doc, output_path, translate=False, convert=True,
+                      **options)
+            else:
+                saver(doc, output_path, **options)
+        except Exception as e:
+            LOG.error('Translation is interrupted %s', e, exc_info=True)
+            msg = 'Error while translation and saving "%s"' % input_path
+            raise TranslationError(msg)
+        finally:
+            doc.close()
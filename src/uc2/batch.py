@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Batch translation mode of uniconvertor.
+
+Input files are translated by pool of worker processes forked after
+application initialization, so each worker already has loaded color
+and palette managers. Each worker gets single task at a time through
+its own pipe. Worker crash (or timeout) affects the file being
+translated only: the file is reported as failed and worker is
+replaced by new one. Results are printed to stdout as JSON lines.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+from uc2 import uc2const
+from uc2.utils import fsutils
+from uc2.utils.mixutils import echo
+
+LOG = logging.getLogger(__name__)
+
+BATCH_OPTIONS = ('batch', 'jobs', 'recursive', 'timeout')
+POLL_INTERVAL = 0.01
+
+STATUS_OK = 'ok'
+STATUS_ERROR = 'error'
+STATUS_CRASH = 'crash'
+STATUS_TIMEOUT = 'timeout'
+
+
+def is_batch_mode(input_path, options):
+    return bool(options.get('batch')) or os.path.isdir(input_path)
+
+
+def get_input_files(input_path, recursive=False, filelist=False):
+    """
+    Returns list of (path, subdir) tuples for directory or file list.
+    """
+    if filelist:
+        result = []
+        cwd = os.path.dirname(input_path)
+        with open(input_path, 'rb') as fileptr:
+            for line in fileptr.readlines():
+                path = line.strip()
+                if path and not path.startswith('#'):
+                    path = os.path.join(cwd, fsutils.expanduser(path))
+                    result.append((path, ''))
+        return result
+    result = []
+    for root, dirs, files in os.walk(input_path):
+        dirs.sort()
+        subdir = os.path.relpath(root, input_path)
+        subdir = '' if subdir == os.curdir else subdir
+        for name in sorted(files):
+            if not name.startswith('.'):
+                result.append((os.path.join(root, name), subdir))
+        if not recursive:
+            break
+    return result
+
+
+def is_output_pattern(pattern):
+    return '{name}' in pattern or '{dir}' in pattern
+
+
+def get_output_path(pattern, path, subdir, ext=''):
+    """
+    Builds output file path by pattern. If pattern is a directory,
+    output file is placed into it with extension of output format.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    if is_output_pattern(pattern):
+        output = pattern.replace('{name}', name).replace('{dir}', subdir)
+        return os.path.normpath(output)
+    return os.path.join(pattern, subdir, '%s.%s' % (name, ext))
+
+
+def _worker_main(app, conn, options):
+    try:
+        while True:
+            task = conn.recv()
+            if task is None:
+                break
+            input_path, output_path = task
+            status, msg = STATUS_OK, ''
+            try:
+                dirname = os.path.dirname(output_path)
+                if dirname and not os.path.isdir(dirname):
+                    try:
+                        os.makedirs(dirname)
+                    except OSError:
+                        pass
+                app.translate(input_path, output_path, options)
+            except Exception as e:
+                status, msg = STATUS_ERROR, str(e) or e.__class__.__name__
+            except SystemExit:
+                status, msg = STATUS_ERROR, 'Translation is interrupted'
+            conn.send((status, msg))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    conn.close()
+
+
+class BatchWorker(object):
+    process = None
+    conn = None
+    task = None
+    start = 0.0
+
+    def __init__(self, app, options):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_worker_main, args=(app, child_conn, options))
+        self.process.daemon = True
+        self.process.start()
+        child_conn.close()
+
+    def send(self, task):
+        self.task = task
+        self.start = time.time()
+        self.conn.send(task)
+
+    def get_result(self, timeout=0):
+        """
+        Returns (status, message) tuple of finished task or None.
+        """
+        try:
+            if self.conn.poll():
+                result = self.conn.recv()
+                return result
+        except (EOFError, IOError):
+            pass
+        else:
+            if self.process.is_alive():
+                if timeout and time.time() - self.start > timeout:
+                    self.terminate()
+                    return STATUS_TIMEOUT, 'Translation timeout'
+                return None
+        msg = 'Worker process is crashed'
+        if self.process.exitcode is not None:
+            msg += ' with exit code %s' % self.process.exitcode
+        return STATUS_CRASH, msg
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (IOError, ValueError):
+            pass
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.terminate()
+
+    def terminate(self):
+        self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+
+class BatchTranslator(object):
+    app = None
+    input_path = ''
+    output_pattern = ''
+    options = {}
+    jobs = 1
+    timeout = 0
+    recursive = False
+    filelist = False
+
+    def __init__(self, app, input_path, output_pattern, options):
+        self.app = app
+        self.input_path = input_path
+        self.output_pattern = output_pattern
+        self.options = dict([(key, value) for key, value in options.items()
+                             if key not in BATCH_OPTIONS])
+        jobs = options.get('jobs')
+        if not isinstance(jobs, int) or jobs < 1:
+            jobs = multiprocessing.cpu_count()
+        self.jobs = jobs
+        timeout = options.get('timeout', 0)
+        self.timeout = timeout if isinstance(timeout, (int, float)) else 0
+        self.recursive = bool(options.get('recursive'))
+        self.filelist = bool(options.get('batch')) and \
+                        not os.path.isdir(input_path)
+
+    def get_tasks(self):
+        ext = ''
+        saver_id = str(self.options.get('format', '')).lower()
+        if saver_id in uc2const.FORMAT_EXTENSION:
+            ext = uc2const.FORMAT_EXTENSION[saver_id][0]
+        tasks = []
+        for path, subdir in get_input_files(self.input_path, self.recursive,
+                                            self.filelist):
+            output = get_output_path(self.output_pattern, path, subdir, ext)
+            tasks.append((path, output))
+        return tasks
+
+    def report(self, task, status, msg, duration):
+        echo(json.dumps({
+            'input': task[0],
+            'output': task[1],
+            'status': status,
+            'message': msg,
+            'time': round(duration, 3),
+        }))
+
+    def run(self):
+        """
+        Translates all input files. Returns process exit code.
+        """
+        tasks = self.get_tasks()
+        tasks.reverse()
+        total = len(tasks)
+        failed = 0
+        workers = [BatchWorker(self.app, self.options)
+                   for _i in range(min(self.jobs, total))]
+        busy = []
+        try:
+            while tasks or busy:
+                for worker in workers:
+                    if worker not in busy and tasks:
+                        worker.send(tasks.pop())
+                        busy.append(worker)
+                finished = False
+                for worker in [] + busy:
+                    result = worker.get_result(self.timeout)
+                    if result is None:
+                        continue
+                    finished = True
+                    busy.remove(worker)
+                    status, msg = result
+                    self.report(worker.task, status, msg,
+                                time.time() - worker.start)
+                    if status != STATUS_OK:
+                        failed += 1
+                        LOG.error('Batch translation of "%s" failed: %s',
+                                  worker.task[0], msg)
+                    if status in (STATUS_CRASH, STATUS_TIMEOUT):
+                        workers.remove(worker)
+                        if tasks:
+                            workers.append(BatchWorker(self.app, self.options))
+                if not finished:
+                    time.sleep(POLL_INTERVAL)
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+            sys.stderr.write('Batch translation is interrupted\n')
+            return 1
+        for worker in workers:
+            worker.stop()
+        LOG.info('Batch translation: %d files, %d failed', total, failed)
+        return 1 if failed else 0
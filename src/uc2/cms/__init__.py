@@ -16,6 +16,7 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import copy
+from collections import OrderedDict
 from copy import deepcopy
 
 import libcms
@@ -28,6 +29,7 @@ from uc2.uc2const import IMAGE_MONO, IMAGE_GRAY, IMAGE_RGB, IMAGE_CMYK, \
 from uc2.utils import fsutils
 
 CS = [COLOR_RGB, COLOR_CMYK, COLOR_LAB, COLOR_GRAY]
+COLOR_CACHE_SIZE = 4096
 
 
 def get_registration_black():
@@ -456,6 +458,7 @@ class ColorManager(object):
     handles = None
     transforms = None
     proof_transforms = None
+    color_cache = None
 
     use_cms = True
     use_display_profile = False
@@ -483,6 +486,20 @@ class ColorManager(object):
     def clear_transforms(self):
         self.transforms = {}
         self.proof_transforms = {}
+        self.color_cache = OrderedDict()
+
+    def _get_cached(self, key):
+        values = self.color_cache.pop(key, None)
+        if values is not None:
+            self.color_cache[key] = values
+            return [] + values
+        return None
+
+    def _set_cached(self, key, values):
+        self.color_cache[key] = values
+        if len(self.color_cache) > COLOR_CACHE_SIZE:
+            self.color_cache.popitem(last=False)
+        return [] + values
 
     def get_transform(self, cs_in, cs_out):
         """
@@ -534,10 +551,45 @@ class ColorManager(object):
         if not self.use_cms:
             return do_simple_transform(color[1], cs_in, cs_out)
         in_color = colorb(color)
+        key = (cs_in + cs_out, tuple(in_color))
+        values = self._get_cached(key)
+        if values is not None:
+            return values
         out_color = colorb()
         transform = self.get_transform(cs_in, cs_out)
         libcms.cms_do_transform(transform, in_color, out_color)
-        return decode_colorb(out_color, cs_out)
+        return self._set_cached(key, decode_colorb(out_color, cs_out))
+
+    def do_transform_many(self, colors, cs_in, cs_out):
+        """
+        Converts list of colors between colorspaces.
+        Colors missed in cache are transformed in single lcms call.
+        Returns list of color values lists.
+        """
+        if not self.use_cms:
+            return [do_simple_transform(color[1], cs_in, cs_out)
+                    for color in colors]
+        tr_type = cs_in + cs_out
+        result = []
+        missed = {}
+        for color in colors:
+            in_color = colorb(color)
+            key = (tr_type, tuple(in_color))
+            values = self._get_cached(key)
+            if values is None and key not in missed:
+                missed[key] = in_color
+            result.append(values if values is not None else key)
+        if missed:
+            keys = missed.keys()
+            transform = self.get_transform(cs_in, cs_out)
+            out_colors = libcms.cms_do_transform_many(
+                transform, [missed[key] for key in keys])
+            for key, out_color in zip(keys, out_colors):
+                missed[key] = self._set_cached(
+                    key, decode_colorb(out_color, cs_out))
+            result = [[] + missed[item] if isinstance(item, tuple) else item
+                      for item in result]
+        return result
 
     def do_bitmap_transform(self, img, mode, cs_out=None):
         """
@@ -558,10 +610,14 @@ class ColorManager(object):
         Returns list of color values.
         """
         in_color = colorb(color)
+        key = (cs_in, tuple(in_color))
+        values = self._get_cached(key)
+        if values is not None:
+            return values
         out_color = colorb()
         transform = self.get_proof_transform(cs_in)
         libcms.cms_do_transform(transform, in_color, out_color)
-        return decode_colorb(out_color, COLOR_RGB)
+        return self._set_cached(key, decode_colorb(out_color, COLOR_RGB))
 
     def do_proof_bitmap_transform(self, img):
         """
@@ -590,6 +646,26 @@ class ColorManager(object):
         res = self.do_transform(color, color[0], COLOR_RGB)
         return [COLOR_RGB, res, color[2], color[3]]
 
+    def get_rgb_colors(self, colors):
+        """
+        Converts list of colors into RGB colors.
+        Colors of each colorspace are converted by single transform call.
+        """
+        result = [None] * len(colors)
+        groups = {}
+        for index, color in enumerate(colors):
+            if color[0] in (COLOR_RGB, COLOR_SPOT):
+                result[index] = self.get_rgb_color(color)
+            else:
+                groups.setdefault(color[0], []).append(index)
+        for cs_in, indexes in groups.items():
+            items = [colors[index] for index in indexes]
+            values = self.do_transform_many(items, cs_in, COLOR_RGB)
+            for index, vals in zip(indexes, values):
+                color = colors[index]
+                result[index] = [COLOR_RGB, vals, color[2], color[3]]
+        return result
+
     def get_rgb_color255(self, color):
         return val_255(self.get_rgb_color(color)[1])
 
@@ -282,6 +282,66 @@ pycms_TransformPixel (PyObject *self, PyObject *args) {
 }
 
 
+/* Returns pixel size in bytes for lcms pixel format */
+int
+getPixelSize (cmsUInt32Number format) {
+	int bytes = T_BYTES(format);
+
+	/* zero bytes value means double precision channels */
+	if (!bytes) {
+		bytes = sizeof(double);
+	}
+	return bytes * (T_CHANNELS(format) + T_EXTRA(format));
+}
+
+static PyObject *
+pycms_GetTransformPixelSizes (PyObject *self, PyObject *args) {
+
+	void *transform;
+	cmsHTRANSFORM hTransform;
+
+	if (!PyArg_ParseTuple(args, "O", &transform)) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+
+	hTransform = (cmsHTRANSFORM) PyCObject_AsVoidPtr(transform);
+
+	return Py_BuildValue("(ii)",
+		getPixelSize(cmsGetTransformInputFormat(hTransform)),
+		getPixelSize(cmsGetTransformOutputFormat(hTransform)));
+}
+
+static PyObject *
+pycms_TransformPixelString (PyObject *self, PyObject *args) {
+
+	unsigned char *inbuf;
+	int size, in_size, out_size, count;
+	void *transform;
+	cmsHTRANSFORM hTransform;
+	PyObject *result;
+
+	if (!PyArg_ParseTuple(args, "Os#", &transform, &inbuf, &size)) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+
+	hTransform = (cmsHTRANSFORM) PyCObject_AsVoidPtr(transform);
+
+	in_size = getPixelSize(cmsGetTransformInputFormat(hTransform));
+	out_size = getPixelSize(cmsGetTransformOutputFormat(hTransform));
+	count = size / in_size;
+
+	result = PyString_FromStringAndSize(NULL, count * out_size);
+	if (result == NULL) {
+		return NULL;
+	}
+
+	cmsDoTransform(hTransform, inbuf, PyString_AS_STRING(result), count);
+
+	return result;
+}
+
 static PyObject *
 pycms_TransformPixel2 (PyObject *self, PyObject *args) {
 
@@ -511,6 +571,8 @@ PyMethodDef pycms_methods[] = {
 	{"setAlarmCodes", pycms_SetAlarmCodes, METH_VARARGS},
 	{"transformPixel", pycms_TransformPixel, METH_VARARGS},
 	{"transformPixel2", pycms_TransformPixel2, METH_VARARGS},
+	{"transformPixelString", pycms_TransformPixelString, METH_VARARGS},
+	{"getTransformPixelSizes", pycms_GetTransformPixelSizes, METH_VARARGS},
 	{"transformBitmap", pycms_TransformBitmap, METH_VARARGS},
 	{"getProfileName", pycms_GetProfileName, METH_VARARGS},
 	{"getProfileInfo", pycms_GetProfileInfo, METH_VARARGS},
@@ -18,6 +18,7 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
+import struct
 from PIL import Image
 
 import _cms
@@ -413,6 +414,30 @@ def cms_do_transform(transform, inbuff, outbuff):
         raise CmsError(msg)
 
 
+def cms_do_transform_many(transform, inbuffs):
+    """Transform list of color values using provided lcms transform handle.
+    All colors are transformed in single lcms call.
+
+    :param transform: valid lcms transformation handle
+    :param inbuffs: list of 4-member lists. The members should be
+    between 0 and 255
+    :return: list of 4-member lists
+    """
+    sizes = _cms.getTransformPixelSizes(transform)
+    if sizes is None:
+        raise CmsError('Cannot transform color values')
+    in_size, out_size = sizes
+    in_fmt = '%dB' % in_size
+    data = ''.join([struct.pack(in_fmt, *item[:in_size]) for item in inbuffs])
+    ret = _cms.transformPixelString(transform, data)
+    if ret is None:
+        raise CmsError('Cannot transform color values')
+    values = struct.unpack('%dB' % len(ret), ret)
+    pad = [0] * max(4 - out_size, 0)
+    return [list(values[i:i + out_size]) + pad
+            for i in range(0, len(values), out_size)]
+
+
 def cms_do_bitmap_transform(transform, image, in_mode, out_mode):
     """Provides PIL images support for color management.
     Currently supports L, RGB, CMYK and LAB modes only.
@@ -16,6 +16,8 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+import time
+from contextlib import contextmanager
 
 LOG = logging.getLogger(__name__)
 
@@ -28,12 +30,18 @@ CONFIG_MODIFIED   attr, value - modified config field
 FILTER_INFO       msg, position - info message and progress in range 0.0-1.0
 MESSAGES          msg_type, msg - message type and message text
 
+FILTER_INFO should be sent by progress() function which rate-limits
+updates from hot loops and maps positions into nested progress ranges.
 """
 
 # Signal flags
 
 CANCEL_OPERATION = False
 
+# Minimal time (in sec) and position change between progress updates
+PROGRESS_INTERVAL = 0.1
+PROGRESS_STEP = 0.01
+
 # Signal channels
 
 CONFIG_MODIFIED = ['CONFIG_MODIFIED']
@@ -95,4 +103,112 @@ def clean_all_channels():
     Cleans all channels.
     """
     for item in (CONFIG_MODIFIED, MESSAGES, FILTER_INFO):
-        clean_channel(item)
\ No newline at end of file
+        clean_channel(item)
+
+
+class ProgressReporter(object):
+    """
+    Sends FILTER_INFO signals with coalescing of frequent updates.
+    Update is sent if message is changed, on task start/end positions
+    or if both time interval and position change exceed limits.
+    Skipped updates are coalesced: the latest one can be flushed.
+    """
+    enabled = True
+    interval = PROGRESS_INTERVAL
+    step = PROGRESS_STEP
+    ranges = None
+    last_msg = None
+    last_position = 0.0
+    last_time = 0.0
+    pending = None
+    sent = 0
+    skipped = 0
+
+    def __init__(self):
+        self.ranges = []
+
+    def map_position(self, position):
+        for start, end in reversed(self.ranges):
+            position = start + position * (end - start)
+        return position
+
+    def push_range(self, start, end):
+        """
+        Maps following positions 0.0-1.0 into start-end range
+        of current task.
+        """
+        self.ranges.append((start, end))
+
+    def pop_range(self):
+        if self.ranges:
+            self.ranges.pop()
+
+    def report(self, msg, position):
+        if not self.enabled:
+            return
+        now = time.time()
+        if msg == self.last_msg and 0.0 < position < 1.0:
+            position = self.map_position(position)
+            if now - self.last_time < self.interval or \
+                    abs(position - self.last_position) < self.step:
+                self.pending = (msg, position)
+                self.skipped += 1
+                return
+        else:
+            position = self.map_position(position)
+        self.send(msg, position, now)
+
+    def send(self, msg, position, now=None):
+        self.pending = None
+        self.last_msg = msg
+        self.last_position = position
+        self.last_time = time.time() if now is None else now
+        self.sent += 1
+        emit(FILTER_INFO, msg, position)
+
+    def flush(self):
+        """
+        Sends the latest skipped update.
+        """
+        if self.enabled and self.pending:
+            self.send(*self.pending)
+
+    def reset(self):
+        self.ranges = []
+        self.pending = self.last_msg = None
+        self.last_position = self.last_time = 0.0
+        self.sent = self.skipped = 0
+
+
+PROGRESS = ProgressReporter()
+
+
+def progress(msg, position):
+    """
+    Reports progress of current task (position in range 0.0-1.0).
+    """
+    PROGRESS.report(msg, position)
+
+
+def flush_progress():
+    PROGRESS.flush()
+
+
+@contextmanager
+def progress_range(start, end):
+    """
+    Maps progress of enclosed task into start-end range.
+    The range is removed even if the task fails.
+    """
+    PROGRESS.push_range(start, end)
+    try:
+        yield
+    finally:
+        PROGRESS.pop_range()
+
+
+def set_progress_enabled(value=True):
+    """
+    Progress reporting can be disabled for headless processing.
+    """
+    PROGRESS.enabled = value
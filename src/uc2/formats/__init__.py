@@ -19,8 +19,9 @@ import logging
 import os
 from importlib import import_module
 
-from fallback import fallback_check, im_loader
+from fallback import im_loader
 from uc2 import events, msgconst
+from uc2.formats import sniffer
 from uc2 import uc2const
 from uc2.utils import fsutils
 from uc2.utils.fs import get_file_extension
@@ -29,7 +30,6 @@ LOG = logging.getLogger(__name__)
 
 LOADERS = {}
 SAVERS = {}
-CHECKERS = {}
 
 
 def _get_loader(pid):
@@ -58,27 +58,30 @@ def _get_saver(pid):
     try:
         saver_mod = import_module('uc2.formats.' + pid)
         saver = getattr(saver_mod, pid + '_saver')
+        if pid not in uc2const.SYMBOL_SAVERS:
+            saver = _expanding_saver(saver)
     except Exception as e:
         LOG.error('Error accessing <%s> saver %s', pid, e)
     SAVERS[pid] = saver
     return saver
 
 
-def _get_checker(pid):
-    if pid in uc2const.BITMAP_LOADERS:
-        return fallback_check
-    if not isinstance(pid, str):
-        return None
-    if pid in CHECKERS:
-        return CHECKERS[pid]
-    checker = None
-    try:
-        checker_mod = import_module('uc2.formats.' + pid)
-        checker = getattr(checker_mod, 'check_' + pid)
-    except Exception as e:
-        LOG.error('Error accessing <%s> checker %s', pid, e)
-    CHECKERS[pid] = checker
-    return checker
+def _expanding_saver(saver):
+    """
+    Wraps saver of format without symbols support. Symbol instances
+    of SK2 document are replaced by groups while saving.
+    """
+
+    def expanding_saver(doc, *args, **kw):
+        if not getattr(doc, 'cid', None) == uc2const.SK2:
+            return saver(doc, *args, **kw)
+        replaced = doc.methods.expand_instances()
+        try:
+            return saver(doc, *args, **kw)
+        finally:
+            doc.methods.restore_instances(replaced)
+
+    return expanding_saver
 
 
 def get_loader_by_id(pid):
@@ -96,45 +99,21 @@ def get_loader(path, experimental=False, return_id=False):
         return None
 
     ret_id = None
-
-    ext = get_file_extension(path)
     loader = None
     ld_formats = [] + uc2const.LOADER_FORMATS
-
-    msg = 'Start to search for loader by file extension %s' % (ext.__str__())
-    events.emit(events.MESSAGES, msgconst.INFO, msg)
-
     if experimental:
         ld_formats += uc2const.EXPERIMENTAL_LOADERS
-    for item in ld_formats:
-        if ext in uc2const.FORMAT_EXTENSION[item]:
-            checker = _get_checker(item)
-            if checker and checker(path):
-                loader = _get_loader(item)
-                ret_id = item
-                break
 
-    if loader is None:
-        msg = 'Loader is not found or not suitable for %s' % path
-        events.emit(events.MESSAGES, msgconst.WARNING, msg)
-        msg = 'Start to search loader by file content'
-        events.emit(events.MESSAGES, msgconst.INFO, msg)
-
-        for item in ld_formats:
-            checker = _get_checker(item)
-            if checker is not None:
-                if checker(path):
-                    loader = _get_loader(item)
-                    ret_id = item
-                    break
+    msg = 'Start to search for loader by file content'
+    events.emit(events.MESSAGES, msgconst.INFO, msg)
 
-    if loader is None:
-        msg = 'By file content loader is not found for %s' % path
-        events.emit(events.MESSAGES, msgconst.WARNING, msg)
-        msg = 'Try using fallback loader'
-        events.emit(events.MESSAGES, msgconst.INFO, msg)
-        if fallback_check(path):
-            loader = im_loader
+    for item, confidence in sniffer.detect_formats(path, ld_formats):
+        loader = _get_loader(item)
+        if loader is not None:
+            ret_id = item
+            LOG.debug('Format <%s> is detected with confidence %s',
+                      item, confidence)
+            break
 
     if loader is None:
         msg = 'Loader is not found for %s' % path
@@ -15,11 +15,9 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from uc2.formats.aco.aco_const import ACO1_VER, ACO2_VER
 from uc2.formats.aco.aco_presenter import ACO_Presenter
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -63,10 +61,3 @@ def aco_saver(doc, filename=None, fileptr=None, translate=True,
         aco_doc.close()
     else:
         doc.save(filename, fileptr)
-
-
-def check_aco(path):
-    fileptr = get_fileptr(path)
-    string = fileptr.read(2)
-    fileptr.close()
-    return string in (ACO1_VER, ACO2_VER)
@@ -15,10 +15,8 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from uc2.formats.cdr import cdr_const
 from uc2.formats.cdr.cdr_presenter import CDR_Presenter
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -40,15 +38,3 @@ def cdr_saver(cdr_doc, filename=None, fileptr=None, translate=True, cnf=None,
               **kw):
     cnf = merge_cnf(cnf, kw)
     cdr_doc.save(filename)
-
-
-def check_cdr(path):
-    fileptr = get_fileptr(path)
-    header = fileptr.read(12)
-    fileptr.close()
-    if not header[:4] == cdr_const.RIFF_ID:
-        return False
-    if header[8:] in cdr_const.CDR_VERSIONS:
-        return True
-    else:
-        return False
@@ -20,3 +20,4 @@ from uc2.utils.config import XmlConfigParser
 
 class CDR_Config(XmlConfigParser):
     system_encoding = 'cp1251'
+    mapped_loading = True
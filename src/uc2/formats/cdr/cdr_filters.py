@@ -18,6 +18,7 @@
 from uc2 import _, events
 from uc2.utils import get_chunk_size, dword2py_int, py_int2dword
 from uc2.formats.riff import model
+from uc2.formats.riff.riff_filters import MappedRiffParser, map_fileptr
 from uc2.formats.cdr.cdr_model import generic_dict
 from uc2.formats.generic_filters import AbstractLoader, AbstractSaver
 
@@ -39,12 +40,21 @@ class CDR_Loader(AbstractLoader):
 
     def do_load(self):
         self.parent_stack = []
-        self.model = self.parse_file(self.fileptr)
+        data = None
+        if self.config.mapped_loading:
+            data = map_fileptr(self.fileptr)
+        if data is not None:
+            self.version = data[8:12]
+            self.obj_map = generic_dict
+            parser = MappedRiffParser(self.get_class, self.report_position)
+            self.model = parser.parse_file(data)
+        else:
+            self.model = self.parse_file(self.fileptr)
 
     def report_position(self, position):
         if 100.0 * (position - self.file_position) / self.file_size > 3.0:
             msg = _('Parsing in progress...')
-            events.emit(events.FILTER_INFO, msg, position / self.file_size)
+            events.progress(msg, position / self.file_size)
         self.file_position = position
 
     def report_stream_position(self, position):
@@ -195,5 +205,11 @@ class CDR_Loader(AbstractLoader):
 class CDR_Saver(AbstractSaver):
     name = 'CDR_Saver'
 
+    def save(self, presenter, path=None, fileptr=None):
+        # source file can be rewritten, so mapped chunks are copied
+        if isinstance(presenter.model, model.RiffRootList):
+            presenter.model.detach()
+        AbstractSaver.save(self, presenter, path, fileptr)
+
     def do_save(self):
         self.fileptr.write(self.model.get_chunk())
@@ -55,6 +55,6 @@ class CDR_Presenter(BinaryModelPresenter):
 
     def traslate_to_sk2(self, sk2_doc):
         msg = _('Translation is under process...')
-        events.emit(events.FILTER_INFO, msg, 0.95)
+        events.progress(msg, 0.95)
         translator = CDR_to_SK2_Translator()
         translator.translate(self, sk2_doc)
@@ -15,8 +15,6 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import zipfile
-
 from uc2.formats.cdrz import const
 from uc2.formats.cdrz.presenter import CDRZ_Presenter
 from uc2.formats.pdxf.presenter import PDXF_Presenter
@@ -39,14 +37,3 @@ def cdrz_loader(appdata, filename, translate=True, cnf=None, **kw):
 def cdrz_saver(cdr_doc, filename, translate=True, cnf=None, **kw):
     cnf = merge_cnf(cnf, kw)
     cdr_doc.save(filename)
-
-
-def check_cdrz(path):
-    if not zipfile.is_zipfile(path):
-        return False
-
-    cdrz_file = zipfile.ZipFile(path, 'r')
-    fl = cdrz_file.namelist()
-    if 'content/riffData.cdr' not in fl:
-        return False
-    return True
@@ -19,11 +19,9 @@
 # https://standards.iso.org/ittf/PubliclyAvailableStandards/c032380_ISO_IEC_8632-3_1999(E).zip
 
 
-from uc2 import uc2const, utils
-from uc2.formats.cgm.cgm_const import CGM_SIGNATURE
+from uc2 import uc2const
 from uc2.formats.cgm.cgm_presenter import CGM_Presenter
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -54,9 +52,3 @@ def cgm_saver(sk2_doc, filename=None, fileptr=None,
         cgm_doc.close()
     else:
         sk2_doc.save(filename, fileptr)
-
-
-def check_cgm(path):
-    with get_fileptr(path) as fileptr:
-        sign = fileptr.read(2)
-    return utils.uint16_be(sign) & 0xffe0 == CGM_SIGNATURE
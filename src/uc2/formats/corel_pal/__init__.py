@@ -18,7 +18,6 @@
 from uc2.formats.corel_pal.corel_pal_presenter import CorelPalette_Presenter
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -62,17 +61,3 @@ def corel_pal_saver(doc, filename=None, fileptr=None, translate=True,
         crl_doc.close()
     else:
         doc.save(filename, fileptr)
-
-
-def check_corel_pal(path):
-    fileptr = get_fileptr(path)
-    ret = False
-    i = 0
-    while i < 20:
-        line = fileptr.readline()
-        if not line.find('<palette') == -1:
-            ret = True
-            break
-        i += 1
-    fileptr.close()
-    return ret
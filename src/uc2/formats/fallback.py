@@ -15,7 +15,6 @@
 # 	You should have received a copy of the GNU General Public License
 # 	along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from uc2 import libimg
 from uc2 import uc2const, sk2const
 from uc2.formats.sk2 import sk2_model
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
@@ -55,7 +54,3 @@ def im_loader(appdata, filename=None, fileptr=None, translate=True, cnf=None,
     layer.childs.append(image_obj)
     sk2_doc.update()
     return sk2_doc
-
-
-def fallback_check(path):
-    return libimg.check_image(path)
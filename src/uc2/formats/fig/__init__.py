@@ -20,7 +20,6 @@ from uc2 import uc2const
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
 from uc2.formats.fig.fig_presenter import FIG_Presenter
 from uc2.utils.mixutils import merge_cnf
-from uc2.utils.fsutils import get_fileptr
 
 
 def fig_loader(appdata, filename=None, fileptr=None,
@@ -54,17 +53,3 @@ def fig_saver(sk2_doc, filename=None, fileptr=None,
         fig_doc.close()
     else:
         sk2_doc.save(filename, fileptr)
-
-
-def check_fig(path):
-    file_size = os.path.getsize(path)
-    fileptr = get_fileptr(path)
-    magic = '#FIG 3'
-
-    if file_size > len(magic):
-        string = fileptr.read(len(magic))
-    else:
-        string = fileptr.read()
-
-    fileptr.close()
-    return string.startswith(magic)
@@ -28,11 +28,15 @@ class ModelObject(object):
     """
     Abstract parent class for all model
     objects. Provides common object properties.
+
+    New objects are dirty, i.e. require update() call. do_update()
+    recomputes dirty objects and ancestors of recomputed objects only.
     """
     cid = 0
     parent = None
     config = None
     childs = []
+    dirty = True
 
     def destroy(self):
         for child in self.childs:
@@ -46,21 +50,41 @@ class ModelObject(object):
     def update_for_sword(self):
         pass
 
+    def set_dirty(self):
+        """
+        Marks object and its ancestors for recomputation.
+        """
+        obj = self
+        while obj is not None:
+            obj.dirty = True
+            obj = obj.parent
+
     def do_update(self, presenter=None, action=False):
+        """
+        Updates changed subtrees. Returns number of recomputed objects.
+        Action flag forces update of all objects.
+        """
+        updated = 0
         for child in self.childs:
             child.parent = self
             child.config = self.config
-            child.do_update(presenter, action)
-        self.update()
-        if action:
-            self.update_for_sword()
+            updated += child.do_update(presenter, action) or 0
+        if self.dirty or updated or action:
+            self.update()
+            if action:
+                self.update_for_sword()
+            self.dirty = False
+            updated += 1
+        return updated
 
     def add(self, child):
         self.childs.append(child)
+        self.set_dirty()
 
     def remove(self, child):
         if child in self.childs:
             self.childs.remove(child)
+            self.set_dirty()
 
     def count(self):
         val = len(self.childs)
@@ -80,7 +104,7 @@ class TextModelObject(ModelObject):
     end_string = ''
 
 
-GENERIC_TAGS = ['cid', 'childs', 'parent', 'config', 'tag']
+GENERIC_TAGS = ['cid', 'childs', 'parent', 'config', 'tag', 'dirty']
 IDENT = '\t'
 
 
@@ -116,6 +140,7 @@ class ModelPresenter(object):
     saver = None
     methods = None
     obj_num = 0
+    updated_num = 0
 
     def new(self):
         pass
@@ -147,10 +172,13 @@ class ModelPresenter(object):
             self.update_msg(0.0)
             try:
                 self.model.config = self.config
-                self.model.do_update(self, action)
+                updated = self.model.do_update(self, action)
             except Exception:
                 LOG.error(_('Error updating document model'))
                 raise
+            self.updated_num = self.obj_num if updated is None else updated
+            LOG.debug('%d of %d objects are recomputed',
+                      self.updated_num, self.obj_num)
 
             model_name = uc2const.FORMAT_NAMES[self.cid]
             msg = _('<%s> document model is updated successfully') % model_name
@@ -214,7 +242,7 @@ class ModelPresenter(object):
         self.send_progress_message(msg, val)
 
     def send_progress_message(self, msg, val):
-        events.emit(events.FILTER_INFO, msg, val)
+        events.progress(msg, val)
 
     def send_ok(self, msg):
         events.emit(events.MESSAGES, msgconst.OK, msg)
@@ -17,7 +17,9 @@
 
 import errno
 import logging
+import mmap
 import os
+import struct
 import xml.sax
 from xml.sax import handler
 from xml.sax.xmlreader import InputSource
@@ -89,7 +91,7 @@ class AbstractLoader(object):
             self.parsing_msg(position)
 
     def send_progress_message(self, msg, val):
-        events.emit(events.FILTER_INFO, msg, val)
+        events.progress(msg, val)
 
     def parsing_msg(self, val):
         msg = _('Parsing in progress...')
@@ -108,21 +110,149 @@ class AbstractLoader(object):
         events.emit(events.MESSAGES, msgconst.ERROR, msg)
 
 
+STRUCTS = {}
+FIELDS_NUM = {}
+
+BYTE = struct.Struct('B')
+WORD = struct.Struct('<H')
+DWORD = struct.Struct('<I')
+PAIR_DWORD = struct.Struct('<2L')
+
+ARRAY_MIN_SIZE = 8
+
+
+def get_struct(fmt):
+    """
+    Returns compiled (cached) struct for provided format.
+    """
+    result = STRUCTS.get(fmt)
+    if result is None:
+        result = STRUCTS[fmt] = struct.Struct(fmt)
+    return result
+
+
+def get_fields_num(fmt):
+    num = FIELDS_NUM.get(fmt)
+    if num is None:
+        st = get_struct(fmt)
+        num = FIELDS_NUM[fmt] = len(st.unpack('\0' * st.size))
+    return num
+
+
+def unpack_array(fmt, data, count, offset=0):
+    """
+    Decodes sequence of records (e.g. '<hh' points) by single struct call.
+    Returns list of record tuples.
+    """
+    st = STRUCTS.get(fmt) or get_struct(fmt)
+    if count < ARRAY_MIN_SIZE:
+        # building of array format is more expensive for short arrays
+        size = st.size
+        return [st.unpack_from(data, offset + i * size) for i in range(count)]
+    byteorder = fmt[0] if fmt[0] in '@=<>!' else ''
+    values = struct.unpack_from(byteorder + fmt[len(byteorder):] * count,
+                                data, offset)
+    return zip(*[iter(values)] * get_fields_num(fmt))
+
+
+def map_binary(fileptr):
+    """
+    Returns memory mapped file content or file content string
+    if file object cannot be mapped (e.g. in-memory stream or empty file).
+    """
+    try:
+        return mmap.mmap(fileptr.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, IOError, ValueError, EnvironmentError):
+        fileptr.seek(0)
+        return fileptr.read()
+
+
+class BinaryCursor(object):
+    """
+    File-like reader over memory mapped (or read in memory) file content.
+    Fields are decoded by cached structs directly from the buffer
+    without per-field file reads.
+    """
+    data = ''
+    size = 0
+    pos = 0
+    fileptr = None
+
+    def __init__(self, fileptr):
+        self.fileptr = fileptr
+        self.data = map_binary(fileptr)
+        self.size = len(self.data)
+        self.pos = 0
+
+    def read(self, size=-1):
+        start = self.pos
+        if size < 0 or start + size > self.size:
+            size = max(self.size - start, 0)
+        self.pos = start + size
+        return self.data[start:self.pos]
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self.pos
+        elif whence == 2:
+            offset += self.size
+        self.pos = max(offset, 0)
+
+    def tell(self):
+        return self.pos
+
+    def unpack(self, fmt):
+        st = STRUCTS.get(fmt) or get_struct(fmt)
+        values = st.unpack_from(self.data, self.pos)
+        self.pos += st.size
+        return values
+
+    def unpack_struct(self, st):
+        values = st.unpack_from(self.data, self.pos)
+        self.pos += st.size
+        return values
+
+    def peek(self, fmt):
+        """
+        Decodes fields without cursor moving.
+        """
+        return (STRUCTS.get(fmt) or get_struct(fmt)).unpack_from(self.data,
+                                                                  self.pos)
+
+    def read_array(self, fmt, count):
+        records = unpack_array(fmt, self.data, count, self.pos)
+        self.pos += get_struct(fmt).size * max(count, 0)
+        return records
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data = ''
+        self.fileptr.close()
+
+
 class AbstractBinaryLoader(AbstractLoader):
+    def init_load(self):
+        self.fileptr = BinaryCursor(self.fileptr)
+        self.do_load()
+
     def readbytes(self, size):
         return self.fileptr.read(size)
 
     def readbyte(self):
-        return utils.byte2py_int(self.fileptr.read(1))
+        return self.fileptr.unpack_struct(BYTE)[0]
 
     def readword(self):
-        return utils.word2py_int(self.fileptr.read(2))
+        return self.fileptr.unpack_struct(WORD)[0]
 
     def readdword(self):
-        return utils.dword2py_int(self.fileptr.read(4))
+        return self.fileptr.unpack_struct(DWORD)[0]
 
     def read_pair_dword(self):
-        return utils.pair_dword2py_int(self.fileptr.read(8))
+        return self.fileptr.unpack_struct(PAIR_DWORD)
+
+    def read_array(self, fmt, count):
+        return self.fileptr.read_array(fmt, count)
 
     def readstr(self, size):
         return utils.latin1_bytes_2str(self.fileptr.read(size))
@@ -231,7 +361,7 @@ class AbstractSaver(object):
         return val_str
 
     def send_progress_message(self, msg, val):
-        events.emit(events.FILTER_INFO, msg, val)
+        events.progress(msg, val)
 
     def saving_msg(self, val):
         msg = _('Saving in progress...')
@@ -61,8 +61,8 @@ class GPL_Presenter(TextModelPresenter):
         self.model.columns = skp_model.columns
         self.model.comments = 'Palette source: ' + skp_model.source
         self.model.comments += '\n' + skp_model.comments
-        for item in skp_model.colors:
-            r, g, b = self.cms.get_rgb_color255(item)
+        for item in self.cms.get_rgb_colors(skp_model.colors):
+            r, g, b = cms.val_255(item[1])
             self.model.colors.append([r, g, b, item[3]])
 
     def convert_to_skp(self, skp_doc):
@@ -15,11 +15,9 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from uc2.formats.jcw.jcw_const import JCW_ID
 from uc2.formats.jcw.jcw_presenter import JCW_Presenter
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -63,10 +61,3 @@ def jcw_saver(doc, filename=None, fileptr=None, translate=True,
         jcw_doc.close()
     else:
         doc.save(filename, fileptr)
-
-
-def check_jcw(path):
-    fileptr = get_fileptr(path)
-    string = fileptr.read(len(JCW_ID))
-    fileptr.close()
-    return string == JCW_ID
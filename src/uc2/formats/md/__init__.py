@@ -29,7 +29,3 @@ def md_loader(appdata, filename=None, fileptr=None, translate=True, cnf=None,
 
 def md_saver(doc, filename=None, fileptr=None, translate=True, cnf=None, **kw):
     doc.save(filename)
-
-
-def check_md(path):
-    return ".md" in path
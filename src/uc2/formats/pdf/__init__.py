@@ -16,8 +16,6 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from uc2.formats.pdf.pdf_filters import PDF_Saver
-from uc2.formats.pdf.pdfconst import PDF_SIGNATURE
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -33,10 +31,3 @@ def pdf_saver(sk2_doc, filename=None, fileptr=None, translate=True, cnf=None,
     sk2_doc.saver = PDF_Saver()
     sk2_doc.save(filename, fileptr)
     sk2_doc.saver = sk2_saver
-
-
-def check_pdf(path):
-    fileptr = get_fileptr(path)
-    string = fileptr.read(len(PDF_SIGNATURE))
-    fileptr.close()
-    return string == PDF_SIGNATURE
@@ -58,6 +58,7 @@ class PDF_Saver(AbstractSaver):
         desktop_layers = methods.get_desktop_layers()
         master_layers = methods.get_master_layers()
         pages = methods.get_pages()
+        shared_layers = desktop_layers + master_layers
 
         renderer.set_num_pages(len(pages))
 
@@ -68,7 +69,11 @@ class PDF_Saver(AbstractSaver):
             layers = desktop_layers + methods.get_layers(page)
             layers += master_layers
             for layer in layers:
-                if methods.is_layer_visible(layer):
+                if not methods.is_layer_visible(layer):
+                    continue
+                if layer in shared_layers:
+                    renderer.render_shared(layer, layer.childs)
+                else:
                     renderer.render(layer.childs, True)
             renderer.end_page()
         renderer.save()
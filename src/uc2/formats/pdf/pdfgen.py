@@ -15,11 +15,14 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import hashlib
 import math
 from copy import deepcopy
 from reportlab.lib.colors import CMYKColorSep, Color, CMYKColor
 from reportlab.lib.utils import ImageReader
-from reportlab.pdfbase.pdfdoc import PDFInfo, PDFString, PDFDate, PDFDictionary
+from reportlab.pdfbase.pdfdoc import PDFInfo, PDFString, PDFDate, \
+    PDFDictionary, PDFResourceDictionary, PDFName, PDFObjectReference, \
+    PDFStream, xObjectName
 from reportlab.pdfgen.canvas import Canvas, FILL_EVEN_ODD, FILL_NON_ZERO
 
 from pdfconst import PDF_VERSION_DEFAULT
@@ -28,6 +31,18 @@ from uc2 import libgeom, libcairo, sk2const
 from uc2.formats.sk2 import sk2_model
 
 
+def get_image_key(image, alpha_channel=None):
+    """
+    Returns content based key of image and its alpha channel.
+    """
+    digest = hashlib.md5(image.tobytes())
+    key = [image.mode, image.size, digest.hexdigest()]
+    if alpha_channel:
+        digest = hashlib.md5(alpha_channel.tobytes())
+        key += [alpha_channel.size, digest.hexdigest()]
+    return tuple(key)
+
+
 class UC2PDFInfo(PDFInfo):
     pdfxversion = 'PDF/X-4'
 
@@ -58,10 +73,23 @@ class PDFGenerator(object):
     use_spot = True
     num_pages = 0
     page_count = 0
+    page_range = (0.0, 1.0)
     prgs_msg = _('Saving in progress...')
 
+    form_count = 0
+    forms = None
+    images = None
+    image_refs = None
+    shadings = None
+    masks = None
+
     def __init__(self, fileptr, cms, version=PDF_VERSION_DEFAULT):
         self.cms = cms
+        self.forms = {}
+        self.images = {}
+        self.image_refs = {}
+        self.shadings = {}
+        self.masks = {}
         self.canvas = Canvas(fileptr, pdfVersion=version[0])
         self.info = UC2PDFInfo(self.canvas._doc)
         self.info.pdfxversion = version[1]
@@ -109,23 +137,131 @@ class PDFGenerator(object):
         self.canvas.translate(w / 2.0 - left_margin, h / 2.0 - top_margin)
         self.canvas.setPageSize((w, h))
         position = 0.0
+        page_size = 1.0
         if self.num_pages:
             position = float(self.page_count) / float(self.num_pages)
-        events.emit(events.FILTER_INFO, self.prgs_msg, position)
+            page_size = 1.0 / float(self.num_pages)
+        events.progress(self.prgs_msg, position)
+        self.page_range = (position, position + page_size)
 
     def end_page(self):
         self.canvas.showPage()
+        self.image_refs = {}
         self.page_count += 1
         position = 1.0
         if self.num_pages:
             position = float(self.page_count) / float(self.num_pages)
-        events.emit(events.FILTER_INFO, self.prgs_msg, position)
+        events.progress(self.prgs_msg, position)
 
     def save(self):
         self.canvas.save()
 
+    # --- Shared objects
+    def get_form_name(self, prefix='Form'):
+        self.form_count += 1
+        return 'uc2%s%d' % (prefix, self.form_count)
+
+    def end_form(self, group=None):
+        """
+        Finishes Form XObject with complete resources dictionary
+        (reportlab forms have no shadings, alpha states and spot colors).
+        Optional group is transparency group dictionary of the form.
+        """
+        canvas = self.canvas
+        name = canvas._formData[0]
+        resources = PDFResourceDictionary()
+        resources.basicFonts()
+        resources.allProcs()
+        if canvas._formsinuse:
+            resources.XObject = canvas._doc.xobjDict(canvas._formsinuse)
+        state = canvas._extgstate.getState()
+        if state:
+            resources.ExtGState = state
+        resources.setShading(canvas._shadingUsed)
+        resources.setColorSpace(canvas._colorsUsed)
+        canvas.endForm(Resources=resources)
+        if group is not None:
+            form = canvas._doc.idToObject[xObjectName(name)]
+            form.Contents = PDFStream(PDFDictionary({'Group': group}),
+                                      form.stream)
+        return name
+
+    def get_objs_bbox(self, objs):
+        bbox = []
+        width = 0.0
+        stack = list(objs)
+        while stack:
+            obj = stack.pop()
+            if obj.childs:
+                stack += obj.childs
+            line_width = getattr(obj, 'cache_line_width', None)
+            if line_width and obj.style[1]:
+                miter = max(obj.style[1][6], 1.0)
+                width = max(width, line_width * miter)
+        for obj in objs:
+            if obj.cache_bbox:
+                if bbox:
+                    bbox = libgeom.sum_bbox(bbox, obj.cache_bbox)
+                else:
+                    bbox = [] + obj.cache_bbox
+        if not bbox:
+            return [0.0, 0.0, 1.0, 1.0]
+        bbox = libgeom.normalize_bbox(bbox)
+        # arrows and wide strokes may overlap bbox of object
+        margin = max(bbox[2] - bbox[0], bbox[3] - bbox[1]) + width
+        return [bbox[0] - margin, bbox[1] - margin,
+                bbox[2] + margin, bbox[3] + margin]
+
+    def render_shared(self, key, objs):
+        """
+        Renders objects repeated on every page (master and desktop layers)
+        as Form XObject which is defined once and referenced by pages.
+        """
+        if not objs:
+            return
+        name = self.get_shared_form(key, objs, True)
+        self.draw_form(name)
+
+    def get_shared_form(self, key, objs, toplevel=False):
+        name = self.forms.get(key)
+        if name is None:
+            name = self.get_form_name()
+            self.canvas.beginForm(name, *self.get_objs_bbox(objs))
+            self.render(objs, toplevel)
+            self.end_form()
+            self.forms[key] = name
+        return name
+
+    def draw_form(self, name, trafo=None):
+        self.canvas.saveState()
+        if trafo:
+            self.canvas.transform(*trafo)
+        # form content expects default alpha values
+        self.canvas.setFillAlpha(1.0)
+        self.canvas.setStrokeAlpha(1.0)
+        self.canvas.doForm(name)
+        self.canvas.restoreState()
+
+    def draw_instance(self, obj):
+        """
+        Renders symbol instance. Symbol content is defined once
+        as Form XObject and referenced by all instances.
+        """
+        symbol = obj.get_symbol()
+        if symbol is None or not symbol.childs:
+            return
+        self.draw_form(self.get_shared_form(symbol, symbol.childs), obj.trafo)
+
     # --- Rendering
     def render(self, objs, toplevel=False):
+        if toplevel:
+            # progress of toplevel objects is mapped into page range
+            with events.progress_range(*self.page_range):
+                self.render_objs(objs, True)
+        else:
+            self.render_objs(objs)
+
+    def render_objs(self, objs, toplevel=False):
         obj_count = 0
         for obj in objs:
             if obj.is_pixmap:
@@ -138,18 +274,16 @@ class PDFGenerator(object):
                     self.render(curve_obj.childs)
             elif obj.is_container:
                 self.draw_container(obj)
+            elif obj.is_instance:
+                self.draw_instance(obj)
             else:
                 self.render(obj.childs)
 
             # ---Progress
-            obj_count += 1
-            shift = 0.0
-            page_size = 1.0
-            if self.num_pages:
-                shift = float(self.page_count) / float(self.num_pages)
-                page_size = 1.0 / float(self.num_pages)
-            position = shift + obj_count / len(objs) * page_size
-            events.emit(events.FILTER_INFO, self.prgs_msg, position)
+            if toplevel:
+                obj_count += 1
+                position = float(obj_count) / len(objs)
+                events.progress(self.prgs_msg, position)
 
     def draw_curve(self, curve_obj):
         paths = libgeom.apply_trafo_to_paths(curve_obj.paths, curve_obj.trafo)
@@ -335,6 +469,20 @@ class PDFGenerator(object):
             pattern = fill_style[2]
             self.fill_pattern(obj, pdfpath, fill_trafo, pattern)
 
+    def get_gradient_trafo(self, gradient):
+        """
+        Returns trafo from unit gradient space ((0,0)-(1,0) vector or
+        circle with radius 1) or None for degenerate gradient.
+        """
+        sp, ep = gradient[1]
+        if gradient[0] == sk2const.GRADIENT_RADIAL:
+            radius = libgeom.distance(sp, ep)
+            trafo = [radius, 0.0, 0.0, radius, sp[0], sp[1]]
+        else:
+            dx, dy = ep[0] - sp[0], ep[1] - sp[1]
+            trafo = [dx, dy, -dy, dx, sp[0], sp[1]]
+        return trafo if trafo[0] or trafo[1] else None
+
     def fill_gradient(self, pdfpath, fill_trafo, gradient):
         self.canvas.saveState()
         self.canvas.clipPath(pdfpath, 0, 0)
@@ -343,28 +491,123 @@ class PDFGenerator(object):
         grad_type = gradient[0]
         sp, ep = gradient[1]
         stops = gradient[2]
+        trafo = self.get_gradient_trafo(gradient)
+        if trafo:
+            # gradient is drawn in unit space, so shading with
+            # the same stops is embedded once for all objects
+            self.canvas.transform(*trafo)
+            self.shade(grad_type, stops)
+        else:
+            colors, positions = self.get_gradient_colors(stops)
+            if grad_type == sk2const.GRADIENT_RADIAL:
+                self.canvas.radialGradient(sp[0], sp[1], 0.0, colors,
+                                           positions, True)
+            else:
+                x0, y0 = sp
+                x1, y1 = ep
+                self.canvas.linearGradient(x0, y0, x1, y1, colors,
+                                           positions, True)
+        self.canvas.restoreState()
+
+    def get_gradient_colors(self, stops):
         colors = []
         positions = []
         for offset, color in stops:
             positions.append(offset)
             colors.append(self.get_pdfcolor(color))
-        if grad_type == sk2const.GRADIENT_RADIAL:
-            radius = libgeom.distance(sp, ep)
-            self.canvas.radialGradient(sp[0], sp[1], radius, colors,
-                                       positions, True)
+        return colors, positions
+
+    def shade(self, grad_type, stops):
+        """
+        Paints unit gradient (0,0)-(1,0) or circle with radius 1
+        reusing previously created shading objects.
+        """
+        canvas = self.canvas
+        key = (grad_type, repr(stops), self.colorspace, self.use_spot)
+        name = self.shadings.get(key)
+        if name is None:
+            colors, positions = self.get_gradient_colors(stops)
+            if grad_type == sk2const.GRADIENT_RADIAL:
+                canvas.radialGradient(0.0, 0.0, 1.0, colors, positions, True)
+            else:
+                canvas.linearGradient(0.0, 0.0, 1.0, 0.0, colors,
+                                      positions, True)
+            # painting operator is '/<shading name> sh'
+            self.shadings[key] = canvas._code[-1].split()[0][1:]
         else:
-            x0, y0 = sp
-            x1, y1 = ep
-            self.canvas.linearGradient(x0, y0, x1, y1, colors,
-                                       positions, True)
-        self.canvas.restoreState()
+            canvas._shadingUsed[name] = name
+            canvas._code.append('/%s sh' % name)
 
     def fill_tr_gradient(self, obj, pdfpath, fill_trafo, gradient):
+        """
+        Paints opaque color shading through luminosity soft mask
+        made of stops alpha values. Degenerate gradients are painted
+        by bands.
+        """
         grad_type = gradient[0]
-        if grad_type == sk2const.GRADIENT_RADIAL:
-            self.fill_radial_tr_gradient(obj, pdfpath, fill_trafo, gradient)
-        else:
-            self.fill_linear_tr_gradient(obj, pdfpath, fill_trafo, gradient)
+        trafo = self.get_gradient_trafo(gradient)
+        if trafo is None:
+            if grad_type == sk2const.GRADIENT_RADIAL:
+                self.fill_radial_tr_gradient(obj, pdfpath, fill_trafo,
+                                             gradient)
+            else:
+                self.fill_linear_tr_gradient(obj, pdfpath, fill_trafo,
+                                             gradient)
+            return
+        stops = gradient[2]
+        cv_trafo = trafo
+        if fill_trafo:
+            cv_trafo = libgeom.multiply_trafo(trafo, fill_trafo)
+        paths = libgeom.apply_trafo_to_paths(obj.paths, obj.trafo)
+        paths = libgeom.apply_trafo_to_paths(paths,
+                                             libgeom.invert_trafo(cv_trafo))
+        bbox = libgeom.normalize_bbox(libgeom.get_paths_bbox(paths))
+
+        self.canvas.saveState()
+        self.canvas.clipPath(pdfpath, 0, 0)
+        self.canvas.transform(*cv_trafo)
+        self.canvas.setFillAlpha(1.0)
+        self.set_soft_mask(grad_type, stops, bbox)
+        opaque_stops = [[offset, color[:2] + [1.0] + color[3:]]
+                        for offset, color in stops]
+        self.shade(grad_type, opaque_stops)
+        self.canvas.restoreState()
+
+    def set_soft_mask(self, grad_type, stops, bbox):
+        """
+        Sets soft mask which is unit gradient of stops alpha values
+        covering provided bbox.
+        """
+        canvas = self.canvas
+        alphas = tuple([(offset, color[2]) for offset, color in stops])
+        key = (grad_type, alphas, tuple(bbox))
+        smask = self.masks.get(key)
+        if smask is None:
+            margin = 0.01 * max(bbox[2] - bbox[0], bbox[3] - bbox[1], 1.0)
+            canvas.beginForm(self.get_form_name('Mask'),
+                             bbox[0] - margin, bbox[1] - margin,
+                             bbox[2] + margin, bbox[3] + margin)
+            colors = [Color(alpha, alpha, alpha) for offset, alpha in alphas]
+            positions = [offset for offset, alpha in alphas]
+            if grad_type == sk2const.GRADIENT_RADIAL:
+                canvas.radialGradient(0.0, 0.0, 1.0, colors, positions, True)
+            else:
+                canvas.linearGradient(0.0, 0.0, 1.0, 0.0, colors,
+                                      positions, True)
+            group = PDFDictionary({'S': PDFName('Transparency'),
+                                   'CS': PDFName('DeviceRGB')})
+            name = self.end_form(group)
+            smask = PDFDictionary({
+                'Type': PDFName('Mask'),
+                'S': PDFName('Luminosity'),
+                'G': PDFObjectReference(xObjectName(name))})
+            self.masks[key] = smask
+        # graphics states are registered for each page and form
+        states = canvas._extgstate._c
+        state = ('SMask', smask)
+        if state not in states:
+            states[state] = 'uc2SMask%d' % len(states)
+        canvas._code.append('/%s gs' % states[state])
 
     def get_grcolor_at_point(self, stops, point=0.0):
         if not point:
@@ -489,20 +732,43 @@ class PDFGenerator(object):
 
         self.canvas.restoreState()
 
+    def get_image_form(self, image, alpha_channel=None):
+        """
+        Returns name of Form XObject for provided image. Images with
+        the same content are converted and embedded only once.
+        """
+        ref_key = (id(image), id(alpha_channel), self.colorspace)
+        ref = self.image_refs.get(ref_key)
+        if ref is not None:
+            return ref[0]
+        key = get_image_key(image, alpha_channel) + (self.colorspace,)
+        name = self.images.get(key)
+        if name is None:
+            pdf_image = image
+            if self.colorspace == uc2const.COLOR_CMYK:
+                pdf_image = self.cms.convert_image(image, uc2const.IMAGE_CMYK)
+            elif self.colorspace == uc2const.COLOR_RGB:
+                pdf_image = self.cms.convert_image(image, uc2const.IMAGE_RGB)
+            elif self.colorspace == uc2const.COLOR_GRAY:
+                pdf_image = self.cms.convert_image(image, uc2const.IMAGE_GRAY)
+            img = ImageReader(pdf_image)
+            img.getRGBData()
+            if alpha_channel:
+                img._dataA = ImageReader(alpha_channel)
+            name = self.get_form_name('Image')
+            width, height = img.getSize()
+            self.canvas.beginForm(name, 0, 0, width, height)
+            self.canvas.drawImage(img, 0, 0, mask='auto')
+            self.end_form()
+            self.images[key] = name
+        # source images are kept up to page end to prevent ids reusing
+        self.image_refs[ref_key] = (name, image, alpha_channel)
+        return name
+
     def draw_image(self, image, alpha_channel=None):
         if not image:
             return
-        if self.colorspace == uc2const.COLOR_CMYK:
-            image = self.cms.convert_image(image, uc2const.IMAGE_CMYK)
-        elif self.colorspace == uc2const.COLOR_RGB:
-            image = self.cms.convert_image(image, uc2const.IMAGE_RGB)
-        elif self.colorspace == uc2const.COLOR_GRAY:
-            image = self.cms.convert_image(image, uc2const.IMAGE_GRAY)
-        img = ImageReader(image)
-        img.getRGBData()
-        if alpha_channel:
-            img._dataA = ImageReader(alpha_channel)
-        self.canvas.drawImage(img, 0, 0, mask='auto')
+        self.canvas.doForm(self.get_image_form(image, alpha_channel))
 
     def draw_pixmap_obj(self, obj):
         hnd = obj.handler
@@ -15,9 +15,6 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import zipfile
-
-from uc2.formats.pdxf import const
 from uc2.formats.pdxf import model
 from uc2.formats.pdxf.presenter import PDXF_Presenter
 from uc2.utils.mixutils import merge_cnf
@@ -34,14 +31,3 @@ def pdxf_loader(appdata, filename, translate=True, cnf=None, **kw):
 def pdxf_saver(pdxf_doc, filename, translate=True, cnf=None, **kw):
     cnf = merge_cnf(cnf, kw)
     pdxf_doc.save(filename)
-
-
-def check_pdxf(path):
-    if not zipfile.is_zipfile(path):
-        return False
-
-    pdxf_file = zipfile.ZipFile(path, 'r')
-    fl = pdxf_file.namelist()
-    if 'mimetype' not in fl or not pdxf_file.read('mimetype') == const.DOC_MIME:
-        return False
-    return True
@@ -154,7 +154,7 @@ class XMLDocReader(handler.ContentHandler):
             position = float(self.locator.getLineNumber()) / self.lines
             if position - self.position > 0.05:
                 msg = 'Parsing in process...'
-                events.emit(events.FILTER_INFO, msg, position)
+                events.progress(msg, position)
                 self.position = position
             obj = None
             cid = model.TAGNAME_TO_CID[name]
@@ -243,7 +243,7 @@ class PDXF_Saver:
         position = float(self.counter) / self.obj_num
         if position - self.position > 0.05:
             msg = 'Saving in process...'
-            events.emit(events.FILTER_INFO, msg, position)
+            events.progress(msg, position)
             self.position = position
 
         tag = model.CID_TO_TAGNAME[item.cid]
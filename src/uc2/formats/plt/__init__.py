@@ -15,11 +15,8 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import os
-
 from uc2.formats.plt.plt_presenter import PltPresenter
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -46,16 +43,3 @@ def plt_saver(doc, filename=None, fileptr=None, translate=True, cnf=None, **kw):
         plt_doc.close()
     else:
         doc.save(filename)
-
-
-def check_plt(path):
-    file_size = os.path.getsize(path)
-    fileptr = get_fileptr(path)
-
-    if file_size > 20:
-        string = fileptr.read(20)
-    else:
-        string = fileptr.read()
-
-    fileptr.close()
-    return string.startswith('IN;')
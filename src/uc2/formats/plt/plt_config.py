@@ -26,3 +26,7 @@ class PLT_Config(XmlConfigParser):
     plt_optimize = True
     plt_rounding_level = 1
     plt_scale = 1.0
+    plt_optimize_travel = False
+    plt_reverse_paths = True
+    plt_choose_start = True
+    plt_inner_first = True
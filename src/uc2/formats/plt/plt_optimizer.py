@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Pen-up travel optimization of cutting jobs.
+
+Jobs are ordered by nearest neighbour search and the order is improved
+by 2-opt moves (reversal of job sequence). Open paths can be cut in
+reversed direction, closed paths can be started from any node. Paths
+placed inside closed contour are cut before the contour, because cut
+out piece may shift on the sheet.
+
+Paths are flattened paths in PLT coordinates:
+[start_point, [point, point, ...], closed_flag]
+"""
+
+import math
+
+# max distance between reversed sequence ends in 2-opt
+TWO_OPT_WINDOW = 64
+TWO_OPT_PASSES = 8
+
+
+def distance(p0, p1):
+    return math.hypot(p1[0] - p0[0], p1[1] - p0[1])
+
+
+def get_travel_distance(paths, start=(0.0, 0.0)):
+    """
+    Returns pen-up travel distance for provided sequence of paths.
+    """
+    result = 0.0
+    point = start
+    for path in paths:
+        result += distance(point, path[0])
+        point = path[1][-1] if path[1] else path[0]
+    return result
+
+
+def is_point_in_polygon(point, polygon):
+    x, y = point
+    inside = False
+    x0, y0 = polygon[-1]
+    for x1, y1 in polygon:
+        if (y1 > y) != (y0 > y) and \
+                x < (x0 - x1) * (y - y1) / float(y0 - y1) + x1:
+            inside = not inside
+        x0, y0 = x1, y1
+    return inside
+
+
+def get_bbox_distance(point, bbox):
+    dx = max(bbox[0] - point[0], 0.0, point[0] - bbox[2])
+    dy = max(bbox[1] - point[1], 0.0, point[1] - bbox[3])
+    return math.hypot(dx, dy)
+
+
+class CutJob(object):
+    """
+    Single cutting path with selected direction (open paths)
+    or start node (closed paths).
+    """
+    points = None
+    flag = None
+    closed = False
+    bbox = None
+    reversed = False
+    start = 0
+    outer = None
+
+    def __init__(self, path):
+        self.points = [path[0]] + path[1]
+        self.flag = path[2]
+        self.closed = len(self.points) > 3 and \
+            self.points[0] == self.points[-1]
+        xs = [point[0] for point in self.points]
+        ys = [point[1] for point in self.points]
+        self.bbox = [min(xs), min(ys), max(xs), max(ys)]
+        self.outer = []
+
+    def get_entry(self):
+        if self.closed:
+            return self.points[self.start]
+        return self.points[-1] if self.reversed else self.points[0]
+
+    def get_exit(self):
+        if self.closed:
+            return self.points[self.start]
+        return self.points[0] if self.reversed else self.points[-1]
+
+    def get_nearest_node(self, point):
+        """
+        Returns index and distance of closed path node nearest to point.
+        """
+        index, dist = 0, None
+        for i, node in enumerate(self.points[:-1]):
+            node_dist = distance(point, node)
+            if dist is None or node_dist < dist:
+                index, dist = i, node_dist
+        return index, dist
+
+    def contains(self, job):
+        bbox = self.bbox
+        if not bbox[0] <= job.bbox[0] or not job.bbox[2] <= bbox[2] or \
+                not bbox[1] <= job.bbox[1] or not job.bbox[3] <= bbox[3]:
+            return False
+        if bbox == job.bbox:
+            return False
+        return is_point_in_polygon(job.points[0], self.points)
+
+    def get_path(self):
+        points = self.points
+        if self.closed:
+            ring = points[self.start:-1] + points[:self.start]
+            points = ring + ring[:1]
+        elif self.reversed:
+            points = points[::-1]
+        return [points[0], points[1:], self.flag]
+
+
+class TravelOptimizer(object):
+    """
+    Orders cutting paths to minimize pen-up travel.
+    """
+    reverse_paths = True
+    choose_start = True
+    inner_first = True
+    travel_before = 0.0
+    travel_after = 0.0
+
+    def __init__(self, reverse_paths=True, choose_start=True,
+                 inner_first=True):
+        self.reverse_paths = reverse_paths
+        self.choose_start = choose_start
+        self.inner_first = inner_first
+
+    def optimize(self, paths, start=(0.0, 0.0)):
+        """
+        Returns new list of reordered (and probably reversed
+        or rotated) paths.
+        """
+        self.travel_before = get_travel_distance(paths, start)
+        source_jobs = [CutJob(path) for path in paths]
+        if self.inner_first:
+            self.set_nesting(source_jobs)
+        jobs = self.order_nearest(source_jobs, start)
+        self.improve_order(jobs, start)
+        if self.choose_start:
+            self.set_start_nodes(jobs, start)
+        result = [job.get_path() for job in jobs]
+        self.travel_after = get_travel_distance(result, start)
+        if self.travel_after > self.travel_before and \
+                self.is_nested_order(source_jobs):
+            # heuristics failed, source order is better
+            self.travel_after = self.travel_before
+            return paths
+        return result
+
+    def set_nesting(self, jobs):
+        contours = [job for job in jobs if job.closed]
+        for job in jobs:
+            job.outer = [item for item in contours
+                         if item is not job and item.contains(job)]
+
+    def is_nested_order(self, jobs):
+        """
+        Checks that every path precedes contours it is placed inside.
+        """
+        passed = set()
+        for job in jobs:
+            for outer in job.outer:
+                if outer in passed:
+                    return False
+            passed.add(job)
+        return True
+
+    def get_entry_cost(self, job, point, best):
+        """
+        Returns entry distance to the job and required
+        direction/start node. None is returned if job is not
+        nearer than best distance.
+        """
+        if job.closed:
+            if not self.choose_start:
+                return distance(point, job.points[0]), False, 0
+            if best is not None and \
+                    get_bbox_distance(point, job.bbox) >= best:
+                return None
+            index, dist = job.get_nearest_node(point)
+            return dist, False, index
+        dist = distance(point, job.points[0])
+        if self.reverse_paths:
+            rev_dist = distance(point, job.points[-1])
+            if rev_dist < dist:
+                return rev_dist, True, 0
+        return dist, False, 0
+
+    def order_nearest(self, jobs, start):
+        blockers = dict([(job, 0) for job in jobs])
+        for job in jobs:
+            for outer in job.outer:
+                blockers[outer] += 1
+        pending = [job for job in jobs if not blockers[job]]
+        result = []
+        point = start
+        while pending:
+            best = best_job = best_cost = None
+            for job in pending:
+                cost = self.get_entry_cost(job, point, best)
+                if cost is not None and (best is None or cost[0] < best):
+                    best, best_job, best_cost = cost[0], job, cost
+            pending.remove(best_job)
+            best_job.reversed, best_job.start = best_cost[1:]
+            result.append(best_job)
+            point = best_job.get_exit()
+            for outer in best_job.outer:
+                blockers[outer] -= 1
+                if not blockers[outer]:
+                    pending.append(outer)
+        return result
+
+    def can_reverse(self, jobs, i, j):
+        segment = jobs[i:j + 1]
+        if not self.reverse_paths:
+            # closed paths have the same entry and exit points
+            for job in segment:
+                if not job.closed:
+                    return False
+        if not self.inner_first:
+            return True
+        members = set(segment)
+        for job in segment:
+            for outer in job.outer:
+                if outer in members:
+                    return False
+        return True
+
+    def improve_order(self, jobs, start):
+        """
+        Applies 2-opt moves: reversal of jobs[i:j+1] sequence with
+        reversal of each open path direction.
+        """
+        if len(jobs) < 3:
+            return
+        for _pass in range(TWO_OPT_PASSES):
+            improved = False
+            for i in range(len(jobs) - 1):
+                prev_point = jobs[i - 1].get_exit() if i else start
+                entry = jobs[i].get_entry()
+                last = min(len(jobs) - 1, i + TWO_OPT_WINDOW)
+                for j in range(i + 1, last + 1):
+                    exit_point = jobs[j].get_exit()
+                    cost = distance(prev_point, entry)
+                    new_cost = distance(prev_point, exit_point)
+                    if j + 1 < len(jobs):
+                        next_entry = jobs[j + 1].get_entry()
+                        cost += distance(exit_point, next_entry)
+                        new_cost += distance(entry, next_entry)
+                    if new_cost < cost - 1e-9 and self.can_reverse(jobs, i, j):
+                        jobs[i:j + 1] = jobs[i:j + 1][::-1]
+                        for job in jobs[i:j + 1]:
+                            if not job.closed:
+                                job.reversed = not job.reversed
+                        entry = jobs[i].get_entry()
+                        improved = True
+            if not improved:
+                break
+
+    def set_start_nodes(self, jobs, start):
+        point = start
+        for job in jobs:
+            if job.closed:
+                job.start = job.get_nearest_node(point)[0]
+            point = job.get_exit()
@@ -17,10 +17,12 @@
 
 from copy import deepcopy
 
-from uc2 import _, events
+from uc2 import _, events, msgconst
 from uc2 import libgeom
 from uc2.formats.plt import plt_model
-from uc2.formats.plt.plt_const import SK2_to_PLT_TRAFO, PLT_to_SK2_TRAFO
+from uc2.formats.plt.plt_const import SK2_to_PLT_TRAFO, PLT_to_SK2_TRAFO, \
+    mm_to_plt
+from uc2.formats.plt.plt_optimizer import TravelOptimizer
 from uc2.formats.sk2 import sk2_model
 
 
@@ -90,13 +92,14 @@ class SK2_to_PLT_Translator(object):
                      dx, dy]
 
             obj_num = len(self.obj_stack)
+            cut_paths = []
             for obj in self.obj_stack:
 
                 self.counter += 1
                 position = float(self.counter) / obj_num
                 if position - self.position > 0.05:
                     msg = _('Saving in progress...')
-                    events.emit(events.FILTER_INFO, msg, position)
+                    events.progress(msg, position)
                     self.position = position
 
                 paths = libgeom.get_flattened_path(
@@ -124,4 +127,21 @@ class SK2_to_PLT_Translator(object):
                         path[1] = points
 
                     if path and path[1]:
-                        self.jobs.append(plt_model.PltJob('', path))
+                        cut_paths.append(path)
+
+            if self.plt_doc.config.plt_optimize_travel:
+                cut_paths = self.optimize_travel(cut_paths)
+            for path in cut_paths:
+                self.jobs.append(plt_model.PltJob('', path))
+
+    def optimize_travel(self, paths):
+        config = self.plt_doc.config
+        optimizer = TravelOptimizer(config.plt_reverse_paths,
+                                    config.plt_choose_start,
+                                    config.plt_inner_first)
+        paths = optimizer.optimize(paths)
+        msg = _('Pen-up travel: %.1f mm before, %.1f mm after optimization')
+        msg = msg % (optimizer.travel_before / mm_to_plt,
+                     optimizer.travel_after / mm_to_plt)
+        events.emit(events.MESSAGES, msgconst.INFO, msg)
+        return paths
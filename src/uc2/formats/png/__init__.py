@@ -61,12 +61,3 @@ def png_saver(sk2_doc, filename=None, fileptr=None, translate=True, cnf=None,
 
     surface.write_to_png(fileptr)
     fileptr.close()
-
-
-def check_png(path):
-    fileptr = get_fileptr(path)
-    mstr = fileptr.read(len(PNG_ID))
-    fileptr.close()
-    if mstr == PNG_ID:
-        return True
-    return False
@@ -16,7 +16,6 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from uc2.formats.riff.presenter import RIFF_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -32,10 +31,3 @@ def riff_saver(riff_doc, filename=None, fileptr=None, translate=True, cnf=None,
                **kw):
     cnf = merge_cnf(cnf, kw)
     riff_doc.save(filename, fileptr)
-
-
-def check_riff(path):
-    fileptr = get_fileptr(path)
-    fourcc = fileptr.read(4)
-    fileptr.close()
-    return fourcc == 'RIFF'
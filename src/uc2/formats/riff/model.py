@@ -27,6 +27,49 @@ RIFF_PACK = 9
 RIFF_OBJECT = 10
 
 
+class ChunkView(object):
+    """
+    Lazy reference to chunk content in memory mapped file or in
+    decompressed stream. Chunk header can be redefined (compressed
+    chunks have sizes stored in separate table). Small slices are
+    read directly from source data, whole chunk string is created
+    on first access to object chunk attribute only. Views into mapped
+    file are valid while root list keeps the mapping open.
+    """
+    __slots__ = ('data', 'offset', 'size', 'header')
+
+    def __init__(self, data, offset, size, header=''):
+        self.data = data
+        self.offset = offset
+        self.size = size
+        self.header = header
+
+    def __len__(self):
+        return len(self.header) + self.size
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return str(self)[item]
+        start, stop, step = item.indices(len(self))
+        hsize = len(self.header)
+        if step != 1:
+            return str(self)[item]
+        if stop <= hsize:
+            return self.header[start:stop]
+        if start >= hsize:
+            offset = self.offset - hsize
+            return self.data[offset + start:offset + stop]
+        return self.header[start:] + self.data[self.offset:
+                                               self.offset + stop - hsize]
+
+    def __str__(self):
+        return self.header + self.data[self.offset:self.offset + self.size]
+
+    def detach(self):
+        self.data = self.data[self.offset:self.offset + self.size]
+        self.offset = 0
+
+
 class RiffModelObject(BinaryModelObject):
     """
     Generic RIFF model object.
@@ -40,6 +83,17 @@ class RiffModelObject(BinaryModelObject):
     chunk_tag = ''
     chunk_size = 0
     version = ''
+    _chunk = ''
+
+    def _get_chunk(self):
+        if isinstance(self._chunk, ChunkView):
+            self._chunk = str(self._chunk)
+        return self._chunk
+
+    def _set_chunk(self, chunk):
+        self._chunk = chunk
+
+    chunk = property(_get_chunk, _set_chunk)
 
     def resolve(self):
         name = ''
@@ -87,7 +141,7 @@ class RiffList(RiffModelObject):
         self.childs = []
         self.chunk = chunk
         self.identifier = 'LIST'
-        self.chunk_tag = self.chunk[8:12]
+        self.chunk_tag = chunk[8:12]
         self.chunk_size = dword2py_int(chunk[4:8])
         self.cache_fields = [
             (0, 4, 'list identifier'),
@@ -108,12 +162,41 @@ class RiffRootList(RiffList):
     """
 
     cid = RIFF_ROOT
+    mapped = None
+    views = []
 
     def __init__(self, chunk=''):
         if not chunk:
             chunk = 'RIFF' + py_int2dword(4) + 'riff'
         RiffList.__init__(self, chunk)
         self.version = self.chunk_tag
+        self.views = []
+
+    def set_mapping(self, mapped, views):
+        """
+        Keeps memory mapped file of loaded model open. Chunk views
+        of model objects refer to mapped data until detach() call.
+        """
+        self.mapped = mapped
+        self.views = views
+
+    def detach(self):
+        """
+        Copies chunk data of views which are not materialized yet
+        out of mapped file and closes the mapping. Should be called
+        before source file rewriting.
+        """
+        for view in self.views:
+            view.detach()
+        self.views = []
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+
+    def destroy(self):
+        if self.mapped is not None:
+            self.mapped.close()
+        RiffList.destroy(self)
 
 
 class RiffUnparsedList(RiffList):
@@ -132,7 +215,39 @@ class RiffUnparsedList(RiffList):
         RiffList.__init__(self, chunk)
 
 
-class RiffCmprList(RiffUnparsedList):
+class LazyChildsMixin(object):
+    """
+    Childs of compressed objects are parsed on first access
+    by lazy_parser callable (if it is set by loader).
+    """
+    lazy_parser = None
+    _childs = None
+
+    def _get_childs(self):
+        if self.lazy_parser is not None:
+            parser = self.lazy_parser
+            self.lazy_parser = None
+            self._childs = parser(self)
+        return self._childs
+
+    def _set_childs(self, childs):
+        self.lazy_parser = None
+        self._childs = childs
+
+    childs = property(_get_childs, _set_childs)
+
+    def get_raw_chunk(self):
+        """
+        Returns chunk without materializing of chunk view.
+        """
+        return self._chunk
+
+    def destroy(self):
+        self.lazy_parser = None
+        RiffModelObject.destroy(self)
+
+
+class RiffCmprList(LazyChildsMixin, RiffUnparsedList):
     """
     Compressed RIFF model list.
     The list has unusual structure because packed child object size is redefined
@@ -180,7 +295,7 @@ class RiffObject(RiffModelObject):
         return self.chunk
 
 
-class RiffPackObject(RiffObject):
+class RiffPackObject(LazyChildsMixin, RiffObject):
     """
     Compressed RIFF object.
     Actually the object serves as a list because contains a lot of childs,
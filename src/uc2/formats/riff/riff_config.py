@@ -21,3 +21,4 @@ from uc2.utils.config import XmlConfigParser
 class RIFF_Config(XmlConfigParser):
     system_encoding = 'utf-8'
     filename = 'riff_config.xml'
+    mapped_loading = True
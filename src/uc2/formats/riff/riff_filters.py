@@ -15,10 +15,209 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import logging
+import mmap
+import struct
+import time
+import zlib
+
 from uc2.utils import get_chunk_size, dword2py_int, py_int2dword
 from uc2.formats.generic_filters import AbstractLoader, AbstractSaver
 from uc2.formats.riff import model
 
+LOG = logging.getLogger(__name__)
+
+
+def map_fileptr(fileptr):
+    """
+    Memory maps file content. Returns None if file object
+    cannot be mapped (e.g. in-memory stream or empty file).
+    """
+    try:
+        return mmap.mmap(fileptr.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, IOError, ValueError, EnvironmentError):
+        return None
+
+
+class MappedRiffParser(object):
+    """
+    Zero-copy RIFF parser. Object chunks are represented by views
+    (offset and size) into memory mapped file, compressed lists and
+    pack objects are inflated and parsed on first access to childs.
+    The mapping is handed over to root list of parsed model, it lives
+    while the model is not destroyed or detached before saving.
+    """
+    get_class = None
+    report = None
+    parse_packs = False
+    bytes_parsed = 0
+    mapped = None
+    views = []
+
+    def __init__(self, get_class, report=None, parse_packs=False):
+        self.get_class = get_class
+        self.report = report
+        self.parse_packs = parse_packs
+        self.bytes_parsed = 0
+        self.mapped = None
+        self.views = []
+
+    def log_throughput(self, name, start, bytes_start):
+        duration = max(time.time() - start, 1e-6)
+        size = self.bytes_parsed - bytes_start
+        LOG.debug('%s: %d bytes parsed in %.3f sec (%.1f MB/s)', name,
+                  size, duration, size / duration / 1024.0 / 1024.0)
+
+    def get_view(self, data, offset, size, header=''):
+        view = model.ChunkView(data, offset, size, header)
+        if data is self.mapped:
+            self.views.append(view)
+        return view
+
+    def parse_file(self, data):
+        start = time.time()
+        bytes_start = self.bytes_parsed
+        if isinstance(data, mmap.mmap):
+            self.mapped = data
+        try:
+            obj = model.RiffRootList(data[:12])
+            end = min(get_chunk_size(data[4:8]) + 8, len(data))
+            pos = 12
+            while pos < end:
+                ret, pos = self.parse_stream(data, pos)
+                obj.childs.append(ret)
+        except Exception:
+            if self.mapped is not None:
+                self.mapped.close()
+            raise
+        finally:
+            mapped, views = self.mapped, self.views
+            self.mapped = None
+            self.views = []
+        obj.set_mapping(mapped, views)
+        self.log_throughput('RIFF file', start, bytes_start)
+        return obj
+
+    def parse_stream(self, data, pos):
+        identifier = data[pos:pos + 4]
+        if identifier == 'LIST':
+            return self.parse_list(data, pos)
+        elif identifier == 'pack' and self.parse_packs:
+            return self.parse_pack(data, pos)
+        return self.parse_object(data, pos)
+
+    def parse_list(self, data, pos):
+        list_identifier = data[pos + 8:pos + 12]
+        size = get_chunk_size(data[pos + 4:pos + 8])
+        offset = pos + 12
+        if list_identifier == 'cmpr':
+            obj = model.RiffCmprList(self.get_view(data, pos, size + 8))
+            obj.lazy_parser = self.parse_cmpr_list
+            return obj, offset + size - 4
+
+        class_ = self.get_class('LIST', list_identifier)
+        obj = class_(data[pos:offset])
+        cur = offset
+        while cur <= offset + size - 8:
+            ret, cur = self.parse_stream(data, cur)
+            if ret is None:
+                chunk = self.get_view(data, pos, size + 8)
+                return model.RiffUnparsedList(chunk), offset + size - 4
+            obj.childs.append(ret)
+        return obj, cur
+
+    def parse_object(self, data, pos):
+        identifier = data[pos:pos + 4]
+        if not identifier[:3].isalnum():
+            return None, pos + 4
+        size = get_chunk_size(data[pos + 4:pos + 8])
+        class_ = self.get_class(identifier)
+        self.bytes_parsed += size + 8
+        if self.report:
+            self.report(pos + size + 8)
+        return class_(self.get_view(data, pos, size + 8)), pos + size + 8
+
+    def parse_pack(self, data, pos):
+        size = get_chunk_size(data[pos + 4:pos + 8])
+        obj = model.RiffPackObject(self.get_view(data, pos, size + 8))
+        obj.lazy_parser = self.parse_pack_childs
+        return obj, pos + size + 8
+
+    def parse_pack_childs(self, obj):
+        start = time.time()
+        bytes_start = self.bytes_parsed
+        chunk = obj.get_raw_chunk()
+        if isinstance(chunk, model.ChunkView):
+            source = buffer(chunk.data, chunk.offset + 20, chunk.size - 20)
+        else:
+            source = chunk[20:]
+        data = zlib.decompressobj().decompress(source)
+        childs = []
+        pos = 0
+        while pos < len(data):
+            ret, pos = self.parse_stream(data, pos)
+            childs.append(ret)
+        self.log_throughput('pack object', start, bytes_start)
+        return childs
+
+    def parse_cmpr_list(self, obj):
+        start = time.time()
+        bytes_start = self.bytes_parsed
+        chunk = obj.get_raw_chunk()
+        compressedsize = dword2py_int(chunk[12:16])
+        if isinstance(chunk, model.ChunkView):
+            source = buffer(chunk.data, chunk.offset, chunk.size)
+        else:
+            source = chunk
+        data = zlib.decompressobj().decompress(buffer(source, 36))
+        sizes = zlib.decompress(buffer(source, 36 + compressedsize))
+        blocksizes = struct.unpack('<%dI' % (len(sizes) // 4),
+                                   sizes[:len(sizes) // 4 * 4])
+        childs = []
+        pos = 0
+        while pos < len(data):
+            ret, pos = self.parse_compressed_stream(data, pos, blocksizes)
+            childs.append(ret)
+        self.log_throughput('cmpr list', start, bytes_start)
+        return childs
+
+    def parse_compressed_stream(self, data, pos, blocksizes):
+        if data[pos:pos + 4] == 'LIST':
+            return self.parse_compressed_list(data, pos, blocksizes)
+        return self.parse_compressed_object(data, pos, blocksizes)
+
+    def parse_compressed_list(self, data, pos, blocksizes):
+        list_identifier = data[pos + 8:pos + 12]
+        size = blocksizes[dword2py_int(data[pos + 4:pos + 8])]
+        header = 'LIST' + py_int2dword(size) + list_identifier
+        if size & 1:
+            size += 1
+        offset = pos + 12
+
+        class_ = self.get_class('LIST', list_identifier)
+        obj = class_(header)
+        cur = offset
+        while cur <= offset + size - 8:
+            ret, cur = self.parse_compressed_stream(data, cur, blocksizes)
+            if ret is None:
+                chunk = model.ChunkView(data, offset, size - 4, header)
+                return model.RiffUnparsedList(chunk), offset + size - 4
+            obj.childs.append(ret)
+        return obj, cur
+
+    def parse_compressed_object(self, data, pos, blocksizes):
+        identifier = data[pos:pos + 4]
+        if not identifier[:3].isalnum():
+            return None, pos + 4
+        size = blocksizes[dword2py_int(data[pos + 4:pos + 8])]
+        header = identifier + py_int2dword(size)
+        if size & 1:
+            size += 1
+        class_ = self.get_class(identifier)
+        self.bytes_parsed += size + 8
+        chunk = model.ChunkView(data, pos + 8, size, header)
+        return class_(chunk), pos + size + 8
+
 
 class RIFF_Loader(AbstractLoader):
     name = 'RIFF_Loader'
@@ -26,7 +225,17 @@ class RIFF_Loader(AbstractLoader):
     def do_load(self):
         self.model = None
         self.parent_stack = []
-        self.model = self.parse_file(self.fileptr)
+        data = None
+        if self.config.mapped_loading:
+            data = map_fileptr(self.fileptr)
+        if data is not None:
+            parser = MappedRiffParser(self.get_class, parse_packs=True)
+            self.model = parser.parse_file(data)
+        else:
+            self.model = self.parse_file(self.fileptr)
+
+    def get_class(self, identifier, list_identifier=''):
+        return model.RiffList if list_identifier else model.RiffObject
 
     def parse_file(self, fileptr):
         identifier = fileptr.read(4)
@@ -168,5 +377,11 @@ class RIFF_Loader(AbstractLoader):
 class RIFF_Saver(AbstractSaver):
     name = 'RIFF_Saver'
 
+    def save(self, presenter, path=None, fileptr=None):
+        # source file can be rewritten, so mapped chunks are copied
+        if isinstance(presenter.model, model.RiffRootList):
+            presenter.model.detach()
+        AbstractSaver.save(self, presenter, path, fileptr)
+
     def do_save(self):
         self.fileptr.write(self.model.get_chunk())
@@ -15,12 +15,10 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from uc2.formats.scribus_pal.scribus_pal_model import SP_TAG
 from uc2.formats.scribus_pal.scribus_pal_presenter import \
     ScribusPalettePresenter
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -64,17 +62,3 @@ def scribus_pal_saver(doc, filename=None, fileptr=None, translate=True,
         scrb_doc.close()
     else:
         doc.save(filename, fileptr)
-
-
-def check_scribus_pal(path):
-    fileptr = get_fileptr(path)
-    ret = False
-    i = 0
-    while i < 20:
-        line = fileptr.readline()
-        if not line.find(SP_TAG) == -1:
-            ret = True
-            break
-        i += 1
-    fileptr.close()
-    return ret
@@ -17,10 +17,9 @@
 
 
 from uc2 import uc2const
-from uc2.formats.sk import sk_model, sk_const
+from uc2.formats.sk import sk_model
 from uc2.formats.sk.sk_presenter import SK_Presenter
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -51,10 +50,3 @@ def sk_saver(sk2_doc, filename=None, fileptr=None, translate=True, cnf=None,
         sk_doc.close()
     else:
         sk2_doc.save(filename, fileptr)
-
-
-def check_sk(path):
-    fileptr = get_fileptr(path)
-    string = fileptr.read(len(sk_const.SKDOC_ID))
-    fileptr.close()
-    return string == sk_const.SKDOC_ID
@@ -19,7 +19,6 @@ from uc2 import uc2const
 from uc2.formats.sk1 import model
 from uc2.formats.sk1.presenter import SK1Presenter
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -50,10 +49,3 @@ def sk1_saver(sk2_doc, filename=None, fileptr=None, translate=True, cnf=None,
         sk1_doc.close()
     else:
         sk2_doc.save(filename, fileptr)
-
-
-def check_sk1(path):
-    fileptr = get_fileptr(path)
-    string = fileptr.read(7)
-    fileptr.close()
-    return string == '##sK1 1'
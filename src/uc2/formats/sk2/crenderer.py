@@ -16,6 +16,8 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import cairo
+import math
+from collections import OrderedDict
 from copy import deepcopy
 
 from uc2 import libcairo, libgeom, sk2const
@@ -25,6 +27,11 @@ CAIRO_BLACK = [0.0, 0.0, 0.0]
 CAIRO_GRAY = [0.5, 0.5, 0.5]
 CAIRO_WHITE = [1.0, 1.0, 1.0]
 
+PATTERN_NORMAL = 0
+PATTERN_PROOFING = 1
+PATTERN_CONTOUR = 2
+PATTERN_CACHE_SIZE = 64
+
 CAPS = {
     sk2const.CAP_BUTT: cairo.LINE_CAP_BUTT,
     sk2const.CAP_ROUND: cairo.LINE_CAP_ROUND,
@@ -51,9 +58,11 @@ class CairoRenderer:
     contour_flag = False
     stroke_style = []
     for_display = False
+    pattern_cache = None
 
     def __init__(self, cms):
         self.cms = cms
+        self.pattern_cache = OrderedDict()
 
     # -------ROUTINES----------
 
@@ -67,11 +76,15 @@ class CairoRenderer:
             r, g, b = self.cms.get_rgb_color(color)[1]
         return r, g, b, color[2]
 
-    def get_surface(self, obj):
+    def get_surface(self, obj, scale=1.0):
+        if not self.for_display:
+            scale = 1.0
         if self.contour_flag:
-            return obj.handler.get_surface(self.cms, stroke_mode=True)
+            return obj.handler.get_surface(self.cms, stroke_mode=True,
+                                           scale=scale)
         else:
-            return obj.handler.get_surface(self.cms, self.cms.proofing)
+            return obj.handler.get_surface(self.cms, self.cms.proofing,
+                                           scale=scale)
 
     def _create_pattern_image(self, obj):
         fill = obj.style[0]
@@ -83,21 +96,62 @@ class CairoRenderer:
             image_obj.style[3] = deepcopy(pattern_fill[2])
         return image_obj
 
-    def get_pattern_surface(self, obj):
-        image_obj = self._create_pattern_image(obj)
+    def clear_pattern_cache(self, *args):
+        self.pattern_cache.clear()
+
+    def get_pattern_mode(self):
         if self.contour_flag:
+            return PATTERN_CONTOUR
+        elif self.cms.proofing:
+            return PATTERN_PROOFING
+        return PATTERN_NORMAL
+
+    def _get_pattern_key(self, obj, mode):
+        """
+        Pattern surfaces are shared by objects with the same tile.
+        Python strings cache their hash, so pattern data string
+        is a cheap dict key after first lookup.
+        """
+        pattern_fill = obj.style[0][2]
+        colors = None
+        if pattern_fill[0] == sk2const.PATTERN_IMG and len(pattern_fill) > 2:
+            colors = repr(pattern_fill[2])
+        return pattern_fill[1], colors, mode
+
+    def _create_pattern_surface(self, obj, mode):
+        image_obj = self._create_pattern_image(obj)
+        if mode == PATTERN_CONTOUR:
+            return image_obj.handler.get_surface(self.cms, stroke_mode=True)
+        elif mode == PATTERN_PROOFING:
+            return image_obj.handler.get_surface(self.cms, True)
+        return image_obj.handler.get_surface(self.cms)
+
+    def _get_cached_pattern(self, obj, mode):
+        key = self._get_pattern_key(obj, mode)
+        cache = self.pattern_cache
+        surface = cache.pop(key, None)
+        if surface is None:
+            surface = self._create_pattern_surface(obj, mode)
+        cache[key] = surface
+        if len(cache) > PATTERN_CACHE_SIZE:
+            cache.popitem(last=False)
+        return surface
+
+    def get_pattern_surface(self, obj):
+        mode = self.get_pattern_mode()
+        if mode == PATTERN_CONTOUR:
             if not obj.cache_gray_pattern_img:
-                s = image_obj.handler.get_surface(self.cms, stroke_mode=True)
+                s = self._get_cached_pattern(obj, mode)
                 obj.cache_gray_pattern_img = s
             return obj.cache_gray_pattern_img
-        elif self.cms.proofing:
+        elif mode == PATTERN_PROOFING:
             if not obj.cache_ps_pattern_img:
-                s = image_obj.handler.get_surface(self.cms, True)
+                s = self._get_cached_pattern(obj, mode)
                 obj.cache_ps_pattern_img = s
             return obj.cache_ps_pattern_img
         else:
             if not obj.cache_pattern_img:
-                s = image_obj.handler.get_surface(self.cms)
+                s = self._get_cached_pattern(obj, mode)
                 obj.cache_pattern_img = s
             return obj.cache_pattern_img
 
@@ -119,6 +173,8 @@ class CairoRenderer:
             self.render_primitives(ctx, obj)
         elif obj.is_container:
             self.render_container(ctx, obj)
+        elif obj.is_instance:
+            self.render_instance(ctx, obj)
         elif obj.is_group:
             for obj in obj.childs:
                 self.render_object(ctx, obj)
@@ -161,25 +217,40 @@ class CairoRenderer:
             ctx.append_path(container.cache_cpath)
             ctx.stroke()
 
-    def render_image(self, ctx, obj):
-        surface = self.get_surface(obj)
-        if not surface:
+    def render_instance(self, ctx, obj):
+        symbol = obj.get_symbol()
+        if symbol is None:
             return
+        ctx.save()
+        ctx.transform(cairo.Matrix(*obj.trafo))
+        for item in symbol.childs:
+            self.render_object(ctx, item)
+        ctx.restore()
+
+    def render_image(self, ctx, obj):
         canvas_matrix = ctx.get_matrix()
         canvas_trafo = libcairo.get_trafo_from_matrix(canvas_matrix)
-        zoom = canvas_trafo[0]
-
-        h = obj.size[1]
-        lu_corner = libgeom.apply_trafo_to_point([0.0, float(h)], obj.trafo)
-        x0, y0 = libgeom.apply_trafo_to_point(lu_corner, canvas_trafo)
+        # image rows are top-down, canvas matrix can be
+        # non-diagonal inside of instance objects
+        h = float(obj.size[1])
+        trafo = libgeom.multiply_trafo([1.0, 0.0, 0.0, -1.0, 0.0, h],
+                                       obj.trafo)
+        trafo = libgeom.multiply_trafo(trafo, canvas_trafo)
+        m11, m12, m21, m22 = trafo[:4]
+        scale = max(math.hypot(m11, m12), math.hypot(m21, m22))
+        surface = self.get_surface(obj, scale)
+        if not surface:
+            return
 
-        m11, m12, m21, m22 = obj.trafo[:4]
-        matrix = cairo.Matrix(zoom * m11, -zoom * m12,
-                              - zoom * m21, zoom * m22, x0, y0)
-        ctx.set_matrix(matrix)
+        ctx.set_matrix(cairo.Matrix(*trafo))
+        # downscaled surface of resolution pyramid
+        w, h = obj.handler.get_size()
+        if surface.get_width() != w or surface.get_height() != h:
+            ctx.scale(float(w) / surface.get_width(),
+                      float(h) / surface.get_height())
 
         ctx.set_source_surface(surface)
-        if zoom * abs(m11) > .98:
+        if abs(m11) > .98:
             ctx.get_source().set_filter(cairo.FILTER_NEAREST)
 
         if self.contour_flag:
@@ -270,24 +341,21 @@ class CairoRenderer:
             ctx.set_fill_rule(cairo.FILL_RULE_EVEN_ODD)
         else:
             ctx.set_fill_rule(cairo.FILL_RULE_WINDING)
+        # fill trafo is set by object update, renderer only reads it
+        fill_trafo = obj.fill_trafo or sk2const.NORMAL_TRAFO
         if fill[1] == sk2const.FILL_SOLID:
-            if obj.fill_trafo:
-                obj.fill_trafo = []
             color = fill[2]
             ctx.set_source_rgba(*self.get_color(color))
         elif fill[1] == sk2const.FILL_GRADIENT:
-            if not obj.fill_trafo:
-                obj.fill_trafo = [] + sk2const.NORMAL_TRAFO
             gradient = fill[2]
             points = gradient[1]
             if not points:
-                obj.fill_trafo = [] + sk2const.NORMAL_TRAFO
+                fill_trafo = sk2const.NORMAL_TRAFO
                 points = libgeom.bbox_middle_points(obj.cache_bbox)
                 if gradient[0] == sk2const.GRADIENT_LINEAR:
                     points = [points[0], points[2]]
                 else:
                     points = [[points[1][0], points[2][1]], points[2]]
-                gradient[1] = points
             coords = points[0] + points[1]
             if gradient[0] == sk2const.GRADIENT_LINEAR:
                 grd = cairo.LinearGradient(*coords)
@@ -297,7 +365,7 @@ class CairoRenderer:
                 grd = cairo.RadialGradient(x0, y0, 0, x0, y0, radius)
             for stop in gradient[2]:
                 grd.add_color_stop_rgba(stop[0], *self.get_color(stop[1]))
-            matrix = cairo.Matrix(*obj.fill_trafo)
+            matrix = cairo.Matrix(*fill_trafo)
             matrix.invert()
             extend = cairo.EXTEND_PAD
             if len(gradient) > 3:
@@ -307,9 +375,8 @@ class CairoRenderer:
             ctx.set_source(grd)
         elif fill[1] == sk2const.FILL_PATTERN:
             if not obj.fill_trafo:
-                obj.fill_trafo = [] + sk2const.NORMAL_TRAFO
-                obj.fill_trafo = obj.fill_trafo[:4] + [obj.cache_bbox[0],
-                                                       obj.cache_bbox[3]]
+                fill_trafo = sk2const.NORMAL_TRAFO[:4] + [obj.cache_bbox[0],
+                                                          obj.cache_bbox[3]]
             pattern_fill = fill[2]
             sp = cairo.SurfacePattern(self.get_pattern_surface(obj))
             sp.set_extend(cairo.EXTEND_REPEAT)
@@ -318,7 +385,7 @@ class CairoRenderer:
                 pattern_matrix = cairo.Matrix(*pattern_fill[3])
                 pattern_matrix.invert()
                 flip_matrix = flip_matrix * pattern_matrix
-            trafo_matrix = cairo.Matrix(*obj.fill_trafo)
+            trafo_matrix = cairo.Matrix(*fill_trafo)
             trafo_matrix.invert()
             flip_matrix = flip_matrix * trafo_matrix
             sp.set_matrix(flip_matrix)
@@ -327,7 +394,7 @@ class CairoRenderer:
             canvas_matrix = ctx.get_matrix()
             canvas_trafo = libcairo.get_trafo_from_matrix(canvas_matrix)
             zoom = canvas_trafo[0]
-            if zoom * abs(obj.fill_trafo[0]) > .98:
+            if zoom * abs(fill_trafo[0]) > .98:
                 ctx.get_source().set_filter(cairo.FILTER_NEAREST)
 
     def process_stroke(self, ctx, obj, style=None):
@@ -339,13 +406,12 @@ class CairoRenderer:
         # Line width
         if not stroke[8]:
             line_width = stroke[1]
-            if obj and obj.stroke_trafo:
-                obj.stroke_trafo = []
         else:
-            if obj and not obj.stroke_trafo:
-                obj.stroke_trafo = [] + sk2const.NORMAL_TRAFO
+            # stroke trafo is set by object update, renderer only reads it
+            stroke_trafo = obj.stroke_trafo if obj else None
             points = [[0.0, 0.0], [1.0, 0.0]]
-            points = libgeom.apply_trafo_to_points(points, obj.stroke_trafo)
+            points = libgeom.apply_trafo_to_points(
+                points, stroke_trafo or sk2const.NORMAL_TRAFO)
             coef = libgeom.distance(*points)
             line_width = stroke[1] * coef
         ctx.set_line_width(line_width)
@@ -40,12 +40,15 @@ GRID_LAYER = 57
 GUIDE_LAYER = 58
 DESKTOP_LAYERS = 59
 GUIDE = 60
+SYMBOLS = 61
+SYMBOL = 62
 
 SELECTABLE_CLASS = 100
 COMPOUND_CLASS = 101
 GROUP = 102
 CONTAINER = 103
 TP_GROUP = 104
+INSTANCE = 105
 
 PRIMITIVE_CLASS = 200
 RECTANGLE = 201
@@ -69,9 +72,10 @@ CID_TO_NAME = {
     MASTER_LAYERS: _('Master layers'), LAYER: _('Layer'),
     GRID_LAYER: _('Grid layer'), GUIDE_LAYER: _('Guide layer'),
     DESKTOP_LAYERS: _('Desktop layers'), GUIDE: _('Guide'),
+    SYMBOLS: _('Symbols'), SYMBOL: _('Symbol'),
 
     GROUP: _('Group'), CONTAINER: _('Container'),
-    TP_GROUP: _('Text on Path Group'),
+    TP_GROUP: _('Text on Path Group'), INSTANCE: _('Instance'),
 
     RECTANGLE: _('Rectangle'), CIRCLE: _('Ellipse'),
     POLYGON: _('Polygon'), CURVE: _('Curve'),
@@ -90,9 +94,10 @@ CID_TO_TAGNAME = {
     MASTER_LAYERS: 'MasterLayers', LAYER: 'Layer',
     GRID_LAYER: 'GridLayer', GUIDE_LAYER: 'GuideLayer',
     DESKTOP_LAYERS: 'DesktopLayers', GUIDE: 'Guide',
+    SYMBOLS: 'Symbols', SYMBOL: 'Symbol',
 
     GROUP: 'Group', CONTAINER: 'Container',
-    TP_GROUP: 'TP_Group',
+    TP_GROUP: 'TP_Group', INSTANCE: 'Instance',
 
     RECTANGLE: 'Rectangle', CIRCLE: 'Ellipse',
     POLYGON: 'Polygon', CURVE: 'Curve',
@@ -111,9 +116,10 @@ TAGNAME_TO_CID = {
     'MasterLayers': MASTER_LAYERS, 'Layer': LAYER,
     'GridLayer': GRID_LAYER, 'GuideLayer': GUIDE_LAYER,
     'DesktopLayers': DESKTOP_LAYERS, 'Guide': GUIDE,
+    'Symbols': SYMBOLS, 'Symbol': SYMBOL,
 
     'Group': GROUP, 'Container': CONTAINER,
-    'TP_Group': TP_GROUP,
+    'TP_Group': TP_GROUP, 'Instance': INSTANCE,
 
     'Rectangle': RECTANGLE, 'Ellipse': CIRCLE,
     'Polygon': POLYGON, 'Curve': CURVE,
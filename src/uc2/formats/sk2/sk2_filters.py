@@ -22,7 +22,7 @@ from cStringIO import StringIO
 
 from uc2 import libgeom, sk2const
 from uc2.formats.generic_filters import AbstractLoader, AbstractSaver
-from uc2.formats.sk2 import sk2_model
+from uc2.formats.sk2 import sk2_model, sk2_parser
 from uc2.formats.sk2.crenderer import CairoRenderer
 
 LOG = logging.getLogger(__name__)
@@ -52,13 +52,27 @@ class SK2_Loader(AbstractLoader):
 
             if self.line:
                 try:
-                    code = compile('self.' + self.line, '<string>', 'exec')
-                    exec code
-                except Exception as e:
-                    msg = 'Parsing error in "%s"', self.line
+                    self.process_line(self.line)
+                except Exception:
+                    msg = 'Parsing error in "%s"' % self.line
                     self.send_error(msg)
                     raise
 
+    def process_line(self, line):
+        parsed = sk2_parser.parse_line(line)
+        if parsed is None:
+            # Fallback for lines out of SK2 line grammar
+            code = compile('self.' + line, '<string>', 'exec')
+            exec code
+            return
+        kind, args = parsed
+        if kind == sk2_parser.SET_FIELD:
+            self.set_field(*args)
+        elif kind == sk2_parser.OBJ:
+            self.obj(args)
+        else:
+            self.obj_end()
+
     def obj(self, tag):
         obj_cid = sk2_model.TAGNAME_TO_CID[tag]
         obj = sk2_model.CID_TO_CLASS[obj_cid](self.config)
@@ -86,7 +100,7 @@ class SK2_Loader(AbstractLoader):
         obj.__dict__[item] = val
 
     def obj_end(self):
-        self.parent_stack = self.parent_stack[:-1]
+        self.parent_stack.pop()
         if not self.parent_stack:
             self.break_flag = True
 
@@ -98,7 +112,6 @@ class SK2_Saver(AbstractSaver):
         super(SK2_Saver, self).__init__()
 
     def do_save(self):
-        self.presenter.update()
         if self.config.preview:
             preview = self.generate_preview()
             w, h = self.config.preview_size
@@ -87,19 +87,23 @@ class SK2_Methods:
     def delete_object(self, obj):
         parent = obj.parent
         parent.childs.remove(obj)
+        parent.set_dirty()
 
     def insert_object(self, obj, parent, index=0):
         parent.childs.insert(index, obj)
         obj.parent = parent
+        obj.set_dirty()
 
     def append_object(self, obj, parent):
         parent.childs.append(obj)
         obj.parent = parent
+        obj.set_dirty()
 
     def append_objects(self, objs, parent):
         parent.childs += objs
         for obj in objs:
             obj.parent = parent
+        parent.set_dirty()
 
     # ---PAGES
 
@@ -344,6 +348,123 @@ class SK2_Methods:
     def set_guide_properties(self, props):
         self.set_layer_properties(self.get_guide_layer(), props)
 
+    # ---SYMBOLS
+
+    def get_symbols_obj(self, create=False):
+        return self.model.get_symbols_obj(create)
+
+    def get_symbols(self):
+        symbols = self.get_symbols_obj()
+        return symbols.childs if symbols else []
+
+    def get_symbol(self, symbol_id):
+        return self.model.get_symbol(symbol_id)
+
+    def add_symbol(self, objs, name=''):
+        """
+        Creates symbol definition from provided objects.
+        Objects should be in symbol coordinates.
+        """
+        symbols = self.get_symbols_obj(True)
+        symbol = sk2_model.Symbol(self.config, symbols, name=name)
+        self.append_objects(objs, symbol)
+        self.append_object(symbol, symbols)
+        return symbol
+
+    def create_instance(self, symbol, parent, trafo=None):
+        obj = sk2_model.Instance(self.config, parent,
+                                 symbol.symbol_id, trafo)
+        self.append_object(obj, parent)
+        return obj
+
+    def get_instances(self, symbol, objs=None):
+        result = []
+        if objs is None:
+            objs = self.get_pages() + self.get_desktop_layers() + \
+                   self.get_master_layers()
+        for obj in objs:
+            if obj.is_instance:
+                if obj.symbol_id == symbol.symbol_id:
+                    result.append(obj)
+            elif obj.childs:
+                result += self.get_instances(symbol, obj.childs)
+        return result
+
+    def update_symbol(self, symbol):
+        """
+        Marks symbol and its instances for recomputation
+        after symbol content changes.
+        """
+        symbol.set_dirty()
+        for obj in self.get_instances(symbol):
+            obj.set_dirty()
+
+    def copy_symbols(self, objs, symbols=None):
+        """
+        Returns copies of symbols used by objects (including symbols
+        used inside of symbol content) mapped by symbol id.
+        """
+        symbols = {} if symbols is None else symbols
+        for obj in objs:
+            if obj.is_instance:
+                symbol = obj.get_symbol()
+                if symbol is not None and obj.symbol_id not in symbols:
+                    symbols[obj.symbol_id] = symbol.copy()
+                    self.copy_symbols(symbol.childs, symbols)
+            elif obj.childs:
+                self.copy_symbols(obj.childs, symbols)
+        return symbols
+
+    def convert_instances(self, objs, symbols, keep_defined=False):
+        """
+        Replaces instances by groups of symbol content for objects
+        coming from other document. Symbols of source document are
+        provided as map by symbol id, instances of unknown symbols
+        are removed. If keep_defined flag is set, instances of symbols
+        defined in the document are kept. Returns list of objects.
+        """
+        result = []
+        for obj in objs:
+            if obj.is_instance:
+                if keep_defined and self.get_symbol(obj.symbol_id):
+                    result.append(obj)
+                    continue
+                symbol = symbols.get(obj.symbol_id)
+                if symbol is None:
+                    continue
+                obj = obj.to_group(symbol)
+                obj.childs = self.convert_instances(obj.childs, symbols)
+            elif obj.childs:
+                obj.childs = self.convert_instances(obj.childs, symbols,
+                                                    keep_defined)
+            result.append(obj)
+        return result
+
+    def expand_instances(self, objs=None):
+        """
+        Replaces instances by groups of symbol content, so document
+        can be processed by translators which do not support symbols.
+        Returns list of replacements for restore_instances() call.
+        """
+        replaced = []
+        if objs is None:
+            objs = self.get_pages() + self.get_desktop_layers() + \
+                   self.get_master_layers()
+        for obj in objs:
+            for index, child in enumerate(obj.childs):
+                if child.is_instance:
+                    group = child.to_group()
+                    obj.childs[index] = group
+                    replaced.append((obj, index, child))
+                    child = group
+                if child.childs:
+                    replaced += self.expand_instances([child])
+        return replaced
+
+    def restore_instances(self, replaced):
+        for parent, index, obj in reversed(replaced):
+            parent.childs[index] = obj
+
     # ---RECTANGLE
 
     def set_rect_corners(self, obj, corners):
@@ -26,7 +26,7 @@ from uc2.formats.generic import TextModelObject
 from uc2.libimg.handlers import EditableImageHandler
 from . import arrows
 
-GENERIC_FIELDS = ['cid', 'childs', 'parent', 'config', 'handler']
+GENERIC_FIELDS = ['cid', 'childs', 'parent', 'config', 'handler', 'dirty']
 LOG = logging.getLogger(__name__)
 
 
@@ -47,6 +47,7 @@ class DocumentObject(TextModelObject):
     is_group = False
     is_tpgroup = False
     is_container = False
+    is_instance = False
     is_selectable = False
 
     def get_class_name(self):
@@ -145,6 +146,24 @@ class Document(DocumentObject):
     def set_style(self, style, name):
         self.styles[name] = deepcopy(style)
 
+    def get_symbols_obj(self, create=False):
+        """
+        Returns symbols container. Documents without symbols
+        have no container, it is created on demand.
+        """
+        for child in self.childs:
+            if child.cid == SYMBOLS:
+                return child
+        if create:
+            symbols = Symbols(self.config, self)
+            self.childs.append(symbols)
+            return symbols
+        return None
+
+    def get_symbol(self, symbol_id):
+        symbols = self.get_symbols_obj()
+        return symbols.get_symbol(symbol_id) if symbols else None
+
 
 class Pages(DocumentObject):
     """
@@ -383,6 +402,75 @@ class Guide(StructuralObject):
         self.childs = []
 
 
+class Symbols(StructuralObject):
+    """
+    Represents container for symbol definitions.
+    Symbols are not rendered directly, but through instance objects.
+    All child symbols are in childs list.
+    """
+    cid = SYMBOLS
+    symbol_counter = 0
+    cache_map = None
+    cache_childs = None
+
+    def __init__(self, config, parent=None):
+        self.cid = SYMBOLS
+        self.childs = []
+        self.parent = parent
+        self.config = config
+        self.symbol_counter = 0
+
+    def get_symbol(self, symbol_id):
+        # map is rebuilt if symbols are added or removed
+        if self.cache_map is None or self.cache_childs != self.childs:
+            self.cache_map = dict([(item.symbol_id, item)
+                                   for item in self.childs])
+            self.cache_childs = [] + self.childs
+        return self.cache_map.get(symbol_id)
+
+    def new_symbol_id(self):
+        self.symbol_counter += 1
+        symbol_id = 'symbol%d' % self.symbol_counter
+        while self.get_symbol(symbol_id) is not None:
+            self.symbol_counter += 1
+            symbol_id = 'symbol%d' % self.symbol_counter
+        return symbol_id
+
+
+class Symbol(StructuralObject):
+    """
+    Represents symbol definition, i.e. shared content of instance
+    objects. Child objects are in symbol coordinates which are
+    transformed by instance trafo.
+    All child objects are in childs list.
+    """
+    cid = SYMBOL
+    symbol_id = ''
+    name = ''
+
+    cache_bbox = []
+
+    def __init__(self, config, parent=None, symbol_id='', name=''):
+        self.cid = SYMBOL
+        self.childs = []
+        self.parent = parent
+        self.config = config
+        if parent and not symbol_id:
+            symbol_id = parent.new_symbol_id()
+        self.symbol_id = symbol_id
+        self.name = name or symbol_id
+
+    def resolve(self, name=''):
+        return StructuralObject.resolve(self, '%s' % self.name)
+
+    def update(self):
+        self.cache_bbox = []
+        for child in self.childs:
+            if child.cache_bbox:
+                self.cache_bbox = libgeom.sum_bbox(self.cache_bbox,
+                                                   child.cache_bbox)
+
+
 # ================Selectable Objects==================
 class SelectableObject(DocumentObject):
     """
@@ -439,7 +527,7 @@ class Group(SelectableObject):
         childs_snapshots = []
         for child in self.childs:
             childs_snapshots.append(child.get_trafo_snapshot())
-        return self, None, [] + self.cache_bbox, childs_snapshots
+        return self, None, self.cache_bbox, childs_snapshots
 
     def set_trafo_snapshot(self, snapshot):
         self.cache_bbox, childs_snapshots = snapshot[2:]
@@ -510,6 +598,82 @@ class Container(Group):
         self.cache_bbox = deepcopy(self.cache_container.cache_bbox)
 
 
+class Instance(SelectableObject):
+    """
+    Represents instance of symbol, i.e. lightweight reference
+    to symbol definition placed with own transformation.
+    The object stores symbol id and trafo only.
+    """
+    cid = INSTANCE
+    symbol_id = ''
+    is_instance = True
+
+    cache_symbol = None
+
+    def __init__(self, config, parent=None, symbol_id='', trafo=None):
+        self.cid = INSTANCE
+        self.childs = []
+        self.config = config
+        self.parent = parent
+        self.symbol_id = symbol_id
+        self.trafo = trafo or [] + sk2const.NORMAL_TRAFO
+
+    def resolve(self, name=''):
+        return True, name or self.get_class_name(), self.symbol_id
+
+    def get_symbol(self):
+        if self.cache_symbol is None:
+            doc = self.parent
+            while doc is not None and not doc.cid == DOCUMENT:
+                doc = doc.parent
+            if doc is not None:
+                self.cache_symbol = doc.get_symbol(self.symbol_id)
+        return self.cache_symbol
+
+    def update(self):
+        self.cache_symbol = None
+        symbol = self.get_symbol()
+        if symbol is not None and symbol.dirty:
+            symbol.do_update()
+        self.update_bbox()
+
+    def update_bbox(self):
+        symbol = self.get_symbol()
+        if symbol is None or not symbol.cache_bbox:
+            self.cache_bbox = []
+            return
+        points = libgeom.bbox_points(symbol.cache_bbox)
+        points = libgeom.apply_trafo_to_points(points, self.trafo)
+        self.cache_bbox = libgeom.bbox_for_points(points)
+
+    def apply_trafo(self, trafo):
+        self.trafo = libgeom.multiply_trafo(self.trafo, trafo)
+        self.update_bbox()
+
+    def get_trafo_snapshot(self):
+        return self, self.trafo, self.cache_bbox
+
+    def set_trafo_snapshot(self, snapshot):
+        self.trafo, self.cache_bbox = snapshot[1:]
+
+    def to_group(self, symbol=None):
+        """
+        Returns group of symbol content copies placed by instance trafo.
+        Symbol of other document can be provided for detached instance.
+        """
+        group = Group(self.config, self.parent)
+        symbol = symbol or self.get_symbol()
+        if symbol is not None:
+            for child in symbol.childs:
+                obj = child.copy()
+                obj.do_update()
+                obj.apply_trafo(self.trafo)
+                obj.parent = group
+                group.childs.append(obj)
+        group.update_bbox()
+        return group
+
+
 class PrimitiveObject(SelectableObject):
     """
     Abstract parent class for graphics primitives. 
@@ -529,6 +693,8 @@ class PrimitiveObject(SelectableObject):
     cache_gray_pattern_img = None
     is_primitive = True
     cache_arrows = None
+    # estimated number of items in each cpath of cache_cpath
+    cache_nodes = 0
 
     def get_initial_paths(self):
         pass
@@ -555,9 +721,40 @@ class PrimitiveObject(SelectableObject):
         self.cache_gray_pattern_img = None
         self.cache_paths = self.get_initial_paths()
         self.cache_cpath = libgeom.create_cpath(self.cache_paths)
+        self.cache_nodes = sum([len(path[1]) + 2
+                                for path in self.cache_paths or []])
         libgeom.apply_trafo(self.cache_cpath, self.trafo)
         self.update_stroke()
         self.update_bbox()
+        self.update_fill()
+
+    def update_fill(self):
+        # fill trafo and default gradient vector are set here
+        # (not by renderer) so rendering never changes object fields
+        fill = self.style[0]
+        if not fill:
+            return
+        if fill[1] == sk2const.FILL_SOLID:
+            if self.fill_trafo:
+                self.fill_trafo = []
+        elif fill[1] == sk2const.FILL_GRADIENT:
+            if not self.fill_trafo:
+                self.fill_trafo = [] + sk2const.NORMAL_TRAFO
+            gradient = fill[2]
+            if not gradient[1] and self.cache_bbox:
+                self.fill_trafo = [] + sk2const.NORMAL_TRAFO
+                points = libgeom.bbox_middle_points(self.cache_bbox)
+                if gradient[0] == sk2const.GRADIENT_LINEAR:
+                    points = [points[0], points[2]]
+                else:
+                    points = [[points[1][0], points[2][1]], points[2]]
+                gradient = [gradient[0], points] + gradient[2:]
+                self.style = [fill[:2] + [gradient] + fill[3:]] + \
+                    self.style[1:]
+        elif fill[1] == sk2const.FILL_PATTERN:
+            if not self.fill_trafo and self.cache_bbox:
+                self.fill_trafo = sk2const.NORMAL_TRAFO[:4] + \
+                    [self.cache_bbox[0], self.cache_bbox[3]]
 
     def update_stroke(self):
         stroke = self.style[1]
@@ -565,7 +762,8 @@ class PrimitiveObject(SelectableObject):
             return
         if not stroke[8]:
             self.cache_line_width = stroke[1]
-            self.stroke_trafo = []
+            if self.stroke_trafo:
+                self.stroke_trafo = []
         else:
             if not self.stroke_trafo:
                 self.stroke_trafo = [] + sk2const.NORMAL_TRAFO
@@ -587,7 +785,8 @@ class PrimitiveObject(SelectableObject):
         self.cache_bbox = libgeom.get_cpath_bbox(self.cache_cpath)
 
     def apply_trafo(self, trafo):
-        self.cache_cpath = libgeom.apply_trafo(self.cache_cpath, trafo)
+        # cpath is copied on write so trafo snapshots can share it
+        self.cache_cpath = libgeom.apply_trafo(self.cache_cpath, trafo, True)
         self.trafo = libgeom.multiply_trafo(self.trafo, trafo)
         if self.fill_trafo:
             self.fill_trafo = libgeom.multiply_trafo(self.fill_trafo, trafo)
@@ -599,9 +798,8 @@ class PrimitiveObject(SelectableObject):
         self.update_bbox()
 
     def get_trafo_snapshot(self):
-        return (self, [] + self.trafo, [] + self.fill_trafo,
-                [] + self.stroke_trafo, [] + self.cache_bbox,
-                libgeom.copy_cpath(self.cache_cpath))
+        return (self, self.trafo, self.fill_trafo, self.stroke_trafo,
+                self.cache_bbox, self.cache_cpath)
 
     def set_trafo_snapshot(self, snapshot):
         self.trafo, self.fill_trafo, self.stroke_trafo = snapshot[1:4]
@@ -952,6 +1150,8 @@ class Text(PrimitiveObject):
     cache_layout_data = ()
     cache_layout_bbox = []
     cache_clusters = []
+    # cache_cpath is list of glyph cpaths, average glyph outline size
+    cache_nodes = 30
     is_text = True
 
     def __init__(self, config, parent=None,
@@ -1062,6 +1262,7 @@ class Text(PrimitiveObject):
                     libgeom.apply_trafo(item, self.trafos[index])
             index += 1
         self.update_bbox()
+        self.update_fill()
 
     def update_bbox(self):
         self.cache_bbox = []
@@ -1086,13 +1287,16 @@ class Text(PrimitiveObject):
             index += 1
 
     def apply_trafo(self, trafo):
+        trafos = {}
         for i in self.trafos.keys():
-            self.trafos[i] = libgeom.multiply_trafo(self.trafos[i], trafo)
-        for i in range(len(self.cache_cpath)):
-            if self.cache_cpath[i] is None:
-                continue
-            self.cache_cpath[i] = libgeom.apply_trafo(self.cache_cpath[i],
-                                                      trafo)
+            trafos[i] = libgeom.multiply_trafo(self.trafos[i], trafo)
+        self.trafos = trafos
+        cpaths = []
+        for item in self.cache_cpath:
+            if item is not None:
+                item = libgeom.apply_trafo(item, trafo, True)
+            cpaths.append(item)
+        self.cache_cpath = cpaths
         self.trafo = libgeom.multiply_trafo(self.trafo, trafo)
         if self.fill_trafo:
             self.fill_trafo = libgeom.multiply_trafo(self.fill_trafo, trafo)
@@ -1101,15 +1305,8 @@ class Text(PrimitiveObject):
         self.update_bbox()
 
     def get_trafo_snapshot(self):
-        cpaths = []
-        for i in range(len(self.cache_cpath)):
-            if self.cache_cpath[i] is None:
-                cpaths.append(None)
-            else:
-                cpaths.append(libgeom.copy_cpath(self.cache_cpath[i]))
-        trafos = deepcopy(self.trafos)
-        return (self, [] + self.trafo, [] + self.fill_trafo,
-                [] + self.stroke_trafo, [] + self.cache_bbox, cpaths, trafos)
+        return (self, self.trafo, self.fill_trafo, self.stroke_trafo,
+                self.cache_bbox, self.cache_cpath, self.trafos)
 
     def set_trafo_snapshot(self, snapshot):
         self.trafo, self.fill_trafo, self.stroke_trafo = snapshot[1:4]
@@ -1208,6 +1405,11 @@ class Pixmap(PrimitiveObject):
         h_dpi = int(round(uc2const.in_to_pt / m22))
         return h_dpi, v_dpi
 
+    def destroy(self):
+        if self.handler is not None:
+            self.handler.destroy()
+        PrimitiveObject.destroy(self)
+
     def update(self):
         PrimitiveObject.update(self)
 
@@ -1232,7 +1434,10 @@ CID_TO_CLASS = {
     GRID_LAYER: GridLayer, GUIDE_LAYER: GuideLayer,
     DESKTOP_LAYERS: DesktopLayers, GUIDE: Guide,
 
+    SYMBOLS: Symbols, SYMBOL: Symbol,
+
     GROUP: Group, TP_GROUP: TP_Group, CONTAINER: Container,
+    INSTANCE: Instance,
 
     RECTANGLE: Rectangle, CIRCLE: Circle,
     POLYGON: Polygon, CURVE: Curve, PIXMAP: Pixmap,
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Parser for SK2 document lines.
+
+SK2 document body consists of three kinds of lines:
+
+    obj('tag')
+    set_field('name',<python literal>)
+    obj_end()
+
+Field values are produced by str() of python objects (numbers, strings,
+None/True/False, lists, tuples and dicts) so parser recognizes exactly
+this subset of python literal syntax. Lists of numbers are decoded by
+C-coded JSON scanner, other values are tokenized by single precompiled
+regular expression.
+"""
+
+import json
+import marshal
+import re
+
+OBJ = 0
+SET_FIELD = 1
+OBJ_END = 2
+
+OBJ_PREFIX = "obj('"
+FIELD_PREFIX = "set_field('"
+OBJ_END_LINE = 'obj_end()'
+
+TOKEN_RE = re.compile(r"""
+    \s*(?:
+    (?P<num>-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?[lL]?)|
+    (?P<str>[uUbB]?(?:'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"))|
+    (?P<name>None|True|False)|
+    (?P<op>[\[\](){}:,])
+    )""", re.VERBOSE | re.DOTALL)
+
+JSON_UNSAFE_RE = re.compile(r'[\'"(){}lL]')
+JSON_DECODE = json.JSONDecoder().decode
+
+NAMES = {'None': None, 'True': True, 'False': False}
+CLOSING = {'[': ']', '(': ')', '{': '}'}
+NO_KEY = object()
+
+CACHE_SIZE = 4096
+CACHE_ITEM_LIMIT = 1024
+VALUE_CACHE = {}
+
+
+class SK2ParsingError(ValueError):
+    pass
+
+
+def _num(token):
+    if token[-1] in 'lL':
+        return long(token[:-1])
+    if '.' in token or 'e' in token or 'E' in token:
+        return float(token)
+    return int(token)
+
+
+def _str(token):
+    prefix = token[0]
+    if prefix in 'uU':
+        return token[2:-1].decode('unicode_escape')
+    if prefix in 'bB':
+        token = token[1:]
+    body = token[1:-1]
+    if '\\' in body:
+        return body.decode('string_escape')
+    return body
+
+
+def _parse(string):
+    stack = []
+    current = None
+    key = NO_KEY
+    keys = []
+    pos = 0
+    size = len(string.rstrip())
+    while pos < size:
+        m = TOKEN_RE.match(string, pos)
+        if m is None:
+            raise SK2ParsingError('Unexpected symbol at %d in %s' %
+                                  (pos, string))
+        pos = m.end()
+        kind = m.lastgroup
+        token = m.group(kind)
+        if kind == 'op':
+            if token in CLOSING:
+                stack.append((current, key))
+                current = {} if token == '{' else []
+                keys.append(token)
+                key = NO_KEY
+                continue
+            elif token == ',':
+                if keys and keys[-1] == '(':
+                    keys[-1] = '(,'
+                continue
+            elif token == ':':
+                continue
+            if not keys or CLOSING[keys[-1][0]] != token:
+                raise SK2ParsingError('Unexpected "%s" in %s' % (token, string))
+            opening = keys.pop()
+            value = current
+            if opening == '(':
+                value = value[0] if len(value) == 1 else tuple(value)
+            elif opening == '(,':
+                value = tuple(value)
+            current, key = stack.pop()
+        elif kind == 'num':
+            value = _num(token)
+        elif kind == 'str':
+            value = _str(token)
+        else:
+            value = NAMES[token]
+
+        if current is None:
+            if pos < size:
+                raise SK2ParsingError('Extra symbols in %s' % string)
+            return value
+        elif keys[-1] == '{':
+            if key is NO_KEY:
+                key = value
+                continue
+            current[key] = value
+            key = NO_KEY
+        else:
+            current.append(value)
+    raise SK2ParsingError('Unexpected end of line in %s' % string)
+
+
+def parse_value(string):
+    """
+    Converts python literal string to value.
+    Lists of numbers (the most part of SK2 data) are decoded by C-coded
+    JSON scanner, other values by regex based tokenizer. Short values
+    are memoized in marshalled form because styles and other compound
+    values are usually repeated across document objects.
+    """
+    if string in NAMES:
+        return NAMES[string]
+    first = string[:1]
+    if first.isdigit() or first == '-':
+        try:
+            return int(string)
+        except ValueError:
+            try:
+                return float(string)
+            except ValueError:
+                pass
+    elif first == '[' and not JSON_UNSAFE_RE.search(string):
+        if 'N' in string or 'T' in string or 'F' in string:
+            string = string.replace('None', 'null').replace(
+                'True', 'true').replace('False', 'false')
+        try:
+            return JSON_DECODE(string)
+        except ValueError:
+            pass
+    elif first == "'" and "\\" not in string \
+            and string.find("'", 1) == len(string) - 1:
+        return string[1:-1]
+
+    if len(string) > CACHE_ITEM_LIMIT:
+        return _parse(string)
+    cached = VALUE_CACHE.get(string)
+    if cached is not None:
+        return marshal.loads(cached)
+    value = _parse(string)
+    if len(VALUE_CACHE) >= CACHE_SIZE:
+        VALUE_CACHE.clear()
+    VALUE_CACHE[string] = marshal.dumps(value)
+    return value
+
+
+def parse_line(line):
+    """
+    Parses SK2 document line. Returns (OBJ, tag), (SET_FIELD, (name, value))
+    or (OBJ_END, None). Returns None for unknown lines.
+    """
+    if line.startswith(FIELD_PREFIX):
+        index = line.find("',", len(FIELD_PREFIX))
+        if index > 0 and line[-1] == ')':
+            item = line[len(FIELD_PREFIX):index]
+            return SET_FIELD, (item, parse_value(line[index + 2:-1]))
+    elif line == OBJ_END_LINE:
+        return OBJ_END, None
+    elif line.startswith(OBJ_PREFIX) and line.endswith("')"):
+        return OBJ, line[len(OBJ_PREFIX):-2]
+    return None
@@ -16,9 +16,7 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
-from uc2.formats.skp.skp_const import SKP_ID
 from uc2.formats.skp.skp_presenter import SKP_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -45,10 +43,3 @@ def skp_saver(doc, filename=None, fileptr=None, translate=True,
         skp_doc.close()
     else:
         doc.save(filename, fileptr)
-
-
-def check_skp(path):
-    fileptr = get_fileptr(path)
-    string = fileptr.read(len(SKP_ID))
-    fileptr.close()
-    return string == SKP_ID
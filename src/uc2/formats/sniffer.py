@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+File format detection by file content.
+
+File is opened (and memory mapped) only once. Format checkers work on
+shared header buffer: cheap magic byte tests go first and heavier
+checks (zip directory, XML parsing, PIL) are invoked for candidates
+only. Format packages don't provide own checkers, signatures are
+defined here only to avoid importing all format filters during
+detection.
+"""
+
+import logging
+import mmap
+import os
+import zipfile
+from cStringIO import StringIO
+from xml.etree import cElementTree
+
+from uc2 import _, uc2const
+from uc2.sk2const import SK2DOC_ID, SK2XML_ID, SK2VER
+from uc2.utils import fsutils
+from uc2.utils.fs import get_file_extension
+
+LOG = logging.getLogger(__name__)
+
+HEADER_SIZE = 64 * 1024
+TEXT_LINES = 20
+
+CONFIDENCE_MAGIC = 90
+CONFIDENCE_CONTENT = 70
+CONFIDENCE_WEAK = 40
+CONFIDENCE_FALLBACK = 10
+EXTENSION_BONUS = 5
+
+XML_BOMS = ('\xef\xbb\xbf', '\xff\xfe', '\xfe\xff')
+
+IMAGE_MAGIC = (
+    (uc2const.PNG, ('\x89PNG\r\n\x1a\n',), CONFIDENCE_MAGIC),
+    (uc2const.JPG, ('\xff\xd8\xff',), CONFIDENCE_MAGIC),
+    (uc2const.GIF, ('GIF87a', 'GIF89a'), CONFIDENCE_MAGIC),
+    (uc2const.TIF, ('II*\x00', 'MM\x00*'), CONFIDENCE_MAGIC),
+    (uc2const.PSD, ('8BPS',), CONFIDENCE_MAGIC),
+    (uc2const.XCF, ('gimp xcf',), CONFIDENCE_MAGIC),
+    (uc2const.JP2, ('\x00\x00\x00\x0cjP  \r\n\x87\n', '\xff\x4f\xff\x51'),
+     CONFIDENCE_MAGIC),
+    (uc2const.XPM, ('/* XPM */',), CONFIDENCE_MAGIC),
+    (uc2const.BMP, ('BM',), CONFIDENCE_WEAK),
+    (uc2const.PPM, ('P1', 'P2', 'P3', 'P4', 'P5', 'P6'), CONFIDENCE_WEAK),
+)
+
+PIL_FORMATS = {
+    'PNG': uc2const.PNG, 'JPEG': uc2const.JPG, 'GIF': uc2const.GIF,
+    'TIFF': uc2const.TIF, 'PSD': uc2const.PSD, 'JPEG2000': uc2const.JP2,
+    'XPM': uc2const.XPM, 'BMP': uc2const.BMP, 'PPM': uc2const.PPM,
+    'PCX': uc2const.PCX, 'XBM': uc2const.XBM, 'WEBP': uc2const.WEBP,
+}
+
+
+class MappedFile(object):
+    """
+    Minimal file-like wrapper of mmap object for zipfile module.
+    """
+    mapped = None
+
+    def __init__(self, mapped):
+        self.mapped = mapped
+        self.mapped.seek(0)
+
+    def read(self, size=-1):
+        if size < 0:
+            size = self.mapped.size() - self.mapped.tell()
+        return self.mapped.read(size)
+
+    def seek(self, offset, whence=0):
+        self.mapped.seek(offset, whence)
+
+    def tell(self):
+        return self.mapped.tell()
+
+
+class FileData(object):
+    """
+    Shared file content for format checkers.
+    """
+    path = ''
+    size = 0
+    header = ''
+    mapped = None
+    lines = None
+
+    def __init__(self, path):
+        self.path = path
+        fileptr = fsutils.get_fileptr(path)
+        try:
+            self.size = os.fstat(fileptr.fileno()).st_size
+            if self.size:
+                self.mapped = mmap.mmap(fileptr.fileno(), 0,
+                                        access=mmap.ACCESS_READ)
+                self.header = self.mapped[:HEADER_SIZE]
+        finally:
+            fileptr.close()
+
+    def close(self):
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+
+    def startswith(self, *signatures):
+        for item in signatures:
+            if self.header.startswith(item):
+                return True
+        return False
+
+    def get_lines(self):
+        if self.lines is None:
+            self.lines = StringIO(self.header).readlines()[:TEXT_LINES]
+        return self.lines
+
+    def find_in_lines(self, *tags):
+        for line in self.get_lines():
+            for tag in tags:
+                if tag in line:
+                    return True
+        return False
+
+    def is_xml(self):
+        header = self.header[:1024]
+        for bom in XML_BOMS:
+            if header.startswith(bom):
+                header = header[len(bom):]
+                break
+        return header.lstrip().startswith('<')
+
+    def get_zip_names(self):
+        if self.mapped is None or not self.startswith('PK\x03\x04'):
+            return []
+        try:
+            return zipfile.ZipFile(MappedFile(self.mapped), 'r').namelist()
+        except (zipfile.BadZipfile, IOError, ValueError):
+            return []
+
+
+def _get_sk2_version(string, prefix):
+    try:
+        return int(string[len(prefix):])
+    except ValueError:
+        return None
+
+
+def check_sk2(data):
+    lines = data.get_lines()
+    line = lines[0] if lines else ''
+    if line.startswith(SK2DOC_ID):
+        version = _get_sk2_version(line, SK2DOC_ID)
+    elif len(lines) > 1 and lines[1].startswith(SK2XML_ID):
+        version = _get_sk2_version(lines[1].split('-->')[0], SK2XML_ID)
+    else:
+        return 0
+    if version is None:
+        return 0
+    if version > int(SK2VER):
+        raise RuntimeError(_('Newer version of SK2 format is found!'))
+    return CONFIDENCE_MAGIC
+
+
+def check_svg(data):
+    if not data.is_xml():
+        return 0
+    # root element can follow long comments or DOCTYPE, so whole
+    # file is parsed (up to root element) if header has no <svg tag
+    if '<svg' in data.header:
+        source = StringIO(data.header)
+    else:
+        source = MappedFile(data.mapped)
+    tag = None
+    try:
+        for event, el in cElementTree.iterparse(source, ('start',)):
+            tag = el.tag
+            break
+    except cElementTree.ParseError:
+        pass
+    if tag in ('{http://www.w3.org/2000/svg}svg', 'svg'):
+        return CONFIDENCE_CONTENT
+    return 0
+
+
+def check_wmf(data):
+    if data.startswith('\xd7\xcd\xc6\x9a'):
+        return CONFIDENCE_MAGIC
+    header = data.header
+    if header[:2] in ('\x01\x00', '\x02\x00') and \
+            header[4:6] in ('\x00\x01', '\x00\x03'):
+        return CONFIDENCE_WEAK
+    return 0
+
+
+def check_cdr(data):
+    if data.startswith('RIFF') and data.header[8:12] in (
+            'CDR6', 'CDR7', 'CDR8', 'CDR9', 'CDRA', 'CDRB', 'CDRC', 'CDRD'):
+        return CONFIDENCE_MAGIC
+    return 0
+
+
+def check_riff(data):
+    return CONFIDENCE_WEAK if data.startswith('RIFF') else 0
+
+
+def check_cdrz(data):
+    if 'content/riffData.cdr' in data.get_zip_names():
+        return CONFIDENCE_MAGIC
+    return 0
+
+
+def check_cgm(data):
+    header = data.header
+    if len(header) > 1 and not ord(header[0]) and \
+            ord(header[1]) & 0xe0 == 0x20:
+        return CONFIDENCE_WEAK
+    return 0
+
+
+def check_md(data):
+    return CONFIDENCE_WEAK if '.md' in data.path else 0
+
+
+def check_xml_(data):
+    if data.is_xml() and data.find_in_lines('<?xml '):
+        return CONFIDENCE_WEAK
+    return 0
+
+
+def check_webp(data):
+    if data.startswith('RIFF') and data.header[8:12] == 'WEBP':
+        return CONFIDENCE_MAGIC
+    return 0
+
+
+def _check_magic(signatures, confidence=CONFIDENCE_MAGIC):
+    def checker(data):
+        return confidence if data.startswith(*signatures) else 0
+
+    return checker
+
+
+def _check_xml_tags(*tags):
+    def checker(data):
+        if data.is_xml() and data.find_in_lines(*tags):
+            return CONFIDENCE_CONTENT
+        return 0
+
+    return checker
+
+
+CHECKERS = {
+    uc2const.SK2: check_sk2,
+    uc2const.SVG: check_svg,
+    uc2const.WMF: check_wmf,
+    uc2const.PLT: _check_magic(('IN;',)),
+    uc2const.SK1: _check_magic(('##sK1 1',)),
+    uc2const.SK: _check_magic(('##Sketch 1 ',)),
+    uc2const.CDR: check_cdr,
+    uc2const.FIG: _check_magic(('#FIG 3',)),
+    uc2const.CGM: check_cgm,
+    uc2const.WEBP: check_webp,
+
+    uc2const.SKP: _check_magic(('##sK1 palette',)),
+    uc2const.GPL: _check_magic(('GIMP Palette',)),
+    uc2const.SCRIBUS_PAL: _check_xml_tags('SCRIBUSCOLORS'),
+    uc2const.SOC: _check_xml_tags('office:color-table', 'ooo:color-table'),
+    uc2const.CPL: _check_magic(('\xcd\xdd', '\xdd\xdc', '\xcd\xbc',
+                                '\xcd\xdc', '\xdc\xdc', '\xcc\xdc',
+                                '\xcc\xbc'), CONFIDENCE_WEAK),
+    uc2const.COREL_PAL: _check_xml_tags('<palette'),
+    uc2const.ASE: _check_magic(('ASEF',)),
+    uc2const.ACO: _check_magic(('\x00\x01', '\x00\x02'), CONFIDENCE_WEAK),
+    uc2const.JCW: _check_magic(('JCW',)),
+
+    uc2const.MD: check_md,
+    uc2const.RIFF: check_riff,
+    uc2const.CDRZ: check_cdrz,
+    uc2const.XML: check_xml_,
+}
+
+for _pid, _signatures, _confidence in IMAGE_MAGIC:
+    CHECKERS[_pid] = _check_magic(_signatures, _confidence)
+
+
+def check_image(data):
+    """
+    Heavy fallback check for bitmaps without known magic bytes.
+    PIL reads image header only, ImageMagick needs whole file.
+    Returns bitmap format id or None.
+    """
+    from PIL import Image
+    try:
+        image = Image.open(StringIO(data.header))
+        return PIL_FORMATS.get(image.format, uc2const.JPG)
+    except Exception:
+        pass
+    from uc2.libimg import magickwand
+    try:
+        if magickwand.check_image_file(data.path):
+            return uc2const.JPG
+    except Exception:
+        LOG.debug('MagickWand check failed for %s', data.path)
+    return None
+
+
+def detect_formats(path, formats=None, fallback=True):
+    """
+    Returns list of (format id, confidence) tuples for provided file
+    sorted by confidence. Formats with file extension matched get
+    small bonus. If no format is detected and fallback flag is set,
+    bitmap check by PIL/ImageMagick is performed.
+    """
+    formats = formats or uc2const.LOADER_FORMATS
+    ext = get_file_extension(path)
+    result = []
+    data = FileData(path)
+    try:
+        for index, pid in enumerate(formats):
+            checker = CHECKERS.get(pid)
+            if checker is None:
+                continue
+            confidence = checker(data)
+            if confidence:
+                if ext in uc2const.FORMAT_EXTENSION[pid]:
+                    confidence += EXTENSION_BONUS
+                result.append((-confidence, index, pid))
+        if not result and fallback and data.size:
+            pid = check_image(data)
+            if pid is not None:
+                result.append((-CONFIDENCE_FALLBACK, 0, pid))
+    finally:
+        data.close()
+    result.sort()
+    return [(pid, -confidence) for confidence, index, pid in result]
@@ -17,9 +17,7 @@
 
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
 from uc2.formats.skp.skp_presenter import SKP_Presenter
-from uc2.formats.soc.soc_const import SOC_PAL_TAG, SOC_PAL_OO_TAG
 from uc2.formats.soc.soc_presenter import SOC_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -63,20 +61,3 @@ def soc_saver(doc, filename=None, fileptr=None, translate=True,
         soc_doc.close()
     else:
         doc.save(filename, fileptr)
-
-
-def check_soc(path):
-    fileptr = get_fileptr(path)
-    ret = False
-    i = 0
-    while i < 20:
-        line = fileptr.readline()
-        if not line.find(SOC_PAL_TAG) == -1:
-            ret = True
-            break
-        if not line.find(SOC_PAL_OO_TAG) == -1:
-            ret = True
-            break
-        i += 1
-    fileptr.close()
-    return ret
@@ -15,25 +15,43 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from xml.etree import cElementTree
+import os
 
 from uc2 import uc2const
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
 from uc2.formats.svg.svg_presenter import SVG_Presenter
 from uc2.utils.mixutils import merge_cnf
-from uc2.utils.fsutils import get_fileptr
+from uc2.utils.fsutils import get_sys_path
+
+
+def get_file_size(filename=None, fileptr=None):
+    if filename:
+        return os.path.getsize(get_sys_path(filename))
+    elif fileptr:
+        fileptr.seek(0, 2)
+        size = fileptr.tell()
+        fileptr.seek(0)
+        return size
+    return 0
 
 
 def svg_loader(appdata, filename=None, fileptr=None,
                translate=True, cnf=None, **kw):
     cnf = merge_cnf(cnf, kw)
     svg_doc = SVG_Presenter(appdata, cnf)
-    svg_doc.load(filename, fileptr)
+    stream_size = svg_doc.config.stream_size * 1024 * 1024
+    stream = translate and \
+        0 <= stream_size <= get_file_size(filename, fileptr)
+    if not stream:
+        svg_doc.load(filename, fileptr)
     if translate:
         sk2_doc = SK2_Presenter(appdata, cnf)
         if filename:
             sk2_doc.doc_file = filename
-        svg_doc.translate_to_sk2(sk2_doc)
+        if stream:
+            svg_doc.load_to_sk2(sk2_doc, filename, fileptr)
+        else:
+            svg_doc.translate_to_sk2(sk2_doc)
         svg_doc.close()
         return sk2_doc
     return svg_doc
@@ -51,17 +69,3 @@ def svg_saver(sk2_doc, filename=None, fileptr=None,
         svg_doc.close()
     else:
         sk2_doc.save(filename, fileptr)
-
-
-def check_svg(path):
-    tag = None
-    fileptr = get_fileptr(path)
-    try:
-        for event, el in cElementTree.iterparse(fileptr, ('start',)):
-            tag = el.tag
-            break
-    except cElementTree.ParseError:
-        pass
-    finally:
-        fileptr.close()
-    return tag == '{http://www.w3.org/2000/svg}svg' or tag == 'svg'
@@ -24,3 +24,8 @@ class SVG_Config(XmlConfigParser):
     indent = '\t'
     filename = 'svg_config.xml'
     svg_dpi = 0.0
+    # files larger than stream_size (in MB) are translated while parsing,
+    # negative value disables streaming import
+    stream_size = 16.0
+    # referenced objects of <use> elements are imported as symbols
+    use_symbols = True
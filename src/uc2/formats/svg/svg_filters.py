@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import re
+
+from uc2.formats.generic_filters import AbstractXMLLoader
+from uc2.formats.svg.svg_translators import SVG_Stream_Translator
+from uc2.formats.svg.svg_utils import URL_REF_PATTERN
+from uc2.formats.xml_.xml_model import XMLObject, XmlContentText
+
+# Objects which can be referenced by other objects
+BUFFERED_TAGS = ('defs', 'clipPath', 'linearGradient', 'radialGradient',
+                 'pattern', 'symbol', 'style', 'sodipodi:namedview')
+
+REF_PATTERN = re.compile(r'href\s*=\s*["\']#([^"\']+)')
+SCAN_CHUNK = 1024 * 1024
+SCAN_OVERLAP = 256
+
+
+def collect_refs(fileptr):
+    """
+    Returns set of object ids referenced by href attributes
+    and url(#id) values. File is scanned as raw text,
+    without XML parsing.
+    """
+    refs = set()
+    tail = ''
+    while True:
+        data = fileptr.read(SCAN_CHUNK)
+        if not data:
+            break
+        data = tail + data
+        refs.update(REF_PATTERN.findall(data))
+        refs.update(URL_REF_PATTERN.findall(data))
+        tail = data[-SCAN_OVERLAP:]
+    fileptr.seek(0)
+    return refs
+
+
+class SVG_Stream_Loader(AbstractXMLLoader):
+    """
+    Translates SVG file into SK2 document while parsing, without
+    intermediate XML model. Top level objects (and objects of top level
+    layers) are translated on closing tag and released. Only definitions
+    (gradients, clip paths, styles etc.) and objects referenced by
+    href attributes or url(#id) values are kept till the end of loading.
+    """
+    name = 'SVG_Stream_Loader'
+
+    sk2_doc = None
+    translator = None
+    refs = None
+    stack = []
+    transient = []
+    buffered = 0
+    level = None
+    level_trafo = None
+    level_style = None
+
+    def __init__(self, sk2_doc):
+        AbstractXMLLoader.__init__(self)
+        self.sk2_doc = sk2_doc
+
+    def do_load(self):
+        self.stack = []
+        self.transient = []
+        self.buffered = 0
+        self.level = None
+        self.refs = collect_refs(self.fileptr)
+        self.translator = SVG_Stream_Translator()
+        self.start_parsing()
+        self.translator.finish_translation()
+        self.refs = self.translator = None
+
+    def is_level(self, obj):
+        return obj is self.model or obj is self.level
+
+    def is_layer(self, obj):
+        return obj.tag == 'g' and \
+            obj.attrs.get('inkscape:groupmode') == 'layer' and \
+            obj.attrs.get('display') != 'none' and \
+            obj.attrs.get('id') not in self.refs
+
+    def start_element(self, name, attrs):
+        obj = XMLObject(name)
+        for item in attrs._attrs.keys():
+            obj.attrs[item] = attrs._attrs[item].strip()
+
+        if not self.stack:
+            obj.id_map = {}
+            self.model = self.presenter.model = obj
+            self.presenter.methods.update()
+            self.translator.init_translation(self.presenter, self.sk2_doc)
+            self.stack.append(obj)
+            return
+
+        if name in BUFFERED_TAGS:
+            self.buffered += 1
+        obj_id = obj.attrs.get('id')
+        if obj_id:
+            self.model.id_map[obj_id] = obj
+            if not self.buffered and obj_id not in self.refs:
+                self.transient.append(obj_id)
+
+        parent = self.stack[-1]
+        if parent is self.model and self.is_layer(obj):
+            self.level = obj
+            self.level_trafo, self.level_style = \
+                self.translator.start_stream_layer(obj)
+        elif not self.is_level(parent):
+            parent.childs.append(obj)
+        self.stack.append(obj)
+
+    def element_data(self, data):
+        if self.stack and not self.is_level(self.stack[-1]):
+            self.stack[-1].childs.append(XmlContentText(data))
+
+    def end_element(self, name):
+        if not self.stack or not self.stack[-1].tag == name:
+            return
+        obj = self.stack.pop()
+        if name in BUFFERED_TAGS:
+            self.buffered -= 1
+        if not self.stack:
+            return
+
+        parent = self.stack[-1]
+        if obj is self.level:
+            self.translator.close_layer()
+            self.level = None
+        elif parent is self.model:
+            self.translator.translate_top_obj(obj)
+            self.release(obj)
+        elif parent is self.level:
+            self.translator.translate_stream_obj(
+                self.translator.layer, obj, self.level_trafo, self.level_style)
+            self.release(obj)
+
+    def release(self, obj):
+        if obj.tag == 'sodipodi:namedview':
+            # required for document units detection
+            self.model.childs.append(obj)
+        for obj_id in self.transient:
+            self.model.id_map.pop(obj_id, None)
+        self.transient = []
+        self.check_loading()
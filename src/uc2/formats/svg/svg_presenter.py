@@ -20,6 +20,7 @@ import os
 from uc2 import uc2const
 from uc2.formats.generic import TaggedModelPresenter
 from uc2.formats.svg.svg_config import SVG_Config
+from uc2.formats.svg.svg_filters import SVG_Stream_Loader
 from uc2.formats.svg.svg_methods import SVG_Methods, create_new_svg
 from uc2.formats.svg.svg_translators import SK2_to_SVG_Translator
 from uc2.formats.svg.svg_translators import SVG_to_SK2_Translator
@@ -65,3 +66,13 @@ class SVG_Presenter(TaggedModelPresenter):
     def translate_to_sk2(self, sk2_doc):
         translator = SVG_to_SK2_Translator()
         translator.translate(self, sk2_doc)
+
+    def load_to_sk2(self, sk2_doc, filename=None, fileptr=None):
+        """
+        Loads SVG file translating objects into SK2 document while parsing.
+        """
+        self.loader = SVG_Stream_Loader(sk2_doc)
+        try:
+            self.load(filename, fileptr)
+        finally:
+            self.loader = Advanced_XML_Loader()
@@ -28,7 +28,7 @@ from uc2.formats.sk2 import sk2_model
 from uc2.formats.svg import svg_const, svg_utils
 from uc2.formats.svg.svg_utils import get_svg_trafo, check_svg_attr, \
     parse_svg_points, parse_svg_coords, parse_svg_color, parse_svg_stops, \
-    get_svg_level_trafo
+    get_svg_level_trafo, get_svg_refs
 
 LOG = logging.getLogger(__name__)
 
@@ -45,6 +45,9 @@ SK2_UNITS = {
 
 FONT_COEFF = 0.938
 
+# symbol content is y-flipped like page content on SVG export
+SYMBOL_TRAFO = [1.0, 0.0, 0.0, -1.0, 0.0, 0.0]
+
 SK2_FILL_RULE = {
     'nonzero': sk2const.FILL_NONZERO,
     'evenodd': sk2const.FILL_EVENODD,
@@ -86,6 +89,7 @@ class SVG_to_SK2_Translator(object):
     profiles = {}
     unit_mapping = None
     current_color = ''
+    symbols = {}
     svg_doc = None
     sk2_doc = None
     svg_mt = None
@@ -95,6 +99,12 @@ class SVG_to_SK2_Translator(object):
     id_map = None
 
     def translate(self, svg_doc, sk2_doc):
+        self.init_translation(svg_doc, sk2_doc)
+        for item in self.svg_mt.childs:
+            self.translate_top_obj(item)
+        self.finish_translation()
+
+    def init_translation(self, svg_doc, sk2_doc):
         self.svg_doc = svg_doc
         self.sk2_doc = sk2_doc
         self.svg_mt = svg_doc.model
@@ -104,13 +114,17 @@ class SVG_to_SK2_Translator(object):
         self.classes = {}
         self.id_map = self.svg_mt.id_map
         self.profiles = {}
+        self.symbols = {}
         self.current_color = ''
         self.define_units()
-        self.translate_units()
         self.translate_page()
-        for item in self.svg_mt.childs:
-            style = self.get_level_style(self.svg_mt, svg_const.SVG_STYLE)
-            self.translate_obj(self.layer, item, self.trafo, style)
+
+    def translate_top_obj(self, svg_obj):
+        style = self.get_level_style(self.svg_mt, svg_const.SVG_STYLE)
+        self.translate_obj(self.layer, svg_obj, self.trafo, style)
+
+    def finish_translation(self):
+        self.translate_units()
         if len(self.page.childs) > 1 and not self.layer.childs:
             self.page.childs.remove(self.layer)
         self.sk2_mt.do_update()
@@ -682,21 +696,10 @@ class SVG_to_SK2_Translator(object):
 
         if 'inkscape:groupmode' in svg_obj.attrs:
             if svg_obj.attrs['inkscape:groupmode'] == 'layer':
-                name = 'Layer %d' % len(self.page.childs)
-                if 'inkscape:label' in svg_obj.attrs:
-                    name = svg_obj.attrs['inkscape:label']
-                if not self.layer.childs:
-                    self.page.childs.remove(self.layer)
-                self.layer = sk2_model.Layer(self.page.config, self.page, name)
-                self.page.childs.append(self.layer)
-                if check_svg_attr(svg_obj, 'sodipodi:insensitive', 'true'):
-                    self.layer.properties[1] = 0
-                if 'display' in stl and stl['display'] == 'none':
-                    self.layer.properties[0] = 0
+                self.start_layer(svg_obj, stl)
                 for item in svg_obj.childs:
                     self.translate_obj(self.layer, item, tr, stl)
-                self.layer = sk2_model.Layer(self.page.config, self.page)
-                self.page.childs.append(self.layer)
+                self.close_layer()
                 return
 
         elif 'clip-path' in svg_obj.attrs:
@@ -724,6 +727,23 @@ class SVG_to_SK2_Translator(object):
             else:
                 parent.childs.append(group)
 
+    def start_layer(self, svg_obj, style):
+        name = 'Layer %d' % len(self.page.childs)
+        if 'inkscape:label' in svg_obj.attrs:
+            name = svg_obj.attrs['inkscape:label']
+        if not self.layer.childs:
+            self.page.childs.remove(self.layer)
+        self.layer = sk2_model.Layer(self.page.config, self.page, name)
+        self.page.childs.append(self.layer)
+        if check_svg_attr(svg_obj, 'sodipodi:insensitive', 'true'):
+            self.layer.properties[1] = 0
+        if 'display' in style and style['display'] == 'none':
+            self.layer.properties[0] = 0
+
+    def close_layer(self):
+        self.layer = sk2_model.Layer(self.page.config, self.page)
+        self.page.childs.append(self.layer)
+
     def translate_unknown(self, parent, svg_obj, trafo, style):
         group = sk2_model.Group(parent.config, parent)
         tr = get_svg_level_trafo(svg_obj, trafo)
@@ -978,10 +998,30 @@ class SVG_to_SK2_Translator(object):
         stl = self.get_level_style(svg_obj, style)
         if 'xlink:href' in svg_obj.attrs:
             obj_id = svg_obj.attrs['xlink:href'][1:]
-            if obj_id in self.id_map:
-                self.translate_obj(parent, self.id_map[obj_id], tr, stl)
-            else:
+            if obj_id not in self.id_map:
                 LOG.warn('<use> object id %s is not found', obj_id)
+            elif self.svg_doc.config.use_symbols:
+                self.translate_instance(parent, obj_id, tr, stl)
+            else:
+                self.translate_obj(parent, self.id_map[obj_id], tr, stl)
+
+    def translate_instance(self, parent, obj_id, trafo, style):
+        """
+        Referenced object is translated once into symbol in page
+        coordinates. Each <use> element is translated into instance.
+        """
+        key = (obj_id, self.current_color, repr(sorted(style.items())))
+        symbol = self.symbols.get(key)
+        if symbol is None:
+            symbols = self.sk2_mt.get_symbols_obj(True)
+            symbol = sk2_model.Symbol(parent.config, symbols, name=obj_id)
+            self.symbols[key] = symbol
+            self.translate_obj(symbol, self.id_map[obj_id], self.trafo, style)
+            symbols.childs.append(symbol)
+        tr = libgeom.multiply_trafo(libgeom.invert_trafo(self.trafo), trafo)
+        instance = sk2_model.Instance(parent.config, parent,
+                                      symbol.symbol_id, tr)
+        parent.childs.append(instance)
 
     def translate_text(self, parent, svg_obj, trafo, style):
         cfg = parent.config
@@ -1067,6 +1107,83 @@ class SVG_to_SK2_Translator(object):
             parent.childs.append(pixmap)
 
 
+class SVG_Stream_Translator(SVG_to_SK2_Translator):
+    """
+    Translator for objects which are passed one by one while SVG file
+    is parsed. Objects referencing (by href or url(#id), directly or
+    through definitions) objects which are not parsed yet are
+    translated into placeholders and resolved at the end of translation.
+    """
+    defer_refs = True
+    pending = []
+
+    def init_translation(self, svg_doc, sk2_doc):
+        SVG_to_SK2_Translator.init_translation(self, svg_doc, sk2_doc)
+        self.defer_refs = True
+        self.pending = []
+
+    def translate_top_obj(self, svg_obj):
+        style = self.get_level_style(self.svg_mt, svg_const.SVG_STYLE)
+        self.translate_stream_obj(self.layer, svg_obj, self.trafo, style)
+
+    def translate_stream_obj(self, parent, svg_obj, trafo, style):
+        if self.defer_refs and self.has_forward_refs(svg_obj):
+            placeholder = sk2_model.Group(parent.config, parent)
+            parent.childs.append(placeholder)
+            self.pending.append((placeholder, svg_obj, trafo, style))
+            return
+        self.translate_obj(parent, svg_obj, trafo, style)
+
+    def has_forward_refs(self, svg_obj, checked=None):
+        checked = set() if checked is None else checked
+        for obj_id in get_svg_refs(svg_obj):
+            if obj_id in checked:
+                continue
+            checked.add(obj_id)
+            if obj_id not in self.id_map or \
+                    self.has_forward_refs(self.id_map[obj_id], checked):
+                return True
+        for child in svg_obj.childs:
+            if self.has_forward_refs(child, checked):
+                return True
+        return False
+
+    def start_stream_layer(self, svg_obj):
+        style = self.get_level_style(self.svg_mt, svg_const.SVG_STYLE)
+        tr = get_svg_level_trafo(svg_obj, self.trafo)
+        stl = self.get_level_style(svg_obj, style)
+        self.start_layer(svg_obj, stl)
+        return tr, stl
+
+    def finish_translation(self):
+        self.translate_pending()
+        SVG_to_SK2_Translator.finish_translation(self)
+
+    def translate_pending(self):
+        self.defer_refs = False
+        if not self.pending:
+            return
+        placeholders = set()
+        for placeholder, svg_obj, trafo, style in self.pending:
+            self.translate_obj(placeholder, svg_obj, trafo, style)
+            placeholders.add(id(placeholder))
+        self.pending = []
+        self.replace_placeholders(self.sk2_mt, placeholders)
+
+    def replace_placeholders(self, obj, placeholders):
+        childs = []
+        for child in obj.childs:
+            if id(child) in placeholders:
+                for item in child.childs:
+                    item.parent = obj
+                childs += child.childs
+            else:
+                if child.childs:
+                    self.replace_placeholders(child, placeholders)
+                childs.append(child)
+        obj.childs = childs
+
+
 SVG_FILL_RULE = {
     sk2const.FILL_NONZERO: 'nonzero',
     sk2const.FILL_EVENODD: 'evenodd',
@@ -1097,6 +1214,7 @@ class SK2_to_SVG_Translator(object):
     defs_count = 0
     trafo = None
     defs = None
+    symbols = None
     svg_doc = None
     sk2_doc = None
     svg_mt = None
@@ -1112,6 +1230,7 @@ class SK2_to_SVG_Translator(object):
         self.sk2_mtds = sk2_doc.methods
         self.svg_mtds = svg_doc.methods
         self.defs_count = 0
+        self.symbols = {}
         svg_attrs = self.svg_mt.attrs
 
         self.trafo = [1.0, 0.0, 0.0, -1.0, 0.0, 0.0]
@@ -1143,6 +1262,7 @@ class SK2_to_SVG_Translator(object):
         else:
             self.svg_mt.childs.remove(self.defs)
         self.add_spacer(self.svg_mt)
+        self.symbols = None
         self.svg_doc = None
         self.sk2_doc = None
         self.svg_mt = None
@@ -1173,6 +1293,8 @@ class SK2_to_SVG_Translator(object):
         for source_obj in source_objs:
             if source_obj.is_layer:
                 self.translate_layer(dest_parent, source_obj)
+            elif source_obj.is_instance:
+                self.translate_instance(dest_parent, source_obj)
             elif source_obj.is_group:
                 self.translate_group(dest_parent, source_obj)
             elif source_obj.is_pixmap:
@@ -1234,6 +1356,41 @@ class SK2_to_SVG_Translator(object):
             self.add_spacer(group)
             self.append_obj(dest_parent, group)
 
+    def translate_instance(self, dest_parent, source_obj):
+        symbol = source_obj.get_symbol()
+        if symbol is None:
+            return
+        symbol_id = self.symbols.get(symbol.symbol_id)
+        if symbol_id is None:
+            symbol_id = self.make_symbol(symbol)
+        trafo = libgeom.multiply_trafo(source_obj.trafo, self.trafo)
+        trafo = libgeom.multiply_trafo(SYMBOL_TRAFO, trafo)
+        use = svg_utils.create_xmlobj('use')
+        use.attrs['xlink:href'] = '#' + symbol_id
+        use.attrs['transform'] = 'matrix(%s)' % trafo.__str__()[1:-1]
+        self.append_obj(dest_parent, use)
+
+    def make_symbol(self, symbol):
+        """
+        Translates symbol content into defs group once. Instances
+        are referenced by use elements.
+        """
+        group = svg_utils.create_xmlobj('g')
+        group.attrs['id'] = 'symbol' + str(self.defs_count + 1)
+        self.defs_count += 1
+        self.symbols[symbol.symbol_id] = group.attrs['id']
+
+        lvl = self.indent_level
+        trafo = self.trafo
+        self.indent_level = 1
+        self.trafo = [] + SYMBOL_TRAFO
+        self.append_obj(self.defs, group)
+        self.translate_objs(group, symbol.childs)
+        self.add_spacer(group)
+        self.indent_level = lvl
+        self.trafo = trafo
+        return group.attrs['id']
+
     def make_clippath(self, source_obj):
         clippath = svg_utils.create_xmlobj('clipPath')
         clippath.attrs['clipPathUnits'] = 'userSpaceOnUse'
@@ -25,7 +25,13 @@ from uc2.formats.svg import svg_colors
 from uc2.formats.xml_.xml_model import XMLObject, XmlContentText
 from uc2.libgeom import add_points, sub_points, mult_point
 
-PATH_STUB = [[], [], sk2const.CURVE_OPENED]
+NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+NUMBER_PATTERN = re.compile(NUMBER)
+PATH_CMD_PATTERN = re.compile(
+    r'([MmZzLlHhVvCcSsQqTtAa])([^MmZzLlHhVvCcSsQqTtAa]*)')
+ARC_PATTERN = re.compile(r'[\s,]*(%s)[\s,]*(%s)[\s,]*(%s)[\s,]*([01])'
+                         r'[\s,]*([01])[\s,]*(%s)[\s,]*(%s)' % ((NUMBER,) * 5))
+URL_REF_PATTERN = re.compile(r'url\(\s*["\']?#([^)"\'\s]+)')
 F13 = 1.0 / 3.0
 F23 = 2.0 / 3.0
 LOG = logging.getLogger(__name__)
@@ -38,6 +44,21 @@ def check_svg_attr(svg_obj, attr, value=None):
     return False
 
 
+def get_svg_refs(svg_obj):
+    """
+    Returns ids referenced by object attributes,
+    i.e. by href and url(#id) values.
+    """
+    refs = []
+    for name, value in svg_obj.attrs.items():
+        if name.endswith('href'):
+            if value.startswith('#'):
+                refs.append(value[1:])
+        else:
+            refs += URL_REF_PATTERN.findall(value)
+    return refs
+
+
 def trafo_skewX(grad=0.0):
     angle = math.pi * grad / 180.0
     return [1.0, 0.0, math.tan(angle), 1.0, 0.0, 0.0]
@@ -194,24 +215,46 @@ def base_point(point):
     return [] + point[-1]
 
 
-def parse_svg_path_cmds(pathcmds):
-    index = 0
-    last = None
-    last_index = 0
+def parse_svg_numbers(scoords):
+    return [float(item) for item in NUMBER_PATTERN.findall(scoords)]
+
+
+def parse_svg_arcs(scoords):
+    """
+    Parses arc arguments taking into account that arc flags
+    may be not separated from following values ('a1,1 0 0150,25').
+    """
+    coords = []
+    end = 0
+    scoords = scoords.rstrip(' \t\r\n,')
+    for match in ARC_PATTERN.finditer(scoords):
+        if match.start() != end:
+            break
+        coords += [float(item) for item in match.groups()]
+        end = match.end()
+    if end != len(scoords):
+        return parse_svg_numbers(scoords)
+    return coords
+
+
+def parse_svg_path_tokens(pathcmds):
+    """
+    Splits path data into list of (command, coordinates) pairs.
+    """
     cmds = []
-    pathcmds = re.sub('  *', ' ', pathcmds)
-    for item in pathcmds:
-        if item in 'MmZzLlHhVvCcSsQqTtAa':
-            if last:
-                coords = parse_svg_coords(pathcmds[last_index + 1:index])
-                cmds.append((last, coords))
-            last = item
-            last_index = index
-        index += 1
-
-    coords = parse_svg_coords(pathcmds[last_index + 1:index])
-    cmds.append([last, coords])
+    for cmd, scoords in PATH_CMD_PATTERN.findall(pathcmds):
+        if cmd in 'Aa':
+            cmds.append((cmd, parse_svg_arcs(scoords)))
+        else:
+            cmds.append((cmd, parse_svg_numbers(scoords)))
+    return cmds
+
+
+def parse_svg_path_cmds(pathcmds):
+    return get_svg_paths(parse_svg_path_tokens(pathcmds))
+
 
+def get_svg_paths(cmds):
     paths = []
     path = []
     cpoint = []
@@ -222,7 +265,7 @@ def parse_svg_path_cmds(pathcmds):
     for cmd in cmds:
         if cmd[0] in 'Mm':
             if path: paths.append(path)
-            path = deepcopy(PATH_STUB)
+            path = [[], [], sk2const.CURVE_OPENED]
             rel_flag = cmd[0] == 'm'
             points = [cmd[1][i:i + 2] for i in range(0, len(cmd[1]), 2)]
             for point in points:
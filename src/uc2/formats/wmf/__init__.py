@@ -18,8 +18,6 @@
 from uc2 import uc2const
 from uc2.formats.sk2.sk2_presenter import SK2_Presenter
 from uc2.formats.wmf.wmf_presenter import WMF_Presenter
-from uc2.formats.wmf.wmf_const import WMF_SIGNATURE, METAFILETYPES, METAVERSIONS
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -50,18 +48,3 @@ def wmf_saver(sk2_doc, filename=None, fileptr=None,
         wmf_doc.close()
     else:
         sk2_doc.save(filename, fileptr)
-
-
-def check_wmf(path):
-    fileptr = get_fileptr(path)
-    sign = fileptr.read(len(WMF_SIGNATURE))
-    fileptr.seek(0)
-    metatype = fileptr.read(2)
-    fileptr.read(2)
-    metaver = fileptr.read(2)
-    fileptr.close()
-    if sign == WMF_SIGNATURE:
-        return True
-    if metatype in METAFILETYPES and metaver in METAVERSIONS:
-        return True
-    return False
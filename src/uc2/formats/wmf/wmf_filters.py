@@ -24,6 +24,8 @@ from uc2.formats.wmf.wmf_model import META_Placeable_Record, \
 from uc2.formats.wmf.wmf_const import STRUCT_HEADER, STRUCT_PLACEABLE
 from uc2.formats.wmf.wmf_const import WMF_SIGNATURE, EOF_RECORD, META_EOF
 
+RECORD_HEADER = '<IH'  # size in words, function
+
 
 class WMF_Loader(AbstractBinaryLoader):
     name = 'WMF_Loader'
@@ -45,9 +47,7 @@ class WMF_Loader(AbstractBinaryLoader):
         func = -1
         while not func == META_EOF:
             try:
-                size = self.readdword()
-                func = self.readword()
-                self.fileptr.seek(-6, 1)
+                size, func = self.fileptr.peek(RECORD_HEADER)
                 chunk = self.readbytes(size * 2)
                 self.parent.childs.append(WMF_Record(chunk))
             except:
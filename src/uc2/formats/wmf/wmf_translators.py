@@ -20,6 +20,7 @@ from copy import deepcopy
 from cStringIO import StringIO
 
 from uc2 import uc2const, libgeom, libpango, libimg, sk2const
+from uc2.formats.generic_filters import unpack_array
 from uc2.formats.sk2 import sk2_model
 from uc2.formats.wmf import wmf_const, wmf_hatches, wmf_utils, wmf_model
 from uc2.formats.wmf.wmf_utils import get_data, rndpoint
@@ -565,10 +566,8 @@ class WMF_to_SK2_Translator(object):
 
     def tr_polygon(self, chunk):
         pointnum = get_data('<h', chunk[:2])[0]
-        points = []
-        for i in range(pointnum):
-            x, y = get_data('<hh', chunk[2 + i * 4:6 + i * 4])
-            points.append([float(x), float(y)])
+        points = [[float(x), float(y)]
+                  for x, y in unpack_array('<hh', chunk, pointnum, 2)]
         if not points[0] == points[-1]:
             points.append([] + points[0])
         if len(points) < 3:
@@ -583,18 +582,14 @@ class WMF_to_SK2_Translator(object):
 
     def tr_polypolygon(self, chunk):
         polygonnum = get_data('<H', chunk[:2])[0]
-        pointnums = []
-        pos = 2
-        for i in range(polygonnum):
-            pointnums.append(get_data('<h', chunk[pos:pos + 2])[0])
-            pos += 2
+        pointnums = [item[0] for item in
+                     unpack_array('<h', chunk, polygonnum, 2)]
+        pos = 2 + 2 * polygonnum
         paths = []
         for pointnum in pointnums:
-            points = []
-            for i in range(pointnum):
-                x, y = get_data('<hh', chunk[pos:4 + pos])
-                points.append([float(x), float(y)])
-                pos += 4
+            points = [[float(x), float(y)]
+                      for x, y in unpack_array('<hh', chunk, pointnum, pos)]
+            pos += 4 * max(pointnum, 0)
             if not points[0] == points[-1]:
                 points.append([] + points[0])
             paths.append([points[0], points[1:], sk2const.CURVE_CLOSED])
@@ -609,10 +604,8 @@ class WMF_to_SK2_Translator(object):
 
     def tr_polyline(self, chunk):
         pointnum = get_data('<h', chunk[:2])[0]
-        points = []
-        for i in range(pointnum):
-            x, y = get_data('<hh', chunk[2 + i * 4:6 + i * 4])
-            points.append([float(x), float(y)])
+        points = [[float(x), float(y)]
+                  for x, y in unpack_array('<hh', chunk, pointnum, 2)]
         if len(points) < 2:
             return
         paths = [[points[0], points[1:], sk2const.CURVE_OPENED], ]
@@ -16,7 +16,6 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from uc2.formats.xml_.xml_presenter import XML_Presenter
-from uc2.utils.fsutils import get_fileptr
 from uc2.utils.mixutils import merge_cnf
 
 
@@ -32,17 +31,3 @@ def xml__saver(doc, filename=None, fileptr=None, translate=False,
                convert=False, cnf=None, **kw):
     cnf = merge_cnf(cnf, kw)
     doc.save(filename, fileptr)
-
-
-def check_xml_(path):
-    fileptr = get_fileptr(path)
-    ret = False
-    i = 0
-    while i < 20:
-        line = fileptr.readline()
-        if not line.find('<?xml ') == -1:
-            ret = True
-            break
-        i += 1
-    fileptr.close()
-    return ret
@@ -20,6 +20,8 @@ from bezier_ops import *
 from contour import stroke_to_curve
 from cwrap import *
 from flattering import get_flattened_path, flat_paths, flat_path
+from hittest import get_flat_polylines, is_point_in_polylines, \
+    is_point_near_polylines
 from objs import *
 from points import *
 from shaping import intersect_paths, fuse_paths, trim_paths, excluse_paths
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import cairo
+
+from uc2 import libcairo
+
+"""
+Analytic hit-testing routines over flattened cairo paths.
+
+POLYLINE DEFINITION:
+[points, closed, bbox]
+points - [(x0,y0), (x1,y1), ...]
+closed - True if subpath is closed by close_path operator
+bbox - (x0,y0,x1,y1) of polyline points
+"""
+
+
+def _close_polyline(points, closed, polylines):
+    if points:
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        bbox = (min(xs), min(ys), max(xs), max(ys))
+        polylines.append([points, closed, bbox])
+
+
+def get_flat_polylines(cpath, tolerance=0.1):
+    """
+    Flattens cairo path and returns list of polylines.
+    """
+    polylines = []
+    points = []
+    start = None
+    for item_type, coords in libcairo.get_flattened_cpath(cpath, tolerance):
+        if item_type == cairo.PATH_MOVE_TO:
+            _close_polyline(points, False, polylines)
+            start = coords
+            points = [coords]
+        elif item_type == cairo.PATH_LINE_TO:
+            points.append(coords)
+        elif item_type == cairo.PATH_CLOSE_PATH:
+            if points and start is not None:
+                if points[-1] != start:
+                    points.append(start)
+                _close_polyline(points, True, polylines)
+            points = []
+    _close_polyline(points, False, polylines)
+    return polylines
+
+
+def get_polylines_winding(point, polylines):
+    """
+    Returns winding number of point against polylines.
+    Open polylines are implicitly closed as cairo does for filling.
+    """
+    x, y = point
+    winding = 0
+    for points, closed, bbox in polylines:
+        if y < bbox[1] or y > bbox[3] or x > bbox[2]:
+            continue
+        if not closed and points[0] != points[-1]:
+            points = points + [points[0]]
+        x0, y0 = points[0]
+        for x1, y1 in points[1:]:
+            if y0 <= y:
+                if y1 > y and (x1 - x0) * (y - y0) - (x - x0) * (y1 - y0) > 0:
+                    winding += 1
+            elif y1 <= y and (x1 - x0) * (y - y0) - (x - x0) * (y1 - y0) < 0:
+                winding -= 1
+            x0, y0 = x1, y1
+    return winding
+
+
+def is_point_in_polylines(point, polylines, evenodd=False):
+    """
+    Checks is point inside area filled using nonzero or even-odd rule.
+    """
+    winding = get_polylines_winding(point, polylines)
+    if evenodd:
+        return bool(winding % 2)
+    return winding != 0
+
+
+def is_point_near_polylines(point, polylines, distance):
+    """
+    Checks is distance from point to polylines outline
+    less or equal to provided distance.
+    """
+    x, y = point
+    dist2 = distance * distance
+    for points, closed, bbox in polylines:
+        if x < bbox[0] - distance or x > bbox[2] + distance or \
+                y < bbox[1] - distance or y > bbox[3] + distance:
+            continue
+        x0, y0 = points[0]
+        if len(points) == 1:
+            if (x - x0) ** 2 + (y - y0) ** 2 <= dist2:
+                return True
+            continue
+        for x1, y1 in points[1:]:
+            dx = x1 - x0
+            dy = y1 - y0
+            seg2 = dx * dx + dy * dy
+            t = 0.0
+            if seg2:
+                t = float((x - x0) * dx + (y - y0) * dy) / seg2
+                t = min(max(t, 0.0), 1.0)
+            px = x0 + t * dx - x
+            py = y0 + t * dy - y
+            if px * px + py * py <= dist2:
+                return True
+            x0, y0 = x1, y1
+    return False
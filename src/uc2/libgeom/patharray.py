@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Array backed paths representation with NumPy vectorized routines.
+NumPy is optional dependency: check HAS_NUMPY before using the module.
+
+PATH ARRAY DEFINITION:
+coords - contiguous float64 array (N, 2) of all path points
+types - uint8 array of segments: SEG_MOVE (path start point),
+        SEG_LINE (one coords row), SEG_CURVE (three coords rows)
+markers - int8 array of segment node markers, MARKER_NONE for
+          curve points without marker, lines and path starts
+closed - int8 array of path end markers
+
+Conversion from and to list form (see libgeom package docs)
+is lossless, excepting integer coordinates become floats.
+"""
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    numpy = None
+    HAS_NUMPY = False
+
+SEG_MOVE = 0
+SEG_LINE = 1
+SEG_CURVE = 2
+
+MARKER_NONE = -1
+
+
+def _check_numpy():
+    if not HAS_NUMPY:
+        raise ImportError('NumPy is required for array backed paths')
+
+
+class PathArray(object):
+    coords = None
+    types = None
+    markers = None
+    closed = None
+
+    def __init__(self, coords, types, markers, closed):
+        self.coords = coords
+        self.types = types
+        self.markers = markers
+        self.closed = closed
+
+    def __len__(self):
+        return len(self.closed)
+
+    def copy(self):
+        return PathArray(self.coords.copy(), self.types.copy(),
+                         self.markers.copy(), self.closed.copy())
+
+    # --- Structure helpers
+
+    def get_nodes_indexes(self):
+        """
+        Returns coords row index of node (end point) of each segment.
+        """
+        counts = numpy.where(self.types == SEG_CURVE, 3, 1)
+        return numpy.cumsum(counts) - 1
+
+    def get_path_ids(self):
+        """
+        Returns path index of each segment.
+        """
+        return numpy.cumsum(self.types == SEG_MOVE) - 1
+
+    def get_nodes(self):
+        return self.coords[self.get_nodes_indexes()]
+
+    # --- List form conversion
+
+    def to_paths(self):
+        coords = self.coords.tolist()
+        markers = self.markers.tolist()
+        closed = self.closed.tolist()
+        paths = []
+        points = None
+        row = 0
+        for index, seg_type in enumerate(self.types.tolist()):
+            if seg_type == SEG_MOVE:
+                points = []
+                paths.append([coords[row], points, closed[len(paths)]])
+                row += 1
+            elif seg_type == SEG_LINE:
+                points.append(coords[row])
+                row += 1
+            else:
+                point = coords[row:row + 3]
+                if markers[index] != MARKER_NONE:
+                    point.append(markers[index])
+                points.append(point)
+                row += 3
+        return paths
+
+    # --- Geometry
+
+    def apply_trafo(self, trafo):
+        """
+        Returns new path array transformed by provided trafo.
+        """
+        m11, m21, m12, m22, dx, dy = trafo
+        matrix = numpy.array([[m11, m21], [m12, m22]], dtype=numpy.float64)
+        coords = self.coords.dot(matrix)
+        coords += (dx, dy)
+        return PathArray(coords, self.types.copy(), self.markers.copy(),
+                         self.closed.copy())
+
+    def get_control_bbox(self):
+        """
+        Returns bbox of all path points including control ones.
+        The bbox covers curves but may be larger than exact one.
+        """
+        if not len(self.coords):
+            return [0.0, 0.0, 0.0, 0.0]
+        x0, y0 = self.coords.min(axis=0).tolist()
+        x1, y1 = self.coords.max(axis=0).tolist()
+        return [x0, y0, x1, y1]
+
+    def get_bbox(self, tolerance=0.1):
+        return self.flatten(tolerance).get_control_bbox()
+
+    def flatten(self, tolerance=0.1):
+        """
+        Returns new path array with curves replaced by line segments.
+        Number of segments for each curve is calculated by Wang's
+        formula, so distance from polyline to curve doesn't exceed
+        tolerance. Closed paths get explicit closing segment as
+        flattering.flat_path() does.
+        """
+        types = self.types
+        if not len(types):
+            return self.copy()
+        coords = self.coords
+        nodes = self.get_nodes_indexes()
+        curves = numpy.nonzero(types == SEG_CURVE)[0]
+        simple = numpy.nonzero(types != SEG_CURVE)[0]
+        counts = numpy.ones(len(types), dtype=numpy.int64)
+        if len(curves):
+            rows = nodes[curves]
+            p0 = coords[nodes[curves - 1]]
+            p1 = coords[rows - 2]
+            p2 = coords[rows - 1]
+            p3 = coords[rows]
+            dd = numpy.maximum(
+                numpy.hypot(*(p0 - 2.0 * p1 + p2).T),
+                numpy.hypot(*(p1 - 2.0 * p2 + p3).T))
+            steps = numpy.ceil(numpy.sqrt(0.75 * dd / max(tolerance, 1e-9)))
+            steps = numpy.maximum(steps, 1).astype(numpy.int64)
+            counts[curves] = steps
+        out_starts = numpy.cumsum(counts) - counts
+        result = numpy.empty((int(counts.sum()), 2), dtype=numpy.float64)
+        result[out_starts[simple]] = coords[nodes[simple]]
+        if len(curves):
+            # parameter values of all curve points in one array
+            seg = numpy.repeat(numpy.arange(len(curves)), steps)
+            starts = numpy.cumsum(steps) - steps
+            offsets = numpy.arange(len(seg)) - starts[seg]
+            t = ((offsets + 1.0) / steps[seg])[:, numpy.newaxis]
+            mt = 1.0 - t
+            result[out_starts[curves][seg] + offsets] = \
+                mt * mt * mt * p0[seg] + 3.0 * mt * mt * t * p1[seg] + \
+                3.0 * mt * t * t * p2[seg] + t * t * t * p3[seg]
+        result_types = numpy.where(types == SEG_MOVE, SEG_MOVE, SEG_LINE)
+        result_types = numpy.repeat(result_types, counts).astype(numpy.uint8)
+        # closing segments
+        starts = numpy.nonzero(result_types == SEG_MOVE)[0]
+        ends = numpy.append(starts[1:], len(result)) - 1
+        need = numpy.nonzero(self.closed.astype(bool) & numpy.any(
+            result[ends] != result[starts], axis=1))[0]
+        if len(need):
+            result = numpy.insert(result, ends[need] + 1, result[starts[need]],
+                                  axis=0)
+            result_types = numpy.insert(result_types, ends[need] + 1,
+                                        SEG_LINE)
+        markers = numpy.full(len(result_types), MARKER_NONE, dtype=numpy.int8)
+        return PathArray(result, result_types, markers, self.closed.copy())
+
+    def get_path_lengths(self, tolerance=0.5):
+        """
+        Returns array of flattened paths lengths.
+        """
+        flat = self.flatten(tolerance)
+        if not len(flat.types):
+            return numpy.zeros(len(flat.closed))
+        deltas = numpy.diff(flat.coords, axis=0)
+        lengths = numpy.hypot(deltas[:, 0], deltas[:, 1])
+        lines = flat.types[1:] != SEG_MOVE
+        path_ids = flat.get_path_ids()[1:]
+        return numpy.bincount(path_ids[lines], weights=lengths[lines],
+                              minlength=len(flat.closed))
+
+    def get_length(self, tolerance=0.5):
+        return float(self.get_path_lengths(tolerance).sum())
+
+
+def paths_to_array(paths):
+    """
+    Converts paths from list form to path array.
+    """
+    _check_numpy()
+    coords = []
+    types = []
+    markers = []
+    closed = []
+    for path in paths:
+        coords.append(path[0])
+        types.append(SEG_MOVE)
+        markers.append(MARKER_NONE)
+        closed.append(path[2])
+        for point in path[1]:
+            if len(point) == 2:
+                coords.append(point)
+                types.append(SEG_LINE)
+                markers.append(MARKER_NONE)
+            else:
+                coords += point[:3]
+                types.append(SEG_CURVE)
+                markers.append(point[3] if len(point) > 3 else MARKER_NONE)
+    coords = numpy.array(coords, dtype=numpy.float64).reshape(-1, 2)
+    return PathArray(numpy.ascontiguousarray(coords),
+                     numpy.array(types, dtype=numpy.uint8),
+                     numpy.array(markers, dtype=numpy.int8),
+                     numpy.array(closed, dtype=numpy.int8))
+
+
+def array_to_paths(path_array):
+    return path_array.to_paths()
+
+
+def apply_trafo_to_paths(paths, trafo):
+    return paths_to_array(paths).apply_trafo(trafo).to_paths()
+
+
+def get_paths_bbox(paths, tolerance=0.1):
+    return paths_to_array(paths).get_bbox(tolerance)
+
+
+def get_paths_length(paths, tolerance=0.5):
+    return paths_to_array(paths).get_length(tolerance)
+
+
+def flat_paths(paths, tolerance=0.1):
+    return paths_to_array(paths).flatten(tolerance).to_paths()
@@ -574,39 +574,98 @@ def get_approx_paths(paths):
     return approx_paths
 
 
+def get_overlapping_pairs(rects):
+    """
+    Finds all pairs of overlapping rects using sweep along X axis:
+    rects are sorted by left edge and each rect is checked against
+    active rects only (rects which right edge is not passed yet).
+    Returns list of (index1, index2) pairs where index1 < index2.
+    """
+    order = sorted(range(len(rects)), key=lambda k: rects[k][0])
+    active = []
+    pairs = []
+    for k in order:
+        x0, y0, x1, y1 = rects[k]
+        active = [a for a in active if rects[a][2] >= x0]
+        for a in active:
+            rect = rects[a]
+            if rect[1] <= y1 and rect[3] >= y0:
+                pairs.append((a, k) if a < k else (k, a))
+        active.append(k)
+    return pairs
+
+
+def get_chunk_pairs(approx_paths, self_check=False):
+    """
+    Returns pairs of overlapping approximated path chunks
+    in the order of nested loops over approx_paths.
+    """
+    chunks = []
+    keys = []
+    for i, partials in enumerate(approx_paths):
+        for k, partial in enumerate(partials):
+            chunks.append(partial)
+            keys.append((i, k))
+    rects = [item[2] for item in chunks]
+    pairs = []
+    for a, b in get_overlapping_pairs(rects):
+        if self_check:
+            pairs.append((keys[a], keys[b]))
+            pairs.append((keys[b], keys[a]))
+        elif keys[a][0] != keys[b][0]:
+            pairs.append((keys[a], keys[b]))
+    if self_check:
+        # self-intersection loops start from the last chunk
+        size = len(chunks)
+        pairs.sort(key=lambda pair: ((pair[0][1] + 1) % size,
+                                     (pair[1][1] + 1) % size))
+    else:
+        pairs.sort(key=lambda pair: (pair[0][0], pair[1][0],
+                                     pair[0][1], pair[1][1]))
+    return [(approx_paths[i][k], approx_paths[j][m])
+            for (i, k), (j, m) in pairs]
+
+
+def intersect_chunks(chunk1, chunk2, cross_point_id, unique=False):
+    path1, approx_path1 = chunk1[:2]
+    path2, approx_path2 = chunk2[:2]
+    for p in range(1, len(approx_path1)):
+        (p0, t0), (p1, t1) = approx_path1[p - 1:p + 1]
+        for q in range(1, len(approx_path2)):
+            (p2, t2), (p3, t3) = approx_path2[q - 1:q + 1]
+            if equal(p0, p2):
+                cp = p0
+            elif equal(p0, p3) or \
+                    equal(p1, p2) or \
+                    equal(p1, p3):
+                cp = None
+            else:
+                cp = intersect_lines(p0, p1, p2, p3)
+            if cp is not None:
+                index1 = index(cp, p0, t0, p1, t1)
+                index2 = index(cp, p2, t2, p3, t3)
+                if not unique or index1 not in path1.cp_indexes:
+                    path1.cp_indexes.append(index1)
+                    path1.cp_dict[index1] = cross_point_id
+                if not unique or index2 not in path2.cp_indexes:
+                    path2.cp_indexes.append(index2)
+                    path2.cp_dict[index2] = cross_point_id
+                cross_point_id += 1
+    return cross_point_id
+
+
+def intersect_approx_paths(approx_paths):
+    cross_point_id = 0
+    for chunk1, chunk2 in get_chunk_pairs(approx_paths):
+        if not chunk1[0].obj_id == chunk2[0].obj_id:
+            cross_point_id = intersect_chunks(chunk1, chunk2, cross_point_id)
+
+
 def intersect_objects(curve_objs):
     paths = []
     for i in range(len(curve_objs)):
         paths += curve_objs[i].paths()
-    approx_paths = get_approx_paths(paths)
-
-    cross_point_id = 0
-    for i in range(len(approx_paths)):
-        for j in range(i + 1, len(approx_paths)):
-            for path1, approx_path1, rect1 in approx_paths[i]:
-                for path2, approx_path2, rect2 in approx_paths[j]:
-                    if not path1.obj_id == path2.obj_id and \
-                            is_bbox_overlap(rect1, rect2):
-                        for p in range(1, len(approx_path1)):
-                            (p0, t0), (p1, t1) = approx_path1[p - 1:p + 1]
-                            for q in range(1, len(approx_path2)):
-                                (p2, t2), (p3, t3) = approx_path2[q - 1:q + 1]
-                                if equal(p0, p2):
-                                    cp = p0
-                                elif equal(p0, p3) or \
-                                        equal(p1, p2) or \
-                                        equal(p1, p3):
-                                    cp = None
-                                else:
-                                    cp = intersect_lines(p0, p1, p2, p3)
-                                if cp is not None:
-                                    index1 = index(cp, p0, t0, p1, t1)
-                                    index2 = index(cp, p2, t2, p3, t3)
-                                    path1.cp_indexes.append(index1)
-                                    path1.cp_dict[index1] = cross_point_id
-                                    path2.cp_indexes.append(index2)
-                                    path2.cp_dict[index2] = cross_point_id
-                                    cross_point_id += 1
+    intersect_approx_paths(get_approx_paths(paths))
     result = []
     for obj in curve_objs:
         for path in obj.paths():
@@ -616,35 +675,7 @@ def intersect_objects(curve_objs):
 
 def intersect_segments(path1, path2):
     paths = [PathObject(path1, 0), PathObject(path2, 1)]
-    approx_paths = get_approx_paths(paths)
-
-    cross_point_id = 0
-    for i in range(len(approx_paths)):
-        for j in range(i + 1, len(approx_paths)):
-            for path1, approx_path1, rect1 in approx_paths[i]:
-                for path2, approx_path2, rect2 in approx_paths[j]:
-                    if not path1.obj_id == path2.obj_id and \
-                            is_bbox_overlap(rect1, rect2):
-                        for p in range(1, len(approx_path1)):
-                            (p0, t0), (p1, t1) = approx_path1[p - 1:p + 1]
-                            for q in range(1, len(approx_path2)):
-                                (p2, t2), (p3, t3) = approx_path2[q - 1:q + 1]
-                                if equal(p0, p2):
-                                    cp = p0
-                                elif equal(p0, p3) or \
-                                        equal(p1, p2) or \
-                                        equal(p1, p3):
-                                    cp = None
-                                else:
-                                    cp = intersect_lines(p0, p1, p2, p3)
-                                if cp is not None:
-                                    index1 = index(cp, p0, t0, p1, t1)
-                                    index2 = index(cp, p2, t2, p3, t3)
-                                    path1.cp_indexes.append(index1)
-                                    path1.cp_dict[index1] = cross_point_id
-                                    path2.cp_indexes.append(index2)
-                                    path2.cp_dict[index2] = cross_point_id
-                                    cross_point_id += 1
+    intersect_approx_paths(get_approx_paths(paths))
 
     result = [[], []]
     if not paths[0].cp_indexes:
@@ -677,37 +708,9 @@ def self_intersect(curve_obj):
     approx_paths = get_approx_paths(paths)
 
     cross_point_id = 0
-    approx_paths = approx_paths[0]
-
-    for i in range(-1, len(approx_paths) - 1):
-        path1, approx_path1, rect1 = approx_paths[i]
-        for j in range(-1, len(approx_paths) - 1):
-            if i == j:
-                continue
-            path2, approx_path2, rect2 = approx_paths[j]
-            if is_bbox_overlap(rect1, rect2):
-                for p in range(1, len(approx_path1)):
-                    (p0, t0), (p1, t1) = approx_path1[p - 1:p + 1]
-                    for q in range(1, len(approx_path2)):
-                        (p2, t2), (p3, t3) = approx_path2[q - 1:q + 1]
-                        if equal(p0, p2):
-                            cp = p0
-                        elif equal(p0, p3) or \
-                                equal(p1, p2) or \
-                                equal(p1, p3):
-                            cp = None
-                        else:
-                            cp = intersect_lines(p0, p1, p2, p3)
-                        if cp is not None:
-                            index1 = index(cp, p0, t0, p1, t1)
-                            index2 = index(cp, p2, t2, p3, t3)
-                            if index1 not in path1.cp_indexes:
-                                path1.cp_indexes.append(index1)
-                                path1.cp_dict[index1] = cross_point_id
-                            if index2 not in path2.cp_indexes:
-                                path2.cp_indexes.append(index2)
-                                path2.cp_dict[index2] = cross_point_id
-                            cross_point_id += 1
+    for chunk1, chunk2 in get_chunk_pairs(approx_paths[:1], True):
+        cross_point_id = intersect_chunks(chunk1, chunk2,
+                                          cross_point_id, True)
 
     return paths[0].split()
 
@@ -72,6 +72,14 @@ def apply_trafo_to_bbox(bbox, trafo):
     return p0 + p1
 
 
+def get_trafo_scale(trafo):
+    """
+    Returns mean scale factor of transformation, i.e.
+    square root of absolute determinant value.
+    """
+    return math.sqrt(abs(trafo[0] * trafo[3] - trafo[1] * trafo[2]))
+
+
 def get_transformed_paths(obj):
     if obj.is_curve:
         return apply_trafo_to_paths(obj.paths, obj.trafo)
@@ -27,10 +27,12 @@ from uc2 import uc2const
 from uc2.cms import val_255
 from uc2.libcairo import image_to_surface
 from uc2.utils import fsutils
-from . import magickwand
+from . import magickwand, surfcache
+from .surfcache import SURFACE_CACHE
 
 TIFF_FMT = 'TIFF'
 PNG_FMT = 'PNG'
+MIN_LEVEL_SIZE = 32
 
 LOG = logging.getLogger(__name__)
 
@@ -39,13 +41,17 @@ class ImageHandler(object):
     pixmap = None
     bitmap = None
     alpha = None
-
-    cdata = None
-    ps_cdata = None
-    gray_cdata = None
+    cache_id = None
 
     def __init__(self, pixmap):
         self.pixmap = pixmap
+        self.cache_id = surfcache.new_owner_id()
+        SURFACE_CACHE.watch(self, self.cache_id)
+
+    def destroy(self):
+        SURFACE_CACHE.release(self.cache_id)
+        for item in self.__dict__.keys():
+            self.__dict__[item] = None
 
     def get_size(self):
         return self.bitmap.size if self.bitmap else (0, 0)
@@ -57,9 +63,7 @@ class ImageHandler(object):
         return self.alpha is not None
 
     def clear_cache(self):
-        self.cdata = None
-        self.ps_cdata = None
-        self.gray_cdata = None
+        SURFACE_CACHE.drop(self.cache_id)
 
     def _get_saver_fmt(self, image):
         return TIFF_FMT if image.mode == uc2const.IMAGE_CMYK else PNG_FMT
@@ -275,7 +279,7 @@ class DrawableImageHandler(ImageHandler):
             image = cms.convert_image(image, uc2const.IMAGE_CMYK)
         return cms.get_display_image(image)
 
-    def _get_surface(self, cms, proofing=False, stroke_mode=False):
+    def _get_surface(self, cms, proofing=False, stroke_mode=False, level=0):
         if stroke_mode:
             gray_image = self.bitmap.convert(uc2const.IMAGE_GRAY)
             rgb_image = gray_image.convert(uc2const.IMAGE_RGB)
@@ -288,21 +292,44 @@ class DrawableImageHandler(ImageHandler):
         if self.alpha and rgb_image.mode == uc2const.IMAGE_RGB:
             rgb_image.putalpha(self.alpha)
 
+        if level:
+            w, h = rgb_image.size
+            size = (max(w >> level, 1), max(h >> level, 1))
+            rgb_image = rgb_image.resize(size, Image.ANTIALIAS)
+
         return image_to_surface(rgb_image)
 
-    def get_surface(self, cms, proofing=False, stroke_mode=False):
+    def get_level(self, scale=1.0):
+        """
+        Returns resolution pyramid level suitable for provided scale
+        (ratio of device pixel to image pixel).
+        """
+        level = 0
+        size = min(self.get_size())
+        while scale <= 0.5 and size >> (level + 1) >= MIN_LEVEL_SIZE:
+            scale *= 2.0
+            level += 1
+        return level
+
+    def get_surface(self, cms, proofing=False, stroke_mode=False, scale=1.0):
+        """
+        Returns display surface of the image. For scale less than 0.5
+        downscaled surface of resolution pyramid is returned.
+        Surfaces are kept in global memory budgeted cache.
+        """
         if stroke_mode:
-            if not self.gray_cdata:
-                self.gray_cdata = self._get_surface(cms, stroke_mode=True)
-            return self.gray_cdata
+            mode = surfcache.MODE_CONTOUR
         elif proofing:
-            if not self.ps_cdata:
-                self.ps_cdata = self._get_surface(cms, proofing=True)
-            return self.ps_cdata
+            mode = surfcache.MODE_PROOFING
         else:
-            if not self.cdata:
-                self.cdata = self._get_surface(cms)
-            return self.cdata
+            mode = surfcache.MODE_NORMAL
+        level = self.get_level(scale) if scale < 1.0 else 0
+        surface = SURFACE_CACHE.get(self.cache_id, mode, level)
+        if surface is None:
+            surface = self._get_surface(cms, proofing, stroke_mode, level)
+            if surface is not None:
+                SURFACE_CACHE.put(self.cache_id, mode, level, surface)
+        return surface
 
     def update_cache(self, cms):
         self.get_surface(cms, cms.proofing)
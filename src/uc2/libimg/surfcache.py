@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Global cache of cairo surfaces rendered from image handlers.
+
+Surfaces are stored by (owner id, mode, level) keys, where level
+is a level of resolution pyramid (0 - full resolution, each next
+level is two times smaller). Least recently used surfaces are evicted
+when total size of cached surfaces exceeds memory budget. A surface
+requested by renderer is always returned (and cached) even if it is
+larger than the budget itself.
+"""
+
+import itertools
+import weakref
+from collections import OrderedDict
+
+DEFAULT_BUDGET = 512  # in MB
+
+MODE_NORMAL = 0
+MODE_PROOFING = 1
+MODE_CONTOUR = 2
+
+_OWNER_IDS = itertools.count(1)
+
+
+def new_owner_id():
+    return next(_OWNER_IDS)
+
+
+def get_surface_size(surface):
+    return surface.get_stride() * surface.get_height()
+
+
+class SurfaceCache(object):
+    surfaces = None
+    owners = None
+    refs = None
+    size = 0
+    budget = DEFAULT_BUDGET * 1024 * 1024
+
+    def __init__(self):
+        self.surfaces = OrderedDict()
+        self.owners = {}
+        self.refs = {}
+        self.size = 0
+
+    def set_budget(self, budget):
+        """
+        Sets memory budget in megabytes.
+        """
+        self.budget = int(budget * 1024 * 1024)
+        self._evict()
+
+    def get(self, owner, mode, level=0):
+        key = (owner, mode, level)
+        item = self.surfaces.pop(key, None)
+        if item is None:
+            return None
+        self.surfaces[key] = item
+        return item[0]
+
+    def put(self, owner, mode, level, surface):
+        key = (owner, mode, level)
+        self._remove(key)
+        size = get_surface_size(surface)
+        self.surfaces[key] = (surface, size)
+        self.owners.setdefault(owner, set()).add(key)
+        self.size += size
+        self._evict(key)
+
+    def _remove(self, key):
+        item = self.surfaces.pop(key, None)
+        if item is not None:
+            self.size -= item[1]
+            keys = self.owners[key[0]]
+            keys.discard(key)
+            if not keys:
+                del self.owners[key[0]]
+
+    def _evict(self, keep=None):
+        while self.size > self.budget and self.surfaces:
+            key = next(iter(self.surfaces))
+            if key == keep:
+                break
+            self._remove(key)
+
+    def drop(self, owner):
+        """
+        Removes all surfaces of provided owner.
+        """
+        for key in list(self.owners.get(owner, ())):
+            self._remove(key)
+
+    def watch(self, obj, owner):
+        """
+        Releases owner surfaces when provided object is garbage
+        collected without release() call.
+        """
+        self.refs[owner] = weakref.ref(obj, lambda ref: self.release(owner))
+
+    def release(self, owner):
+        """
+        Removes all surfaces of owner which will not request them anymore.
+        """
+        self.refs.pop(owner, None)
+        self.drop(owner)
+
+    def clear(self):
+        self.surfaces.clear()
+        self.owners.clear()
+        self.size = 0
+
+
+SURFACE_CACHE = SurfaceCache()
+
+
+def set_budget(budget):
+    SURFACE_CACHE.set_budget(budget)
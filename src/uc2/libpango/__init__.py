@@ -18,5 +18,5 @@
 
 from core import get_version
 from fonts import get_fonts, get_sample_size, render_sample, find_font_family, \
-    find_font_and_face
+    find_font_and_face, set_fonts_catalog
 from paths import get_text_paths
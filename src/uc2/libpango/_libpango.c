@@ -29,6 +29,32 @@ pango_GetVersion(PyObject *self, PyObject *args) {
 	return PyString_FromString(pango_version_string());
 }
 
+static PyObject *
+pango_GetFamilies(PyObject *self, PyObject *args) {
+
+	PangoFontMap *fm;
+	PangoContext *ctx;
+	PangoFontFamily **families;
+	int n_families, i;
+	PyObject *ret;
+
+	fm = pango_cairo_font_map_get_default();
+	ctx = pango_font_map_create_context(fm);
+	pango_context_list_families(ctx, &families, &n_families);
+
+	ret = PyTuple_New(n_families);
+
+	for (i = 0; i < n_families; i++) {
+		PyTuple_SetItem(ret, i,
+				Py_BuildValue("s", pango_font_family_get_name(families[i])));
+	}
+
+	g_free(families);
+	g_object_unref(ctx);
+
+	return ret;
+}
+
 static PyObject *
 pango_GetFontMap(PyObject *self, PyObject *args) {
 
@@ -557,6 +583,7 @@ static
 PyMethodDef pango_methods[] = {
 	{"get_version", pango_GetVersion, METH_VARARGS},
 	{"get_fontmap", pango_GetFontMap, METH_VARARGS},
+	{"get_families", pango_GetFamilies, METH_VARARGS},
 	{"create_pcctx", pango_CreateContext, METH_VARARGS},
 	{"create_layout", pango_CreateLayout, METH_VARARGS},
 	{"create_font_description", pango_CreateFontDescription, METH_VARARGS},
@@ -18,7 +18,7 @@
 import _libpango
 import cairo
 import os
-from copy import deepcopy
+from collections import OrderedDict
 
 from markup import apply_markup, apply_glyph_markup
 
@@ -39,18 +39,53 @@ def get_version():
 
 # --- Glyph caching
 
-GLYPH_CACHE = {}
+GLYPH_CACHE_SIZE = 20000
 
 
-def get_glyph_cache(font_name, char):
-    char = str(char)
-    if font_name in GLYPH_CACHE and char in GLYPH_CACHE[font_name]:
-        return deepcopy(GLYPH_CACHE[font_name][char])
+class GlyphCache(object):
+    """
+    Bounded cache of glyph (cluster) outlines laid out at origin.
+    Least recently used outlines are evicted when cache is full.
+    """
+    glyphs = None
+    size = GLYPH_CACHE_SIZE
+    hits = 0
+    misses = 0
 
+    def __init__(self, size=GLYPH_CACHE_SIZE):
+        self.glyphs = OrderedDict()
+        self.size = size
+        self.hits = self.misses = 0
 
-def set_glyph_cache(font_name, char, glyph):
-    GLYPH_CACHE[font_name] = GLYPH_CACHE.get(font_name, {})
-    GLYPH_CACHE[font_name][str(char)] = deepcopy(glyph)
+    def get(self, key):
+        glyph = self.glyphs.pop(key, None)
+        if glyph is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.glyphs[key] = glyph
+        return glyph
+
+    def put(self, key, glyph):
+        self.glyphs.pop(key, None)
+        self.glyphs[key] = glyph
+        while len(self.glyphs) > self.size:
+            self.glyphs.popitem(last=False)
+
+    def clear(self):
+        self.glyphs.clear()
+        self.hits = self.misses = 0
+
+
+GLYPH_CACHE = GlyphCache()
+
+
+def get_glyph_cache(key):
+    return GLYPH_CACHE.get(key)
+
+
+def set_glyph_cache(key, glyph):
+    GLYPH_CACHE.put(key, glyph)
 
 
 # --- Pango context functionality
@@ -91,6 +126,28 @@ def set_glyph_layout(text, width, text_style, markup, text_range=None,
     return vpos
 
 
+def get_glyph_path(ctx, text, width, text_style, markup, text_range):
+    """
+    Returns outline of glyph (cluster) laid out at origin and vertical
+    position coefficient of sub/superscript. Outlines are cached by font,
+    alignment, width and glyph markup, so returned path is shared
+    and should be copied before transformation.
+    """
+    markuped_text, vpos = apply_glyph_markup(text, text_range, markup, True)
+    key = (tuple(text_style[:4]), width, markuped_text, vpos)
+    glyph = get_glyph_cache(key)
+    if glyph is None:
+        ctx.new_path()
+        ctx.move_to(0, 0)
+        layout = create_layout(ctx)
+        set_glyph_layout(text, width, text_style, markup, text_range,
+                         True, layout)
+        _libpango.layout_path(ctx, layout)
+        glyph = (ctx.copy_path(), vpos)
+        set_glyph_cache(key, glyph)
+    return glyph
+
+
 def layout_path(ctx=CTX, layout=PANGO_LAYOUT):
     _libpango.layout_path(ctx, layout)
 
@@ -17,15 +17,23 @@
 
 
 import cgi
+import hashlib
+import json
+import logging
 import string
 
 import _libpango
 
 from core import PANGO_LAYOUT
 
+LOG = logging.getLogger(__name__)
+
 FAMILIES_LIST = []
 FAMILIES_DICT = {}
 
+CATALOG_VERSION = 1
+CATALOG = {'path': '', 'state': ''}
+
 
 def bbox_size(bbox):
     x0, y0, x1, y1 = bbox
@@ -34,9 +42,65 @@ def bbox_size(bbox):
     return w, h
 
 
-def update_fonts():
+# ---Font catalog
+
+def get_fonts_state():
+    """
+    Returns hash of font family names known to Pango. Families are
+    listed without faces enumeration, so the call is much cheaper
+    than full font map loading.
+    """
+    md5 = hashlib.md5()
+    for name in sorted(_libpango.get_families()):
+        md5.update(name + '\n')
+    return md5.hexdigest()
+
+
+def set_fonts_catalog(path):
+    """
+    Sets file of persistent font catalog. Font families are loaded
+    from the catalog while installed fonts are not changed.
+    """
+    CATALOG['path'] = path
+    CATALOG['state'] = ''
+
+
+def load_catalog(path, state):
+    try:
+        with open(path, 'rb') as fileptr:
+            catalog = json.load(fileptr)
+    except (IOError, ValueError):
+        return False
+    if catalog.get('version') != CATALOG_VERSION or \
+            catalog.get('state') != state:
+        return False
+    families = catalog.get('families', {})
+    for name in sorted(families.keys()):
+        font_name = name.encode('utf-8')
+        FAMILIES_LIST.append(font_name)
+        FAMILIES_DICT[font_name] = [item.encode('utf-8')
+                                    for item in families[name]]
+    return bool(FAMILIES_LIST)
+
+
+def save_catalog(path, state):
+    catalog = {'version': CATALOG_VERSION, 'state': state,
+               'families': FAMILIES_DICT}
+    try:
+        with open(path, 'wb') as fileptr:
+            json.dump(catalog, fileptr)
+    except (IOError, TypeError, ValueError) as e:
+        LOG.warn('Cannot save font catalog %s %s', path, e)
+
+
+def update_fonts(use_catalog=True):
     FAMILIES_LIST[:] = []
     FAMILIES_DICT.clear()
+    path = CATALOG['path'] if use_catalog else ''
+    if path:
+        CATALOG['state'] = get_fonts_state()
+        if load_catalog(path, CATALOG['state']):
+            return
     font_map = _libpango.get_fontmap()
     for item in font_map:
         font_name = item[0]
@@ -45,6 +109,8 @@ def update_fonts():
             FAMILIES_LIST.append(font_name)
             FAMILIES_DICT[font_name] = list(font_faces)
     FAMILIES_LIST.sort()
+    if path:
+        save_catalog(path, CATALOG['state'])
 
 
 def get_fonts():
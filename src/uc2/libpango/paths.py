@@ -201,6 +201,15 @@ def get_log_layout_data(layout_data, byte_dict, rtl_regs):
     return log_layout_data
 
 
+def get_glyph_trafo(x, y):
+    m00 = 1.0
+    m11 = -1.0
+    if os.name == 'nt':
+        m00 *= 0.1
+        m11 *= 0.1
+    return [m00, 0.0, 0.0, m11, x, y]
+
+
 def get_glyphs(ctx, layout_data, text, width, text_style, markup):
     glyphs = []
     i = -1
@@ -219,29 +228,17 @@ def get_glyphs(ctx, layout_data, text, width, text_style, markup):
                 glyphs.append(None)
                 continue
 
-        ctx.new_path()
-        ctx.move_to(0, 0)
-        layout = core.create_layout(ctx)
         text_range = [i, i + len(item)]
-        vpos = core.set_glyph_layout(item, width, text_style, markup,
-                                     text_range, True, layout)
+        cpath, vpos = core.get_glyph_path(ctx, item, width, text_style,
+                                          markup, text_range)
         if vpos:
             for index in range(*text_range):
                 x, y, w, h, base_line, byte_index = layout_data[index]
                 dh = (y - base_line) * vpos
                 layout_data[index] = (x, y + dh, w, h,
                                       base_line + dh, byte_index)
-        core.layout_path(ctx, layout)
-        cpath = ctx.copy_path()
-        m00 = 1.0
-        m11 = -1.0
-        if os.name == 'nt':
-            m00 *= 0.1
-            m11 *= 0.1
-        matrix = cairo.Matrix(m00, 0.0, 0.0, m11,
-                              layout_data[i][0], layout_data[i][1])
-        libcairo.apply_cmatrix(cpath, matrix)
-        glyphs.append(cpath)
+        trafo = get_glyph_trafo(layout_data[i][0], layout_data[i][1])
+        glyphs.append(libcairo.apply_trafo(cpath, trafo, True))
     return glyphs
 
 
@@ -264,27 +261,16 @@ def get_rtl_glyphs(ctx, layout_data, log_layout_data, byte_dict, rtl_regs,
             glyphs.append(None)
             continue
 
-        ctx.new_path()
-        ctx.move_to(0, 0)
-        layout = core.create_layout(ctx)
-        vpos = core.set_glyph_layout(txt, width, text_style,
-                                     markup, text_range, True, layout)
+        cpath, vpos = core.get_glyph_path(ctx, txt, width, text_style,
+                                          markup, text_range)
         if vpos:
             for index in range(*text_range):
                 x, y, w, h, base_line, byte_index = log_layout_data[index]
                 dh = (y - base_line) * vpos
                 log_layout_data[index] = (x, y + dh, w, h,
                                           base_line + dh, byte_index)
-        core.layout_path(ctx, layout)
-        cpath = ctx.copy_path()
-        m00 = 1.0
-        m11 = -1.0
-        if os.name == 'nt':
-            m00 *= 0.1
-            m11 *= 0.1
-        matrix = cairo.Matrix(m00, 0.0, 0.0, m11, item[0], item[1])
-        libcairo.apply_cmatrix(cpath, matrix)
-        glyphs.append(cpath)
+        trafo = get_glyph_trafo(item[0], item[1])
+        glyphs.append(libcairo.apply_trafo(cpath, trafo, True))
     return glyphs
 
 
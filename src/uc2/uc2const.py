@@ -266,6 +266,9 @@ MODEL_SAVERS = [SK2, SVG, PLT, PDF, SK1, SK, FIG]
 BITMAP_SAVERS = [PNG, ]
 PALETTE_SAVERS = [SKP, GPL, SCRIBUS_PAL, SOC, CPL, COREL_PAL, ASE, ACO, JCW]
 EXPERIMENTAL_SAVERS = [MD, RIFF, CDR, XML, CGM, WMF, ]
+# savers which translate symbol instances, for other savers
+# instances are expanded into groups
+SYMBOL_SAVERS = [SK2, SVG, PDF, PNG]
 
 PATTERN_FORMATS = [EPS, PNG, JPG, JP2, TIF, GIF, BMP, PCX, PPM, XBM, XPM]
 
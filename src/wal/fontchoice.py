@@ -28,21 +28,28 @@ class FontBitmapChoice(wx.combo.OwnerDrawnComboBox, WidgetMixin):
     sample_bitmaps = None
     font_icon = None
     control_height = 0
+    label_width = 0
+    sample_width = 0
+    sample_heights = None
 
     def __init__(self, parent, value=0, size=(10, 30),
                  fontnames=None, fontname_bitmaps=None,
-                 fontsample_bitmaps=None, font_icon=None, onchange=None):
+                 fontsample_bitmaps=None, font_icon=None, onchange=None,
+                 sample_width=0, sample_heights=None):
 
         self.fontnames = fontnames or []
         self.bitmaps = fontname_bitmaps or []
         self.sample_bitmaps = fontsample_bitmaps or []
         self.font_icon = font_icon
+        self.sample_width = sample_width
+        self.sample_heights = sample_heights or []
 
         self.font = wx.SystemSettings_GetFont(wx.SYS_DEFAULT_GUI_FONT)
         self.fontcolor = wx.Colour(*const.UI_COLORS['text'])
 
         choices = self._create_items()
         x, y = size
+        self.label_width = x
         self.control_height = y
         x += 4
         if self.font_icon:
@@ -116,17 +123,15 @@ class FontBitmapChoice(wx.combo.OwnerDrawnComboBox, WidgetMixin):
             dc.DrawLine(0, val, r.width, val)
 
     def OnMeasureItem(self, item):
+        # sample heights are measured without bitmaps rendering
         if item == wx.NOT_FOUND:
             return 1
-        val = self.bitmaps[item].GetSize()[1]
-        val += self.sample_bitmaps[item].GetSize()[1] + 7
-        return val
+        return self.control_height + self.sample_heights[item] + 7
 
     def OnMeasureItemWidth(self, item):
         if item == wx.NOT_FOUND:
             return 1
-        val = max(self.bitmaps[item].GetSize()[0],
-                  self.sample_bitmaps[item].GetSize()[0])
+        val = max(self.label_width, self.sample_width)
         if self.font_icon:
             val += self.font_icon.GetSize()[0] + 2
         return val - 4
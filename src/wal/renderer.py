@@ -147,6 +147,25 @@ def get_text_size(text, bold=False, size_incr=0):
     return result
 
 
+def get_max_text_size(texts, bold=False):
+    """
+    Returns max width and height of provided text lines.
+    """
+    font = wx.SystemSettings_GetFont(wx.SYS_DEFAULT_GUI_FONT)
+    if bold:
+        font.SetWeight(wx.FONTWEIGHT_BOLD)
+    pdc = wx.MemoryDC()
+    bmp = wx.EmptyBitmap(1, 1)
+    pdc.SelectObject(bmp)
+    pdc.SetFont(font)
+    height = pdc.GetCharHeight()
+    width = 0
+    for text in texts:
+        width = max(pdc.GetTextExtent(text)[0], width)
+    pdc.SelectObject(wx.NullBitmap)
+    return width, height
+
+
 def invert_text_bitmap(bmp, color=(0, 0, 0)):
     w, h = bmp.GetSize()
     img = bmp.ConvertToImage()
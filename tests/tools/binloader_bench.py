@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of binary loaders: per-field file reads versus buffered
+binary cursor. Loads provided WMF and CGM files (or directories
+with such files). Synthetic WMF file is used if no file is provided.
+
+Usage: python binloader_bench.py [file or directory ...]
+"""
+
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+
+from uc2.formats.cgm.cgm_filters import CgmLoader
+from uc2.formats.generic_filters import unpack_array
+from uc2.formats.wmf import wmf_const
+from uc2.formats.wmf.wmf_filters import WMF_Loader
+
+RECORDS = 20000
+POINTS = 50
+PASSES = 3
+
+LOADERS = {'wmf': WMF_Loader, 'cgm': CgmLoader}
+
+
+class StreamCursor(object):
+    """
+    Previous loader implementation: per-field file reads.
+    """
+    fileptr = None
+
+    def __init__(self, fileptr):
+        self.fileptr = fileptr
+        self.read = fileptr.read
+        self.seek = fileptr.seek
+        self.tell = fileptr.tell
+        self.close = fileptr.close
+
+    def unpack(self, fmt):
+        return struct.unpack(fmt, self.fileptr.read(struct.calcsize(fmt)))
+
+    def unpack_struct(self, st):
+        return st.unpack(self.fileptr.read(st.size))
+
+    def peek(self, fmt):
+        values = self.unpack(fmt)
+        self.fileptr.seek(-struct.calcsize(fmt), 1)
+        return values
+
+
+class StreamLoaderMixin(object):
+    def init_load(self):
+        self.fileptr = StreamCursor(self.fileptr)
+        self.do_load()
+
+
+class Presenter(object):
+    model = None
+    config = None
+
+
+def make_wmf(path, records):
+    random.seed(0)
+    body = []
+    for _i in range(records):
+        points = [random.randint(-10000, 10000) for _j in range(POINTS * 2)]
+        params = struct.pack('<h%dh' % len(points), POINTS, *points)
+        size = (6 + len(params)) // 2
+        body.append(struct.pack('<IH', size, wmf_const.META_POLYLINE) +
+                    params)
+    body.append(wmf_const.EOF_RECORD)
+    body = ''.join(body)
+    header = struct.pack(wmf_const.STRUCT_HEADER, 1, 9, 0x300,
+                         (18 + len(body)) // 2, 0, POINTS * 2 + 4, 0)
+    with open(path, 'wb') as fileptr:
+        fileptr.write(header + body)
+
+
+def collect_files(args):
+    files = []
+    for item in args:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                files.append(os.path.join(item, name))
+        else:
+            files.append(item)
+    return [item for item in files
+            if item.rsplit('.', 1)[-1].lower() in LOADERS]
+
+
+def measure(name, func, *args):
+    start = time.time()
+    for _i in range(PASSES):
+        result = func(*args)
+    print('%-36s %8.3f sec' % (name, (time.time() - start) / PASSES))
+    return result
+
+
+def decode_points(model):
+    points = 0
+    for record in model.childs:
+        chunk = record.chunk[6:]
+        if len(chunk) > 2:
+            num = struct.unpack('<h', chunk[:2])[0]
+            for i in range(num):
+                struct.unpack('<hh', chunk[2 + i * 4:6 + i * 4])
+            points += num
+    return points
+
+
+def decode_point_arrays(model):
+    points = 0
+    for record in model.childs:
+        chunk = record.chunk[6:]
+        if len(chunk) > 2:
+            num = struct.unpack('<h', chunk[:2])[0]
+            points += len(unpack_array('<hh', chunk, num, 2))
+    return points
+
+
+def main():
+    files = collect_files(sys.argv[1:])
+    tmp = None
+    if not files:
+        tmp = tempfile.mktemp(suffix='.wmf')
+        make_wmf(tmp, RECORDS)
+        files = [tmp]
+    try:
+        for path in files:
+            loader = LOADERS[path.rsplit('.', 1)[-1].lower()]
+            stream_loader = type('Stream' + loader.__name__,
+                                 (StreamLoaderMixin, loader), {})
+            print('\n%s (%d bytes)' % (path, os.path.getsize(path)))
+            measure('per-field reads', stream_loader().load,
+                    Presenter(), path)
+            model = measure('buffered cursor', loader().load,
+                            Presenter(), path)
+            if loader is WMF_Loader:
+                if len(model.childs) == 1:
+                    # placeable header
+                    model = model.childs[0]
+                measure('points, per-point unpack', decode_points, model)
+                measure('points, array unpack', decode_point_arrays, model)
+    finally:
+        if tmp:
+            os.remove(tmp)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of color manager transforms: uncached single color calls,
+cached calls (repeated redraw of the same colors) and batched
+conversion (palette import).
+
+Usage: python cms_bench.py [colors number] [passes number]
+"""
+
+import random
+import sys
+import time
+
+from uc2 import cms, uc2const
+from uc2.cms import libcms
+
+COLORS = 2000
+PASSES = 10
+
+
+def make_colors(num):
+    random.seed(0)
+    colors = []
+    for _i in range(num):
+        values = [round(random.random(), 2) for _j in range(4)]
+        colors.append([uc2const.COLOR_CMYK, values, 1.0, ''])
+    return colors
+
+
+def uncached_transform(cm, color, cs_in, cs_out):
+    in_color = cms.colorb(color)
+    out_color = cms.colorb()
+    transform = cm.get_transform(cs_in, cs_out)
+    libcms.cms_do_transform(transform, in_color, out_color)
+    return cms.decode_colorb(out_color, cs_out)
+
+
+def measure(name, func):
+    start = time.time()
+    func()
+    print('%-36s %8.3f sec' % (name, time.time() - start))
+
+
+def main():
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else COLORS
+    passes = int(sys.argv[2]) if len(sys.argv) > 2 else PASSES
+    colors = make_colors(num)
+    cm = cms.ColorManager()
+    rgb, cmyk = uc2const.COLOR_RGB, uc2const.COLOR_CMYK
+    print('Colors: %d, passes: %d' % (num, passes))
+
+    def redraw_uncached():
+        for _i in range(passes):
+            for color in colors:
+                uncached_transform(cm, color, cmyk, rgb)
+
+    def redraw_cached():
+        for _i in range(passes):
+            for color in colors:
+                cm.get_display_color(color)
+
+    def export_cmyk():
+        for _i in range(passes):
+            for color in colors:
+                cm.get_cmyk_color([rgb, color[1][:3], 1.0, ''])
+
+    def palette_single():
+        cm.clear_transforms()
+        for color in colors:
+            cm.get_rgb_color(color)
+
+    def palette_batch():
+        cm.clear_transforms()
+        cm.get_rgb_colors(colors)
+
+    measure('redraw, uncached transforms', redraw_uncached)
+    measure('redraw, cached transforms', redraw_cached)
+    measure('CMYK export, cached transforms', export_cmyk)
+    measure('palette import, single calls', palette_single)
+    measure('palette import, batched call', palette_batch)
+
+
+if __name__ == '__main__':
+    main()
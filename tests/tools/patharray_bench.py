@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of list based and array backed (NumPy) path routines.
+
+Usage: python patharray_bench.py [nodes number]
+"""
+
+import math
+import random
+import sys
+import time
+
+from uc2 import libgeom
+from uc2.libgeom import patharray
+
+NODES = 1000000
+NODES_PER_PATH = 100
+TRAFO = [0.5, 0.1, -0.1, 0.5, 10.0, 20.0]
+
+
+def make_paths(nodes):
+    random.seed(0)
+    paths = []
+    for _i in range(nodes // NODES_PER_PATH):
+        x, y = random.uniform(0, 1000), random.uniform(0, 1000)
+        points = []
+        for j in range(NODES_PER_PATH - 1):
+            x1, y1 = x + random.uniform(-5, 5), y + random.uniform(-5, 5)
+            if j % 2:
+                points.append([x1, y1])
+            else:
+                points.append([[x + 1.0, y + 2.0], [x1 - 2.0, y1 - 1.0],
+                               [x1, y1], 0])
+            x, y = x1, y1
+        paths.append([points[0][2], points[1:], 1])
+    return paths
+
+
+def measure(name, func, *args):
+    start = time.time()
+    result = func(*args)
+    print('%-32s %8.3f sec' % (name, time.time() - start))
+    return result
+
+
+def main():
+    if not patharray.HAS_NUMPY:
+        print('NumPy is not installed')
+        return
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else NODES
+    paths = make_paths(nodes)
+    print('Paths: %d, nodes: %d' % (len(paths), nodes))
+
+    print('\n--- list form')
+    measure('apply_trafo_to_paths', libgeom.apply_trafo_to_paths,
+            paths, TRAFO)
+    measure('flat_paths', libgeom.flat_paths, paths)
+    length = measure('get_paths_length',
+                     lambda items: sum([libgeom.get_path_length(item)
+                                        for item in items]), paths)
+    bbox = measure('get_paths_bbox', libgeom.get_paths_bbox, paths)
+
+    print('\n--- array form')
+    arr = measure('paths_to_array', patharray.paths_to_array, paths)
+    measure('apply_trafo', arr.apply_trafo, TRAFO)
+    measure('flatten', arr.flatten)
+    arr_length = measure('get_length', arr.get_length)
+    arr_bbox = measure('get_bbox', arr.get_bbox)
+    restored = measure('to_paths', arr.to_paths)
+
+    print('\nLossless conversion: %s' % (restored == paths))
+    print('Length: %f / %f' % (length, arr_length))
+    print('Bbox: %s / %s' % (bbox, arr_bbox))
+    if not math.fabs(length - arr_length) < 1e-2 * length:
+        print('Lengths differ more than 1%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of progress reporting in export loop: direct FILTER_INFO
+signals, rate-limited progress and disabled progress (headless mode).
+Listener emulates progress dialog repaint cost.
+
+Usage: python progress_bench.py [objects number] [pages number]
+"""
+
+import sys
+import time
+
+from uc2 import events
+
+OBJECTS = 200000
+PAGES = 4
+REPAINT_COST = 0.0002  # in sec
+
+
+class Listener(object):
+    calls = 0
+
+    def __call__(self, msg, position):
+        self.calls += 1
+        end = time.time() + REPAINT_COST
+        while time.time() < end:
+            pass
+
+
+def export_emit(objs, pages):
+    for page in range(pages):
+        for index in range(objs):
+            position = (page + float(index + 1) / objs) / pages
+            events.emit(events.FILTER_INFO, 'Exporting', position)
+
+
+def export_progress(objs, pages):
+    for page in range(pages):
+        start = float(page) / pages
+        with events.progress_range(start, start + 1.0 / pages):
+            for index in range(objs):
+                events.progress('Exporting', float(index + 1) / objs)
+    events.flush_progress()
+
+
+def measure(name, func, objs, pages):
+    listener = Listener()
+    events.PROGRESS.reset()
+    events.connect(events.FILTER_INFO, listener)
+    start = time.time()
+    func(objs, pages)
+    print('%-28s %8.3f sec %8d updates' %
+          (name, time.time() - start, listener.calls))
+    events.disconnect(events.FILTER_INFO, listener)
+
+
+def main():
+    objs = int(sys.argv[1]) if len(sys.argv) > 1 else OBJECTS
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else PAGES
+    objs = max(objs // pages, 1)
+    print('Objects per page: %d, pages: %d' % (objs, pages))
+
+    measure('direct signals', export_emit, objs, pages)
+    measure('rate-limited progress', export_progress, objs, pages)
+    events.set_progress_enabled(False)
+    measure('disabled progress', export_progress, objs, pages)
+    events.set_progress_enabled(True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of shaping operations: nested loops over all pairs of
+approximated path chunks versus bbox sweep of chunks. Both
+implementations are applied to synthetic wavy star-like curves
+of increasing size and results are checked for equality.
+
+Usage: python shaping_bench.py [curve nodes number ...]
+"""
+
+import math
+import random
+import sys
+import time
+
+from uc2 import sk2const
+from uc2.libgeom import shaping
+from uc2.libgeom.bbox import is_bbox_overlap
+
+SIZES = (50, 100, 200, 400, 800)
+PASSES = 3
+
+OPERATIONS = (
+    ('intersect_paths', shaping.intersect_paths),
+    ('fuse_paths', shaping.fuse_paths),
+    ('trim_paths', shaping.trim_paths),
+    ('excluse_paths', shaping.excluse_paths),
+)
+
+
+def get_chunk_pairs_nested(approx_paths, self_check=False):
+    """
+    Previous implementation: checks bbox of every chunk pair
+    in nested loops.
+    """
+    pairs = []
+    if self_check:
+        partials = approx_paths[0]
+        for i in range(-1, len(partials) - 1):
+            for j in range(-1, len(partials) - 1):
+                if i != j and is_bbox_overlap(partials[i][2], partials[j][2]):
+                    pairs.append((partials[i], partials[j]))
+        return pairs
+    for i in range(len(approx_paths)):
+        for j in range(i + 1, len(approx_paths)):
+            for chunk1 in approx_paths[i]:
+                for chunk2 in approx_paths[j]:
+                    if is_bbox_overlap(chunk1[2], chunk2[2]):
+                        pairs.append((chunk1, chunk2))
+    return pairs
+
+
+def make_curve(nodes, center, radius):
+    points = []
+    for i in range(nodes):
+        angle = 2.0 * math.pi * i / nodes
+        r = radius * random.uniform(0.8, 1.2)
+        x = center[0] + r * math.cos(angle)
+        y = center[1] + r * math.sin(angle)
+        if i % 2:
+            points.append([x, y])
+        else:
+            d = radius * 0.05
+            points.append([[x - d, y + d], [x + d, y - d], [x, y],
+                           sk2const.NODE_CUSP])
+    start = points[-1] if len(points[-1]) == 2 else points[-1][2]
+    return [[start[:], points, sk2const.CURVE_CLOSED]]
+
+
+def make_loop(nodes, center, radius):
+    # self-intersecting figure-eight like path
+    points = []
+    for i in range(nodes + 1):
+        t = 2.0 * math.pi * (i + 0.5) / nodes
+        points.append([center[0] + radius * math.sin(2 * t),
+                       center[1] + radius * math.sin(t)])
+    return [points[0], points[1:], sk2const.CURVE_CLOSED]
+
+
+def self_intersect(path):
+    curve = shaping.CurveObject([path])
+    return [item.get_path() for item in shaping.self_intersect(curve)]
+
+
+def measure(func, *args):
+    start = time.time()
+    for _i in range(PASSES):
+        result = func(*args)
+    return result, (time.time() - start) / PASSES
+
+
+def compare(nodes, func, *args):
+    get_chunk_pairs = shaping.get_chunk_pairs
+    shaping.get_chunk_pairs = get_chunk_pairs_nested
+    try:
+        result1, time1 = measure(func, *args)
+    finally:
+        shaping.get_chunk_pairs = get_chunk_pairs
+    result2, time2 = measure(func, *args)
+    print('%8d %12.3f sec %12.3f sec %8s' %
+          (nodes, time1, time2, repr(result1) == repr(result2)))
+
+
+def main():
+    sizes = [int(item) for item in sys.argv[1:]] or SIZES
+    tests = [(name, func, False) for name, func in OPERATIONS]
+    tests.append(('self_intersect', self_intersect, True))
+    for name, func, loop in tests:
+        print('\n%s' % name)
+        print('%8s %16s %16s %8s' %
+              ('nodes', 'nested loops', 'bbox sweep', 'equal'))
+        for nodes in sizes:
+            random.seed(0)
+            if loop:
+                args = (make_loop(nodes, (0.0, 0.0), 100.0),)
+            else:
+                args = (make_curve(nodes, (0.0, 0.0), 100.0),
+                        make_curve(nodes, (50.0, 30.0), 100.0))
+            compare(nodes, func, *args)
+
+
+if __name__ == '__main__':
+    main()
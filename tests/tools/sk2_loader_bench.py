@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of SK2 loader: compile/exec of every document line versus
+SK2 line parser. Loads provided SK2 files (or directories with such
+files) by both loaders, reports load time and peak memory (RSS) of
+each loader in separate process and checks that loaded models are
+equal. Synthetic SK2 file is used if no file is provided.
+
+Usage: python sk2_loader_bench.py [file or directory ...]
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from uc2 import sk2const
+from uc2.formats.sk2.sk2_config import SK2_Config
+from uc2.formats.sk2.sk2_filters import SK2_Loader
+
+CURVES = 20000
+NODES = 20
+PASSES = 3
+
+# Object references which differ between any two loaded models
+SKIP_FIELDS = ('config', 'childs', 'parent', 'handler')
+
+STYLE = "[[1, 0, ['CMYK', [0.0, 0.0, 0.0, 1.0], 1.0, 'Black']], " \
+        "[0, 0.283, ['RGB', [0.0, 0.0, 0.0], 1.0, ''], [], 1, 0, " \
+        "10.433, 0, 0, []], [], []]"
+
+
+class ExecLoader(SK2_Loader):
+    """
+    Previous loader implementation: compile/exec of every line.
+    """
+
+    def process_line(self, line):
+        code = compile('self.' + line, '<string>', 'exec')
+        exec code
+
+
+class Presenter(object):
+    model = None
+    config = None
+
+    def __init__(self):
+        self.config = SK2_Config()
+
+
+LOADERS = (('compile/exec', ExecLoader), ('line parser', SK2_Loader))
+
+
+def make_sk2(fileptr, curves):
+    random.seed(0)
+    lines = [sk2const.SK2DOC_ID + sk2const.SK2VER,
+             "obj('Document')", "set_field('doc_units','mm')",
+             "obj('Pages')", "obj('Page')",
+             "set_field('name','Page 1')",
+             "set_field('page_format',['A4', (595.27, 841.88), 0])",
+             "obj('Layer')", "set_field('name','Layer 1')"]
+    for _i in range(curves):
+        start = [random.uniform(0, 500), random.uniform(0, 800)]
+        points = [[random.uniform(0, 500), random.uniform(0, 800)]
+                  for _j in range(NODES)]
+        lines += ["obj('Curve')",
+                  "set_field('paths',%s)" % repr([[start, points, 1]]),
+                  "set_field('style',%s)" % STYLE,
+                  "set_field('trafo',[1.0, 0.0, 0.0, 1.0, 0.0, 0.0])",
+                  "obj_end()"]
+    lines += ["obj_end()"] * 4
+    with os.fdopen(fileptr, 'wb') as fileobj:
+        fileobj.write('\n'.join(lines) + '\n')
+
+
+def collect_files(args):
+    files = []
+    for item in args:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                files.append(os.path.join(item, name))
+        else:
+            files.append(item)
+    return [item for item in files if item.lower().endswith('.sk2')]
+
+
+def run_load(name, path):
+    loader = dict(LOADERS)[name]
+    start = time.time()
+    for _i in range(PASSES):
+        loader().load(Presenter(), path)
+    elapsed = (time.time() - start) / PASSES
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    print('%8.3f sec %8.1f MB' % (elapsed, peak))
+
+
+def measure(name, path):
+    cmd = [sys.executable, __file__, '--load', name, path]
+    output = subprocess.check_output(cmd).strip().splitlines()
+    print('%-36s %s' % (name, output[-1] if output else ''))
+
+
+def compare_models(obj1, obj2):
+    fields1 = dict((key, value) for key, value in obj1.__dict__.items()
+                   if key not in SKIP_FIELDS)
+    fields2 = dict((key, value) for key, value in obj2.__dict__.items()
+                   if key not in SKIP_FIELDS)
+    if obj1.cid != obj2.cid or repr(fields1) != repr(fields2) or \
+            len(obj1.childs) != len(obj2.childs):
+        return False
+    for child1, child2 in zip(obj1.childs, obj2.childs):
+        if not compare_models(child1, child2):
+            return False
+    return True
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--load':
+        run_load(sys.argv[2], sys.argv[3])
+        return
+
+    files = collect_files(sys.argv[1:])
+    tmp = None
+    if not files:
+        fileptr, tmp = tempfile.mkstemp(suffix='.sk2')
+        make_sk2(fileptr, CURVES)
+        files = [tmp]
+    try:
+        for path in files:
+            print('\n%s (%d bytes)' % (path, os.path.getsize(path)))
+            for name, _loader in LOADERS:
+                measure(name, path)
+            model1 = ExecLoader().load(Presenter(), path)
+            model2 = SK2_Loader().load(Presenter(), path)
+            print('models are equal: %s' % compare_models(model1, model2))
+    finally:
+        if tmp:
+            os.remove(tmp)
+
+
+if __name__ == '__main__':
+    main()
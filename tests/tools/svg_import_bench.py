@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of SVG import: two-stage import (XML model and translation)
+versus streaming import (translation while parsing). Each import is
+executed in separate process to measure peak memory usage.
+Synthetic map-like SVG file is used if no file is provided.
+
+Usage: python svg_import_bench.py [file or paths number]
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+PATHS = 100000
+LAYERS = 10
+NODES = 20
+CLONES = 100
+
+MODES = (('two-stage import', -1), ('streaming import', 0))
+
+HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n' \
+         '<svg xmlns="http://www.w3.org/2000/svg" ' \
+         'xmlns:xlink="http://www.w3.org/1999/xlink" ' \
+         'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" ' \
+         'width="1000mm" height="1000mm" viewBox="0 0 1000 1000">\n' \
+         '<defs><linearGradient id="grad">' \
+         '<stop offset="0" stop-color="#ff0000"/>' \
+         '<stop offset="1" stop-color="#0000ff"/></linearGradient></defs>\n'
+
+
+def make_svg(path, paths):
+    random.seed(0)
+    with open(path, 'wb') as fileptr:
+        fileptr.write(HEADER)
+        for layer in range(LAYERS):
+            fileptr.write('<g inkscape:groupmode="layer" id="layer%d" '
+                          'inkscape:label="Layer %d">\n' % (layer, layer))
+            for index in range(paths // LAYERS):
+                x, y = random.uniform(0, 1000), random.uniform(0, 1000)
+                cmds = ['M%.2f,%.2f' % (x, y)]
+                for _i in range(NODES):
+                    x += random.uniform(-5, 5)
+                    y += random.uniform(-5, 5)
+                    cmds.append('L%.2f,%.2f' % (x, y))
+                fill = 'url(#grad)' if not index % 50 else '#%06x' % \
+                    random.randint(0, 0xffffff)
+                fileptr.write('<path id="path%d-%d" d="%s z" fill="%s" '
+                              'stroke="#000000" stroke-width="0.1"/>\n' %
+                              (layer, index, ' '.join(cmds), fill))
+            fileptr.write('</g>\n')
+        for index in range(CLONES):
+            fileptr.write('<use xlink:href="#path0-%d" x="10" y="10"/>\n'
+                          % index)
+        fileptr.write('</svg>\n')
+
+
+def run_import(path, stream_size):
+    from uc2 import uc2_init
+    from uc2.formats.svg import svg_loader
+
+    appdata = uc2_init().appdata
+    start = time.time()
+    doc = svg_loader(appdata, path, stream_size=stream_size)
+    elapsed = time.time() - start
+    objs = doc.model.count()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    print('%8.3f sec %10.1f MB %10d objects' % (elapsed, peak, objs))
+
+
+def measure(name, path, stream_size):
+    cmd = [sys.executable, __file__, '--import', path, str(stream_size)]
+    output = subprocess.check_output(cmd).strip().splitlines()
+    print('%-20s %s' % (name, output[-1] if output else ''))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--import':
+        run_import(sys.argv[2], float(sys.argv[3]))
+        return
+
+    tmp = None
+    if len(sys.argv) > 1 and os.path.exists(sys.argv[1]):
+        path = sys.argv[1]
+    else:
+        paths = int(sys.argv[1]) if len(sys.argv) > 1 else PATHS
+        path = tmp = tempfile.mktemp(suffix='.svg')
+        make_svg(path, paths)
+    try:
+        print('%s (%d bytes)' % (path, os.path.getsize(path)))
+        for name, stream_size in MODES:
+            measure(name, path, stream_size)
+    finally:
+        if tmp:
+            os.remove(tmp)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of SVG path data parsing: character scanning tokenizer
+versus regular expression tokenizer. Before benchmarking both
+tokenizers are fuzz-tested for equivalence on random path data.
+
+Usage: python svgpath_bench.py [path commands number] [fuzz cases number]
+"""
+
+import random
+import re
+import sys
+import time
+
+from uc2.formats.svg import svg_utils
+
+COMMANDS = 1000000
+FUZZ_CASES = 20000
+SEGMENT = 1000
+
+ARGS_NUM = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4,
+            'Q': 4, 'T': 2, 'A': 7, 'Z': 0}
+
+
+def legacy_tokens(pathcmds):
+    """
+    Previous tokenizer: per character scanning and coordinates
+    parsing by svg_utils.parse_svg_coords().
+    """
+    index = 0
+    last = None
+    last_index = 0
+    cmds = []
+    pathcmds = re.sub('  *', ' ', pathcmds)
+    for item in pathcmds:
+        if item in 'MmZzLlHhVvCcSsQqTtAa':
+            if last:
+                coords = svg_utils.parse_svg_coords(
+                    pathcmds[last_index + 1:index])
+                cmds.append((last, coords))
+            last = item
+            last_index = index
+        index += 1
+    coords = svg_utils.parse_svg_coords(pathcmds[last_index + 1:index])
+    cmds.append((last, coords))
+    return cmds
+
+
+def format_number(value):
+    sval = random.choice(['%d', '%.1f', '%.3f', '%g', '%.2e']) % value
+    if sval.startswith('0.') and random.random() < 0.3:
+        sval = sval[1:]
+    elif sval.startswith('-0.') and random.random() < 0.3:
+        sval = '-' + sval[2:]
+    return sval
+
+
+def join_numbers(items):
+    result = ''
+    for item in items:
+        if result:
+            sep = random.choice([' ', ',', ', ', '  '])
+            if item[0] == '-' and random.random() < 0.5:
+                sep = ''
+            result += sep
+        result += item
+    return result
+
+
+def make_fuzz_path():
+    cmds = ['M' + join_numbers([format_number(random.uniform(-500, 500))
+                                for _i in range(2)])]
+    for _i in range(random.randint(1, 12)):
+        cmd = random.choice('MLHVCSQTAZ')
+        repeats = random.randint(1, 3) if cmd != 'Z' else 1
+        items = []
+        for _j in range(repeats):
+            if cmd == 'A':
+                items += [format_number(random.uniform(1, 100)),
+                          format_number(random.uniform(1, 100)),
+                          format_number(random.uniform(-90, 90)),
+                          str(random.randint(0, 1)), str(random.randint(0, 1)),
+                          format_number(random.uniform(-500, 500)),
+                          format_number(random.uniform(-500, 500))]
+            else:
+                items += [format_number(random.uniform(-500, 500))
+                          for _k in range(ARGS_NUM[cmd])]
+        if random.random() < 0.5:
+            cmd = cmd.lower()
+        cmds.append(cmd + random.choice(['', ' ']) + join_numbers(items))
+    return random.choice([' ', '']).join(cmds)
+
+
+def fuzz(cases):
+    random.seed(0)
+    for _i in range(cases):
+        pathcmds = make_fuzz_path()
+        expected = [(cmd, coords or [])
+                    for cmd, coords in legacy_tokens(pathcmds)]
+        result = svg_utils.parse_svg_path_tokens(pathcmds)
+        if result != expected:
+            print('Mismatch for "%s"' % pathcmds)
+            return False
+        if svg_utils.get_svg_paths(legacy_tokens(pathcmds)) != \
+                svg_utils.parse_svg_path_cmds(pathcmds):
+            print('Paths mismatch for "%s"' % pathcmds)
+            return False
+    print('%d fuzz cases are equivalent' % cases)
+    return True
+
+
+def make_gis_paths(commands):
+    random.seed(0)
+    paths = []
+    for _i in range(max(commands // SEGMENT, 1)):
+        x, y = random.uniform(0, 10000), random.uniform(0, 10000)
+        cmds = ['M%.3f,%.3f' % (x, y)]
+        for j in range(SEGMENT - 1):
+            dx, dy = random.uniform(-5, 5), random.uniform(-5, 5)
+            if j % 2:
+                cmds.append('l%.3f,%.3f' % (dx, dy))
+            else:
+                cmds.append('%.3f %.3f' % (x + dx, y + dy))
+        paths.append(' '.join(cmds) + 'z')
+    return paths
+
+
+def measure(name, func, paths):
+    start = time.time()
+    for pathcmds in paths:
+        func(pathcmds)
+    print('%-36s %8.3f sec' % (name, time.time() - start))
+
+
+def main():
+    commands = int(sys.argv[1]) if len(sys.argv) > 1 else COMMANDS
+    cases = int(sys.argv[2]) if len(sys.argv) > 2 else FUZZ_CASES
+    if not fuzz(cases):
+        sys.exit(1)
+    paths = make_gis_paths(commands)
+    print('Path commands: %d' % commands)
+    measure('tokens, character scanning', legacy_tokens, paths)
+    measure('tokens, regular expressions',
+            svg_utils.parse_svg_path_tokens, paths)
+    measure('paths, character scanning',
+            lambda item: svg_utils.get_svg_paths(legacy_tokens(item)), paths)
+    measure('paths, regular expressions',
+            svg_utils.parse_svg_path_cmds, paths)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2019 by Igor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of repeated content: SVG <use> elements imported as object
+copies versus symbol instances. Each import is executed in separate
+process to measure peak memory usage, imported document is saved
+as SK2 and SVG files to compare file sizes.
+Synthetic map-like SVG file (markers placed many times) is used
+if no file is provided.
+
+Usage: python symbol_bench.py [file or markers number]
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+MARKERS = 20000
+SYMBOLS = 10
+NODES = 40
+
+MODES = (('object copies', 0), ('symbol instances', 1))
+
+HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n' \
+         '<svg xmlns="http://www.w3.org/2000/svg" ' \
+         'xmlns:xlink="http://www.w3.org/1999/xlink" ' \
+         'width="1000mm" height="1000mm" viewBox="0 0 1000 1000">\n'
+
+
+def make_svg(path, markers):
+    random.seed(0)
+    with open(path, 'wb') as fileptr:
+        fileptr.write(HEADER + '<defs>\n')
+        for index in range(SYMBOLS):
+            cmds = []
+            for node in range(NODES):
+                x, y = random.uniform(-5, 5), random.uniform(-5, 5)
+                cmds.append('%s%.2f,%.2f' % ('L' if node else 'M', x, y))
+            fileptr.write('<g id="marker%d"><path d="%s z" fill="#%06x" '
+                          'stroke="#000000" stroke-width="0.2"/>'
+                          '<circle r="1" fill="#ffffff"/></g>\n' %
+                          (index, ' '.join(cmds), random.randint(0, 0xffffff)))
+        fileptr.write('</defs>\n')
+        for _i in range(markers):
+            fileptr.write('<use xlink:href="#marker%d" transform="'
+                          'translate(%.2f,%.2f) rotate(%.1f)"/>\n' %
+                          (random.randint(0, SYMBOLS - 1),
+                           random.uniform(0, 1000), random.uniform(0, 1000),
+                           random.uniform(0, 360)))
+        fileptr.write('</svg>\n')
+
+
+def run_import(path, use_symbols):
+    from uc2 import uc2_init
+    from uc2.formats.sk2 import sk2_saver
+    from uc2.formats.svg import svg_loader, svg_saver
+
+    appdata = uc2_init().appdata
+    start = time.time()
+    doc = svg_loader(appdata, path, use_symbols=use_symbols)
+    elapsed = time.time() - start
+    objs = doc.model.count()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+    sizes = []
+    for ext, saver in (('.sk2', sk2_saver), ('.svg', svg_saver)):
+        filename = tempfile.mktemp(suffix=ext)
+        doc.config.preview = False
+        saver(doc, filename)
+        sizes.append(os.path.getsize(filename) / 1024.0)
+        os.remove(filename)
+    print('%8.3f sec %8.1f MB %8d objects %8.1f KB sk2 %8.1f KB svg' %
+          ((elapsed, peak, objs) + tuple(sizes)))
+
+
+def measure(name, path, use_symbols):
+    cmd = [sys.executable, __file__, '--import', path, str(use_symbols)]
+    output = subprocess.check_output(cmd).strip().splitlines()
+    print('%-18s %s' % (name, output[-1] if output else ''))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--import':
+        run_import(sys.argv[2], bool(int(sys.argv[3])))
+        return
+
+    tmp = None
+    if len(sys.argv) > 1 and os.path.exists(sys.argv[1]):
+        path = sys.argv[1]
+    else:
+        markers = int(sys.argv[1]) if len(sys.argv) > 1 else MARKERS
+        path = tmp = tempfile.mktemp(suffix='.svg')
+        make_svg(path, markers)
+    try:
+        print('%s (%d bytes)' % (path, os.path.getsize(path)))
+        for name, use_symbols in MODES:
+            measure(name, path, use_symbols)
+    finally:
+        if tmp:
+            os.remove(tmp)
+
+
+if __name__ == '__main__':
+    main()
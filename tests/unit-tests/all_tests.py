@@ -19,10 +19,24 @@ import unittest
 import cms_testsuite
 import _libimg_testsuite
 import image_testsuite
+import sk2_testsuite
+import surfcache_testsuite
+import plt_testsuite
+import symbol_testsuite
+import sniffer_testsuite
+import riff_testsuite
+import svg_testsuite
 
 suite = unittest.TestSuite()
 suite.addTest(cms_testsuite.get_suite())
 suite.addTest(_libimg_testsuite.get_suite())
 suite.addTest(image_testsuite.get_suite())
+suite.addTest(sk2_testsuite.get_suite())
+suite.addTest(surfcache_testsuite.get_suite())
+suite.addTest(plt_testsuite.get_suite())
+suite.addTest(symbol_testsuite.get_suite())
+suite.addTest(sniffer_testsuite.get_suite())
+suite.addTest(riff_testsuite.get_suite())
+suite.addTest(svg_testsuite.get_suite())
 
 unittest.TextTestRunner(verbosity=2).run(suite)
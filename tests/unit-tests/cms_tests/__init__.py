@@ -452,4 +452,39 @@ class TestCmsFunctions(unittest.TestCase):
 		except libcms.CmsError:
 			self.fail()
 
-
+	#---Batched transform related tests
+
+	def check_transform_many(self, in_profile, in_mode, out_profile, out_mode,
+							channels=4):
+		transform = libcms.cms_create_transform(in_profile, in_mode,
+						out_profile, out_mode, uc2const.INTENT_PERCEPTUAL,
+						uc2const.cmsFLAGS_NOTPRECALC)
+		colors = [[0, 0, 0, 0], [255, 255, 255, 255], [100, 190, 150, 20],
+				[10, 128, 250, 100], [255, 0, 0, 0]]
+		result = libcms.cms_do_transform_many(transform, colors)
+		self.assertEqual(len(colors), len(result))
+		for color, item in zip(colors, result):
+			out_color = [0, 0, 0, 0]
+			libcms.cms_do_transform(transform, color, out_color)
+			self.assertEqual(4, len(item))
+			self.assertEqual(out_color[:channels], item[:channels])
+
+	def test34_do_transform_many(self):
+		self.check_transform_many(self.inProfile, uc2const.TYPE_RGBA_8,
+						self.outProfile, uc2const.TYPE_CMYK_8)
+		self.check_transform_many(self.outProfile, uc2const.TYPE_CMYK_8,
+						self.inProfile, uc2const.TYPE_RGBA_8)
+
+	def test35_do_transform_many_with_gray(self):
+		gray_profile = libcms.cms_create_gray_profile()
+		self.check_transform_many(self.inProfile, uc2const.TYPE_RGBA_8,
+						gray_profile, uc2const.TYPE_GRAY_8, 1)
+		self.check_transform_many(gray_profile, uc2const.TYPE_GRAY_8,
+						self.outProfile, uc2const.TYPE_CMYK_8)
+
+	def test36_do_transform_many_with_lab(self):
+		lab_profile = libcms.cms_create_lab_profile()
+		self.check_transform_many(self.inProfile, uc2const.TYPE_RGBA_8,
+						lab_profile, uc2const.COLOR_LAB, 3)
+		self.check_transform_many(lab_profile, uc2const.COLOR_LAB,
+						self.outProfile, uc2const.TYPE_CMYK_8)
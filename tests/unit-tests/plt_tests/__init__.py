@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+#	Copyright (C) 2019 by Igor E. Novikov
+#
+#	This program is free software: you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation, either version 3 of the License, or
+#	(at your option) any later version.
+#
+#	This program is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from uc2.formats.plt import plt_optimizer
+
+
+def make_square(x0, y0, x1, y1):
+	points = [[x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+	return [[x0, y0], points, 0]
+
+
+def make_line(x0, y0, x1, y1):
+	return [[x0, y0], [[x1, y1]], 0]
+
+
+class TestTravelOptimizerFunctions(unittest.TestCase):
+
+	def get_index(self, paths, path):
+		points = [path[0]] + path[1]
+		for i, item in enumerate(paths):
+			item_points = [item[0]] + item[1]
+			if sorted(item_points) == sorted(points):
+				return i
+		return None
+
+	def test01_travel_distance(self):
+		paths = [make_line(10, 0, 20, 0), make_line(20, 10, 0, 10)]
+		self.assertEqual(20.0, plt_optimizer.get_travel_distance(paths))
+
+	def test02_nearest_order(self):
+		far = make_line(100, 0, 110, 0)
+		near = make_line(10, 0, 20, 0)
+		optimizer = plt_optimizer.TravelOptimizer()
+		result = optimizer.optimize([far, near])
+		self.assertEqual(near, result[0])
+		self.assertEqual(far, result[1])
+		self.assertTrue(optimizer.travel_after < optimizer.travel_before)
+
+	def test03_reverse_paths(self):
+		paths = [make_line(20, 0, 10, 0)]
+		result = plt_optimizer.TravelOptimizer().optimize(paths)
+		self.assertEqual(make_line(10, 0, 20, 0), result[0])
+		result = plt_optimizer.TravelOptimizer(False).optimize(paths)
+		self.assertEqual(paths[0], result[0])
+
+	def test04_inner_first(self):
+		outer = make_square(0, 0, 100, 100)
+		inner = make_square(1, 1, 2, 2)
+		optimizer = plt_optimizer.TravelOptimizer(inner_first=True)
+		result = optimizer.optimize([outer, inner])
+		self.assertEqual(0, self.get_index(result, inner))
+		self.assertEqual(1, self.get_index(result, outer))
+
+	def test05_inner_first_disabled(self):
+		outer = make_square(0, 0, 100, 100)
+		inner = make_square(1, 1, 2, 2)
+		optimizer = plt_optimizer.TravelOptimizer(inner_first=False)
+		result = optimizer.optimize([outer, inner])
+		self.assertEqual(0, self.get_index(result, outer))
+
+	def test06_fallback_to_source_order(self):
+		# nearest neighbour chain is longer than source order
+		paths = [make_line(2, 0, -3, 5), make_line(3, 0, -3, 2),
+				 make_line(-1, 1, -2, 1)]
+		optimizer = plt_optimizer.TravelOptimizer(False, False, False)
+		jobs = [plt_optimizer.CutJob(path) for path in paths]
+		greedy = [job.get_path() for job in
+				  optimizer.order_nearest(jobs, (0.0, 0.0))]
+		self.assertTrue(plt_optimizer.get_travel_distance(greedy) >
+						plt_optimizer.get_travel_distance(paths))
+		result = optimizer.optimize(paths)
+		self.assertTrue(result is paths)
+		self.assertEqual(optimizer.travel_before, optimizer.travel_after)
+
+	def test07_fallback_keeps_nesting(self):
+		# source order is shorter but cuts outer contour first
+		outer = make_square(0, 0, 100, 100)
+		inner = make_square(99, 99, 98, 98)
+		optimizer = plt_optimizer.TravelOptimizer(False, False, True)
+		result = optimizer.optimize([outer, inner])
+		self.assertTrue(optimizer.travel_after > optimizer.travel_before)
+		self.assertEqual(0, self.get_index(result, inner))
+		self.assertEqual(1, self.get_index(result, outer))
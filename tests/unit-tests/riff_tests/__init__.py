@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+#	Copyright (C) 2019 by Igor E. Novikov
+#
+#	This program is free software: you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation, either version 3 of the License, or
+#	(at your option) any later version.
+#
+#	This program is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+from uc2.utils import py_int2dword
+from uc2.formats.riff import model
+from uc2.formats.riff.riff_filters import RIFF_Loader, MappedRiffParser, \
+	map_fileptr
+
+
+def make_chunk(identifier, data):
+	padding = '\x00' if len(data) & 1 else ''
+	return identifier + py_int2dword(len(data)) + data + padding
+
+
+def make_list(list_identifier, *childs):
+	return make_chunk('LIST', list_identifier + ''.join(childs))
+
+
+def make_pack(*childs):
+	data = ''.join(childs)
+	header = py_int2dword(len(data)) + 'CPng' + '\x01\x00\x04\x00'
+	return make_chunk('pack', header + zlib.compress(data))
+
+
+def make_riff():
+	return make_chunk('RIFF', 'CDRX' + ''.join([
+		make_chunk('vrsn', '\x08\x07'),
+		make_list('doc ', make_chunk('mcfg', 'config'),
+				make_list('page', make_chunk('obj ', 'xy' * 8))),
+		make_pack(make_chunk('bmp ', 'pixels'),
+				make_list('lnks', make_chunk('link', 'data'))),
+	]))
+
+
+class TestMappedRiffParser(unittest.TestCase):
+
+	def setUp(self):
+		self.dir = tempfile.mkdtemp()
+		self.path = os.path.join(self.dir, 'test.riff')
+		with open(self.path, 'wb') as fileptr:
+			fileptr.write(make_riff())
+
+	def tearDown(self):
+		shutil.rmtree(self.dir)
+
+	def load_buffered(self):
+		with open(self.path, 'rb') as fileptr:
+			return RIFF_Loader().parse_file(fileptr)
+
+	def load_mapped(self):
+		loader = RIFF_Loader()
+		with open(self.path, 'rb') as fileptr:
+			data = map_fileptr(fileptr)
+		self.assertIsNotNone(data)
+		return MappedRiffParser(loader.get_class, parse_packs=True) \
+			.parse_file(data)
+
+	def assertEqualModels(self, obj0, obj1):
+		self.assertEqual(obj0.cid, obj1.cid)
+		self.assertEqual(obj0.__class__, obj1.__class__)
+		self.assertEqual(obj0.chunk_tag, obj1.chunk_tag)
+		self.assertEqual(obj0.chunk, obj1.chunk)
+		self.assertEqual(len(obj0.childs), len(obj1.childs))
+		for child0, child1 in zip(obj0.childs, obj1.childs):
+			self.assertEqualModels(child0, child1)
+
+	def test01_equal_models(self):
+		buffered = self.load_buffered()
+		mapped = self.load_mapped()
+		self.assertEqualModels(buffered, mapped)
+		self.assertEqual(buffered.get_chunk(), mapped.get_chunk())
+		self.assertEqual(make_riff(), mapped.get_chunk())
+		mapped.destroy()
+
+	def test02_mapping_lifetime(self):
+		mapped = self.load_mapped()
+		self.assertIsNotNone(mapped.mapped)
+		self.assertTrue(mapped.views)
+		view = mapped.childs[0]._chunk
+		self.assertIsInstance(view, model.ChunkView)
+		self.assertEqual(make_chunk('vrsn', '\x08\x07'), str(view))
+		mapped.destroy()
+		self.assertRaises(ValueError, str, view)
+
+	def test03_detach_before_rewriting(self):
+		mapped = self.load_mapped()
+		view = mapped.childs[0]._chunk
+		mapped.detach()
+		self.assertIsNone(mapped.mapped)
+		self.assertEqual(make_chunk('vrsn', '\x08\x07'), str(view))
+		with open(self.path, 'wb') as fileptr:
+			fileptr.write(mapped.get_chunk())
+		self.assertEqualModels(self.load_buffered(), mapped)
+		mapped.destroy()
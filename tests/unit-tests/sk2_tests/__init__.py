@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+#	Copyright (C) 2019 by Igor E. Novikov
+#
+#	This program is free software: you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation, either version 3 of the License, or
+#	(at your option) any later version.
+#
+#	This program is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest, os
+
+from uc2.formats.sk2 import sk2_parser
+
+_pkgdir = __path__[0]
+
+LINES = [
+	"obj('Curve')",
+	"obj_end()",
+	"set_field('name',None)",
+	"set_field('name',True)",
+	"set_field('name',-12)",
+	"set_field('name',12L)",
+	"set_field('name',1.5e-07)",
+	"set_field('name',.5)",
+	"set_field('name','Layer 1')",
+	"set_field('name','It\\'s \\\\ \\n')",
+	"set_field('name',\"It's\")",
+	"set_field('name',u'\\u0442\\u0435\\u043a\\u0441\\u0442')",
+	"set_field('name',[])",
+	"set_field('name',[1, 2.0, -3e+10, None, True, False])",
+	"set_field('name',[[0.0, 1.0], [[2.0, 3.0, 0]], 1])",
+	"set_field('name',['A4', (595.275590551181, 841.8897637795275), 0])",
+	"set_field('name',(1,))",
+	"set_field('name',((1, 2),))",
+	"set_field('name',(1))",
+	"set_field('name',())",
+	"set_field('name',{})",
+	"set_field('name',{'a': [1, 'b'], 2: {'c': (None,)}})",
+	"set_field('name',[['CMYK', [0.0, 0.0, 0.0, 1.0], 1.0, 'Black']])",
+]
+
+def get_filepath(filename):
+	return os.path.join(_pkgdir, 'sk2_data', filename)
+
+
+class LineRecorder(object):
+	"""
+	Reference implementation: executes SK2 line by compile/exec.
+	"""
+
+	result = None
+
+	def obj(self, tag):
+		self.result = (sk2_parser.OBJ, tag)
+
+	def set_field(self, item, val):
+		self.result = (sk2_parser.SET_FIELD, (item, val))
+
+	def obj_end(self):
+		self.result = (sk2_parser.OBJ_END, None)
+
+	def process_line(self, line):
+		code = compile('self.' + line, '<string>', 'exec')
+		exec code
+		return self.result
+
+
+class TestSK2ParserFunctions(unittest.TestCase):
+
+	def setUp(self):
+		self.recorder = LineRecorder()
+
+	def tearDown(self):
+		pass
+
+	def check_line(self, line):
+		expected = self.recorder.process_line(line)
+		result = sk2_parser.parse_line(line)
+		self.assertEqual(repr(expected), repr(result))
+		# repeated values are returned from cache
+		self.assertEqual(repr(expected), repr(sk2_parser.parse_line(line)))
+
+	def test01_parse_literals(self):
+		for line in LINES:
+			self.check_line(line)
+
+	def test02_parse_documents(self):
+		data_dir = os.path.join(_pkgdir, 'sk2_data')
+		for name in sorted(os.listdir(data_dir)):
+			with open(get_filepath(name), 'rb') as fileptr:
+				lines = fileptr.read().split('\n')
+			for line in lines:
+				if line.startswith('obj') or line.startswith('set_field'):
+					self.check_line(line)
+
+	def test03_cache_returns_copies(self):
+		line = "set_field('style',[[], [0, 1.0, []], [], []])"
+		value = sk2_parser.parse_line(line)[1][1]
+		value[1][2].append(1)
+		self.assertEqual([[], [0, 1.0, []], [], []],
+						sk2_parser.parse_line(line)[1][1])
+
+	def test04_unknown_lines(self):
+		self.assertEqual(None, sk2_parser.parse_line("set_fld('name',1)"))
+		self.assertEqual(None, sk2_parser.parse_line("obj_end ()"))
+
+	def test05_parsing_errors(self):
+		for value in ('[1, 2', '(1, 2]', '[1] 2', '@'):
+			self.assertRaises(sk2_parser.SK2ParsingError,
+							sk2_parser.parse_value, value)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+#	Copyright (C) 2019 by Igor E. Novikov
+#
+#	This program is free software: you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation, either version 3 of the License, or
+#	(at your option) any later version.
+#
+#	This program is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from uc2 import uc2const, sk2const
+from uc2.formats import sniffer
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"/>\n'
+XML_DECL = '<?xml version="1.0" encoding="UTF-8"?>\n'
+# larger than sniffer header
+LONG_COMMENT = '<!--%s-->\n' % ('x' * (sniffer.HEADER_SIZE + 1024))
+LONG_DOCTYPE = '<!DOCTYPE svg [\n%s]>\n' % ''.join(
+	['<!ENTITY e%d "entity">\n' % i for i in range(5000)])
+
+SAMPLES = (
+	(uc2const.SK2, 'sk2', sk2const.SK2DOC_ID + sk2const.SK2VER + '\n'),
+	(uc2const.SVG, 'svg', XML_DECL + SVG),
+	(uc2const.PLT, 'plt', 'IN;PU0,0;PD100,100;\n'),
+	(uc2const.SK1, 'sk1', '##sK1 1 2\n'),
+	(uc2const.SK, 'sk', '##Sketch 1 2\n'),
+	(uc2const.FIG, 'fig', '#FIG 3.2\n'),
+	(uc2const.CDR, 'cdr', 'RIFF\x00\x01\x00\x00CDRDvrsn' + '\x00' * 20),
+	(uc2const.WMF, 'wmf', '\xd7\xcd\xc6\x9a' + '\x00' * 40),
+	(uc2const.SKP, 'skp', '##sK1 palette\n'),
+	(uc2const.GPL, 'gpl', 'GIMP Palette\nName: test\n'),
+	(uc2const.ASE, 'ase', 'ASEF\x00\x01\x00\x00\x00\x00\x00\x00'),
+	(uc2const.JCW, 'jcw', 'JCW\x01\x00\x00\x00\x00'),
+	(uc2const.SCRIBUS_PAL, 'xml',
+	 XML_DECL + '<SCRIBUSCOLORS Name="test">\n</SCRIBUSCOLORS>\n'),
+	(uc2const.SOC, 'soc', XML_DECL + '<ooo:color-table>\n</ooo:color-table>\n'),
+	(uc2const.COREL_PAL, 'xml', XML_DECL + '<palette name="test">\n</palette>\n'),
+	(uc2const.PNG, 'png', '\x89PNG\r\n\x1a\n' + '\x00' * 20),
+	(uc2const.JPG, 'jpg', '\xff\xd8\xff\xe0' + '\x00' * 20),
+	(uc2const.GIF, 'gif', 'GIF89a' + '\x00' * 20),
+)
+
+
+class TestSnifferFunctions(unittest.TestCase):
+
+	def setUp(self):
+		self.tmpdir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir, True)
+
+	def make_file(self, name, content):
+		path = os.path.join(self.tmpdir, name)
+		with open(path, 'wb') as fileptr:
+			fileptr.write(content)
+		return path
+
+	def detect(self, name, content):
+		path = self.make_file(name, content)
+		formats = sniffer.detect_formats(path, fallback=False)
+		return formats[0][0] if formats else None
+
+	def test01_format_detection(self):
+		for pid, ext, content in SAMPLES:
+			self.assertEqual(pid, self.detect('test.' + ext, content))
+
+	def test02_detection_by_content(self):
+		for pid, ext, content in SAMPLES:
+			self.assertEqual(pid, self.detect('test.bin', content))
+
+	def test03_svg_after_long_comment(self):
+		content = XML_DECL + LONG_COMMENT + SVG
+		self.assertTrue('<svg' not in content[:sniffer.HEADER_SIZE])
+		self.assertEqual(uc2const.SVG, self.detect('test.svg', content))
+
+	def test04_svg_after_long_doctype(self):
+		content = XML_DECL + LONG_DOCTYPE + SVG
+		self.assertTrue('<svg' not in content[:sniffer.HEADER_SIZE])
+		self.assertEqual(uc2const.SVG, self.detect('test.svg', content))
+
+	def test05_xml_after_long_comment(self):
+		content = XML_DECL + LONG_COMMENT + '<html/>\n'
+		self.assertEqual(None, self.detect('test.svg', content))
+
+	def test06_newer_sk2_version(self):
+		version = str(int(sk2const.SK2VER) + 1)
+		path = self.make_file('test.sk2', sk2const.SK2DOC_ID + version + '\n')
+		self.assertRaises(RuntimeError, sniffer.detect_formats, path)
+
+	def test07_empty_file(self):
+		self.assertEqual(None, self.detect('test.svg', ''))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+#	Copyright (C) 2019 by Igor E. Novikov
+#
+#	This program is free software: you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation, either version 3 of the License, or
+#	(at your option) any later version.
+#
+#	This program is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import gc
+import unittest
+
+from uc2.libimg import surfcache
+
+MB = 1024 * 1024
+
+
+class Surface(object):
+	"""
+	Stub of cairo image surface which occupies size megabytes.
+	"""
+
+	def __init__(self, size):
+		self.size = size
+
+	def get_stride(self):
+		return 1024
+
+	def get_height(self):
+		return self.size * 1024
+
+
+class Owner(object):
+	pass
+
+
+class TestSurfaceCacheFunctions(unittest.TestCase):
+
+	def setUp(self):
+		self.cache = surfcache.SurfaceCache()
+		self.cache.set_budget(10)
+
+	def tearDown(self):
+		self.cache.clear()
+
+	def test01_put_and_get(self):
+		surface = Surface(1)
+		self.cache.put(1, surfcache.MODE_NORMAL, 0, surface)
+		self.assertTrue(surface is self.cache.get(1, surfcache.MODE_NORMAL))
+		self.assertEqual(None, self.cache.get(1, surfcache.MODE_PROOFING))
+		self.assertEqual(None, self.cache.get(1, surfcache.MODE_NORMAL, 1))
+		self.assertEqual(MB, self.cache.size)
+
+	def test02_replace_surface(self):
+		self.cache.put(1, surfcache.MODE_NORMAL, 0, Surface(2))
+		self.cache.put(1, surfcache.MODE_NORMAL, 0, Surface(3))
+		self.assertEqual(3 * MB, self.cache.size)
+		self.assertEqual(1, len(self.cache.surfaces))
+
+	def test03_budget(self):
+		for owner in range(1, 6):
+			self.cache.put(owner, surfcache.MODE_NORMAL, 0, Surface(3))
+			self.assertTrue(self.cache.size <= 10 * MB)
+		self.assertEqual(3, len(self.cache.surfaces))
+		self.cache.set_budget(4)
+		self.assertEqual(3 * MB, self.cache.size)
+		self.assertEqual([(5, surfcache.MODE_NORMAL, 0)],
+						self.cache.surfaces.keys())
+
+	def test04_lru_eviction(self):
+		for owner in range(1, 4):
+			self.cache.put(owner, surfcache.MODE_NORMAL, 0, Surface(3))
+		# owner 1 becomes most recently used
+		self.cache.get(1, surfcache.MODE_NORMAL)
+		self.cache.put(4, surfcache.MODE_NORMAL, 0, Surface(3))
+		self.assertEqual([3, 1, 4],
+						[key[0] for key in self.cache.surfaces.keys()])
+		self.assertEqual(None, self.cache.get(2, surfcache.MODE_NORMAL))
+
+	def test05_surface_over_budget(self):
+		self.cache.put(1, surfcache.MODE_NORMAL, 0, Surface(3))
+		surface = Surface(20)
+		self.cache.put(2, surfcache.MODE_NORMAL, 0, surface)
+		self.assertTrue(surface is self.cache.get(2, surfcache.MODE_NORMAL))
+		self.assertEqual(None, self.cache.get(1, surfcache.MODE_NORMAL))
+		self.assertEqual(20 * MB, self.cache.size)
+
+	def test06_drop(self):
+		self.cache.put(1, surfcache.MODE_NORMAL, 0, Surface(1))
+		self.cache.put(1, surfcache.MODE_NORMAL, 1, Surface(1))
+		self.cache.put(1, surfcache.MODE_CONTOUR, 0, Surface(1))
+		self.cache.put(2, surfcache.MODE_NORMAL, 0, Surface(1))
+		self.cache.drop(1)
+		self.assertEqual(MB, self.cache.size)
+		self.assertEqual([2], self.cache.owners.keys())
+		self.cache.drop(1)
+		self.cache.drop(3)
+		self.assertEqual(MB, self.cache.size)
+
+	def test07_release(self):
+		owner = Owner()
+		self.cache.watch(owner, 1)
+		self.cache.put(1, surfcache.MODE_NORMAL, 0, Surface(1))
+		self.cache.release(1)
+		self.assertEqual(0, self.cache.size)
+		self.assertEqual({}, self.cache.refs)
+
+	def test08_release_collected_owner(self):
+		owner = Owner()
+		owner.cycle = owner
+		self.cache.watch(owner, 1)
+		self.cache.put(1, surfcache.MODE_NORMAL, 0, Surface(1))
+		self.cache.put(2, surfcache.MODE_NORMAL, 0, Surface(1))
+		del owner
+		gc.collect()
+		self.assertEqual(MB, self.cache.size)
+		self.assertEqual([2], self.cache.owners.keys())
+		self.assertEqual({}, self.cache.refs)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+#	Copyright (C) 2019 by Igor E. Novikov
+#
+#	This program is free software: you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation, either version 3 of the License, or
+#	(at your option) any later version.
+#
+#	This program is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+from cStringIO import StringIO
+
+from uc2 import uc2_init
+from uc2.formats.sk2 import sk2_model
+from uc2.formats.svg import svg_loader
+from uc2.formats.svg.svg_filters import collect_refs
+
+APP = uc2_init()
+
+# objects reference definitions and objects placed later in the file
+SVG = '''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg"
+	xmlns:xlink="http://www.w3.org/1999/xlink" width="200" height="200">
+<rect x="10" y="10" width="50" height="50" fill="url(#grad)"
+	stroke="url(#stroke)"/>
+<g clip-path="url(#clip)">
+	<rect width="100" height="100" style="fill:url(#grad2)"/>
+</g>
+<use xlink:href="#later" x="20" y="20"/>
+<rect x="1" y="1" width="5" height="5" fill="#ff0000"/>
+<path id="later" d="M0,0 L10,10 L0,10 z" fill="#00ff00"/>
+<defs>
+	<linearGradient id="base">
+		<stop offset="0" stop-color="#000000"/>
+		<stop offset="1" stop-color="#ffffff"/>
+	</linearGradient>
+	<linearGradient id="grad" xlink:href="#base" x2="1"/>
+	<linearGradient id="grad2">
+		<stop offset="0" stop-color="#ff0000"/>
+		<stop offset="1" stop-color="#0000ff"/>
+	</linearGradient>
+	<linearGradient id="stroke">
+		<stop offset="0" stop-color="#00ff00"/>
+		<stop offset="1" stop-color="#0000ff"/>
+	</linearGradient>
+	<clipPath id="clip"><rect width="30" height="30"/></clipPath>
+</defs>
+</svg>
+'''
+
+
+def dump_model(obj):
+	childs = [dump_model(item) for item in obj.childs]
+	return obj.cid, getattr(obj, 'style', None), \
+		getattr(obj, 'trafo', None), childs
+
+
+def get_layer(doc):
+	page = doc.methods.get_page()
+	return [item for item in page.childs if item.childs][0]
+
+
+class TestSVGStreamLoader(unittest.TestCase):
+
+	def setUp(self):
+		self.tmpdir = tempfile.mkdtemp()
+		self.path = os.path.join(self.tmpdir, 'refs.svg')
+		with open(self.path, 'wb') as fileptr:
+			fileptr.write(SVG)
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir, True)
+
+	def test01_collect_refs(self):
+		fileptr = StringIO(SVG)
+		refs = collect_refs(fileptr)
+		for item in ('grad', 'grad2', 'stroke', 'clip', 'later', 'base'):
+			self.assertTrue(item in refs)
+		self.assertEqual(0, fileptr.tell())
+
+	def test02_forward_refs(self):
+		streamed = svg_loader(APP.appdata, self.path, stream_size=0)
+		buffered = svg_loader(APP.appdata, self.path, stream_size=-1)
+		layer = get_layer(streamed)
+		self.assertEqual(5, len(layer.childs))
+		self.assertEqual(sk2_model.RECTANGLE, layer.childs[0].cid)
+		self.assertEqual(dump_model(buffered.model),
+						 dump_model(streamed.model))
+		streamed.close()
+		buffered.close()
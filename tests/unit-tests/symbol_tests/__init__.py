@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+#
+#	Copyright (C) 2019 by Igor E. Novikov
+#
+#	This program is free software: you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation, either version 3 of the License, or
+#	(at your option) any later version.
+#
+#	This program is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import cairo
+
+from uc2 import uc2_init, uc2const, sk2const
+from uc2.cms import ColorManager
+from uc2.formats import get_saver_by_id
+from uc2.formats.sk2 import sk2_loader, sk2_saver, sk2_model
+from uc2.formats.sk2.crenderer import CairoRenderer
+from uc2.formats.sk2.sk2_presenter import SK2_Presenter
+
+try:
+	from sk1.document.canvas import HitSurface
+except ImportError:
+	HitSurface = None
+
+APP = uc2_init()
+
+FILL = [sk2const.FILL_EVENODD, sk2const.FILL_SOLID,
+		[uc2const.COLOR_RGB, [0.0, 0.0, 0.0], 1.0, '']]
+STYLE = [FILL, [], [], []]
+TRAFO = [2.0, 0.0, 0.0, 2.0, 100.0, 50.0]
+
+
+class Canvas(object):
+	"""
+	Stub of document canvas for hit-testing: window and
+	document coordinates are the same.
+	"""
+	trafo = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+	zoom = 1.0
+	stroke_view = False
+
+	def win_to_doc(self, point):
+		return point
+
+
+class TestSymbolFunctions(unittest.TestCase):
+
+	def setUp(self):
+		self.doc = self.create_doc()
+		self.symbol, self.instance = self.add_instance(self.doc)
+		self.tmpdir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir, True)
+		self.doc.close()
+
+	def create_doc(self):
+		doc = SK2_Presenter(APP.appdata)
+		doc.config.preview = False
+		return doc
+
+	def add_instance(self, doc, rect=None):
+		rect = rect or [0.0, 0.0, 10.0, 10.0]
+		methods = doc.methods
+		obj = sk2_model.Rectangle(doc.config, None, rect,
+								  [] + sk2const.NORMAL_TRAFO, STYLE)
+		symbol = methods.add_symbol([obj], 'box')
+		layer = methods.get_layer(methods.get_page())
+		instance = methods.create_instance(symbol, layer, [] + TRAFO)
+		doc.update()
+		return symbol, instance
+
+	def get_objs(self, doc):
+		methods = doc.methods
+		return methods.get_layer(methods.get_page()).childs
+
+	def save(self, doc, pid):
+		filename = os.path.join(self.tmpdir, 'symbols.' + pid)
+		get_saver_by_id(pid)(doc, filename)
+		return filename
+
+	def test01_instance_bbox(self):
+		self.assertEqual([100.0, 50.0, 120.0, 70.0], self.instance.cache_bbox)
+		self.assertTrue(self.instance.get_symbol() is self.symbol)
+
+	def test02_load_save_round_trip(self):
+		doc = sk2_loader(APP.appdata, self.save(self.doc, uc2const.SK2))
+		try:
+			symbols = doc.methods.get_symbols()
+			self.assertEqual(1, len(symbols))
+			self.assertEqual(self.symbol.symbol_id, symbols[0].symbol_id)
+			self.assertEqual('box', symbols[0].name)
+			self.assertEqual(1, len(symbols[0].childs))
+			instance = self.get_objs(doc)[0]
+			self.assertTrue(instance.is_instance)
+			self.assertEqual(self.symbol.symbol_id, instance.symbol_id)
+			self.assertEqual(TRAFO, instance.trafo)
+			self.assertTrue(instance.get_symbol() is symbols[0])
+			self.assertEqual(self.instance.cache_bbox, instance.cache_bbox)
+		finally:
+			doc.close()
+
+	def test03_removed_symbol(self):
+		symbols = self.doc.methods.get_symbols_obj()
+		symbol_id = self.symbol.symbol_id
+		self.assertTrue(symbols.get_symbol(symbol_id) is self.symbol)
+		symbols.childs.remove(self.symbol)
+		self.assertEqual(None, symbols.get_symbol(symbol_id))
+		self.instance.update()
+		self.assertEqual([], self.instance.cache_bbox)
+
+	def test04_expand_instances(self):
+		objs = self.get_objs(self.doc)
+		replaced = self.doc.methods.expand_instances()
+		self.assertEqual(1, len(replaced))
+		self.assertTrue(objs[0].is_group)
+		self.assertEqual(self.instance.cache_bbox, objs[0].cache_bbox)
+		self.doc.methods.restore_instances(replaced)
+		self.assertTrue(objs[0] is self.instance)
+
+	def test05_export_without_symbols(self):
+		with open(self.save(self.doc, uc2const.PLT), 'rb') as fileptr:
+			self.assertTrue('PD' in fileptr.read())
+		self.assertTrue(self.get_objs(self.doc)[0] is self.instance)
+
+	def test06_paste_into_other_document(self):
+		doc = self.create_doc()
+		try:
+			# other document has different symbol with the same id
+			symbol = self.add_instance(doc, [0.0, 0.0, 5.0, 5.0])[0]
+			self.assertEqual(self.symbol.symbol_id, symbol.symbol_id)
+			symbols = self.doc.methods.copy_symbols([self.instance])
+			objs = [self.instance.copy()]
+			objs = doc.methods.convert_instances(objs, symbols)
+			self.assertTrue(objs[0].is_group)
+			self.assertEqual(self.instance.cache_bbox, objs[0].cache_bbox)
+			# the same document keeps instances
+			objs = [self.instance.copy()]
+			objs = self.doc.methods.convert_instances(objs, symbols, True)
+			self.assertTrue(objs[0].is_instance)
+			# instances of unknown symbols are removed
+			objs = [self.instance.copy()]
+			self.assertEqual([], doc.methods.convert_instances(objs, {}))
+		finally:
+			doc.close()
+
+	def test07_rendering(self):
+		group = self.instance.to_group()
+		surfaces = []
+		for obj in (self.instance, group, None):
+			surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 150, 100)
+			ctx = cairo.Context(surface)
+			ctx.set_source_rgb(1.0, 1.0, 1.0)
+			ctx.paint()
+			if obj is not None:
+				CairoRenderer(ColorManager()).render(ctx, [obj])
+			surface.flush()
+			surfaces.append(str(surface.get_data()))
+		self.assertEqual(surfaces[1], surfaces[0])
+		self.assertNotEqual(surfaces[2], surfaces[0])
+
+	@unittest.skipIf(HitSurface is None, 'sK1 is not importable')
+	def test08_hit_testing(self):
+		surface = HitSurface(Canvas())
+		try:
+			for point, result in (((110.0, 60.0), True),
+								  ((119.0, 69.0), True),
+								  ((95.0, 60.0), False),
+								  ((5.0, 5.0), False)):
+				self.assertEqual(result, surface.is_point_into_object(
+					point, self.instance))
+		finally:
+			surface.destroy()